@@ -0,0 +1,1110 @@
+# File contains the set of codes that are still consistent with the responses of a round
+# See fbi_B2.py for example usages
+# Usage: python candidates.py <board length> <num colors> [guesses] builds the partition index of the guesses
+# (see PartitionIndex), the first guesses of the Baseline2 and Knuth players by default
+
+import os
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import product
+import numpy as np
+from codes import *
+from feedback import *
+from swar import *
+
+@lru_cache(maxsize=8)
+def universe(board_length, num_colors):
+    """Returns every code of a configuration in lexicographic order, shared between rounds
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in a code.
+
+    Returns:
+        numpy.ndarray: Returns read-only uint8 array of shape (num_colors ** board_length, board_length).
+    """
+
+    codes = all_codes_array(board_length, num_colors)
+
+    codes.flags.writeable = False
+
+    return codes
+
+@lru_cache(maxsize=8)
+def packed_universe(board_length, num_colors):
+    """Returns every code of a configuration packed for the swar backend, shared between rounds
+
+    Args:
+        board_length (int): Number of pegs, at most 16.
+        num_colors (int): Number of colors that could be used in a code, at most 16.
+
+    Returns:
+        words (numpy.ndarray): Read-only packed codes in lexicographic order (see swar.pack_codes).
+        histograms (numpy.ndarray): Read-only packed histograms of the codes (see swar.pack_histograms).
+    """
+
+    codes = universe(board_length, num_colors)
+
+    words = pack_codes(codes)
+    histograms = pack_histograms(codes)
+
+    words.flags.writeable = False
+    histograms.flags.writeable = False
+
+    return words, histograms
+
+@lru_cache(maxsize=8)
+def shared_feedback_rows(board_length, num_colors):
+    """Returns the feedback row cache of a configuration, shared by every CandidateSet and every player
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in a code.
+
+    Returns:
+        FeedbackRows: Returns cache, or None if a single row would not fit in its budget.
+    """
+
+    rows = FeedbackRows(board_length, num_colors)
+
+    if rows.row_bytes > rows.max_bytes:
+
+        return None
+
+    return rows
+
+
+class FeedbackRows:
+    """Least recently used cache of feedback rows, the responses of a guess against every code of a configuration
+
+    A full FeedbackTable holds num_codes ** 2 responses, which is out of reach beyond a few million codes, but players
+    keep scoring the same few guesses (the opening, then the best reply to each response) round after round. Rows are
+    computed on first use, kept up to max_bytes in total and dropped least recently used first.
+    """
+
+    # Largest number of bytes of rows kept by a cache
+    max_bytes = 2 ** 28
+
+    def __init__(self, board_length, num_colors, max_bytes = None):
+        """Constructor for FeedbackRows
+
+        Args:
+            board_length (int): Number of pegs.
+            num_colors (int): Number of colors that could be used in a code.
+            max_bytes (int, optional): Largest number of bytes of rows kept. Defaults to FeedbackRows.max_bytes, or
+                                       an eighth of physical memory if that is less.
+        """
+
+        if max_bytes is None:
+
+            max_bytes = min(self.max_bytes, physical_memory() // 8)
+
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.num_codes = num_colors ** board_length
+        self.row_bytes = self.num_codes * np.dtype(response_dtype(board_length)).itemsize
+        self.max_bytes = max_bytes
+
+        # Keys: code id of the guess
+        # Value: read-only response of every code to the guess, least recently used first
+        self.rows = OrderedDict()
+        self.bytes_used = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+
+        return len(self.rows)
+
+    def lookup(self, guess, compute = True):
+        """Returns the responses of every code of the configuration to guess
+
+        Args:
+            guess (str, int or numpy.ndarray): Guess of secret code.
+            compute (bool, optional): Whether to compute the row if it is not cached. Defaults to True.
+
+        Returns:
+            numpy.ndarray: Returns read-only packed responses in lexicographic order of the codes, or None if the row is
+                           not cached and compute is False.
+        """
+
+        key = code_to_id(guess, self.num_colors)
+        row = self.rows.get(key)
+
+        if row is not None:
+
+            self.hits += 1
+            self.rows.move_to_end(key)
+
+            return row
+
+        self.misses += 1
+
+        if not compute:
+
+            return None
+
+        row = self.score_row(id_to_array(key, self.board_length, self.num_colors))
+        row.flags.writeable = False
+
+        if self.row_bytes > self.max_bytes:
+
+            return row
+
+        self.rows[key] = row
+        self.bytes_used += self.row_bytes
+
+        while self.bytes_used > self.max_bytes:
+
+            self.rows.popitem(last=False)
+            self.bytes_used -= self.row_bytes
+            self.evictions += 1
+
+        return row
+
+    def score_row(self, guess):
+        """Scores guess against every code of the configuration, on packed codes when they fit
+
+        Args:
+            guess (numpy.ndarray): Guess of secret code.
+
+        Returns:
+            numpy.ndarray: Returns packed response for each code.
+        """
+
+        if fits(self.board_length, self.num_colors):
+
+            words, histograms = packed_universe(self.board_length, self.num_colors)
+
+            return score_packed(guess, words, histograms, self.board_length)
+
+        return score_many(guess, universe(self.board_length, self.num_colors))
+
+    def clear(self):
+        """Drops every row, counters are kept
+        """
+
+        self.rows.clear()
+        self.bytes_used = 0
+
+        return
+
+    def print_stats(self):
+        """Prints the hits, misses and evictions of the cache
+        """
+
+        lookups = max(self.hits + self.misses, 1)
+
+        print("Feedback rows:", len(self), "cached,", round(self.bytes_used / 2 ** 20, 1), "MiB of", round(self.max_bytes / 2 ** 20, 1), "MiB")
+        print("Hits:", self.hits, "(" + str(round(100 * self.hits / lookups, 1)) + "%)", "Misses:", self.misses, "Evictions:", self.evictions)
+
+        return
+
+
+class PartitionIndex:
+    """Every code of a configuration grouped by its response to each of a few guesses, stored on disk
+
+    Guesses worth indexing are those played over and over, like openings and book replies. The partition of a guess
+    is one array of the code ids dtype: entries 0 to num_responses are the start of the bucket of each packed response
+    (plus the end of the last one), and the rest are the code ids of each bucket in increasing order. Each partition is
+    a .npy file opened as a read-only memory map, so every process playing the configuration shares one copy through
+    the OS page cache, and a response is applied by fetching its bucket instead of scoring the survivors.
+    """
+
+    def __init__(self, board_length, num_colors, directory = "partition_indexes"):
+        """Constructor for PartitionIndex, partitions are opened as they are used
+
+        Args:
+            board_length (int): Number of pegs.
+            num_colors (int): Number of colors that could be used in a code.
+            directory (str, optional): Directory where indexes are stored. Defaults to "partition_indexes".
+        """
+
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.num_codes = num_colors ** board_length
+        self.num_responses = num_responses(board_length)
+        self.dtype = np.uint32 if self.num_codes < 2 ** 32 else np.uint64
+        self.directory = os.path.join(directory, "partitions_" + str(board_length) + "_" + str(num_colors))
+
+        # Keys: code id of the guess
+        # Value: memory mapped partition, or None if the guess is not indexed
+        self.partitions = {}
+
+    def path(self, guess_id):
+
+        return os.path.join(self.directory, "guess_" + str(guess_id) + ".npy")
+
+    def __contains__(self, guess):
+
+        return self.partition(guess) is not None
+
+    def partition(self, guess):
+        """Returns the partition of guess (see PartitionIndex), opening it the first time
+
+        Args:
+            guess (str, int or numpy.ndarray): Guess of secret code.
+
+        Returns:
+            numpy.ndarray: Returns read-only memory mapped partition, or None if the guess is not indexed.
+        """
+
+        guess_id = code_to_id(guess, self.num_colors)
+
+        if guess_id not in self.partitions:
+
+            path = self.path(guess_id)
+
+            self.partitions[guess_id] = np.load(path, mmap_mode="r") if os.path.exists(path) else None
+
+        return self.partitions[guess_id]
+
+    def bucket(self, guess, exact, other):
+        """Returns the codes that give a response to guess
+
+        Args:
+            guess (str, int or numpy.ndarray): Guess of secret code.
+            exact (int): Number of pegs that matched exactly with the answer.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+
+        Returns:
+            numpy.ndarray: Returns code ids in increasing order, or None if the guess is not indexed.
+        """
+
+        partition = self.partition(guess)
+
+        if partition is None:
+
+            return None
+
+        response = pack_response(exact, other, self.board_length)
+
+        start, end = int(partition[response]), int(partition[response + 1])
+
+        return partition[self.num_responses + 1 + start:self.num_responses + 1 + end]
+
+    def sizes(self, guess):
+        """Returns the number of codes that give each response to guess
+
+        Args:
+            guess (str, int or numpy.ndarray): Guess of secret code.
+
+        Returns:
+            numpy.ndarray: Returns sizes indexed by packed response, or None if the guess is not indexed.
+        """
+
+        partition = self.partition(guess)
+
+        if partition is None:
+
+            return None
+
+        return np.diff(partition[:self.num_responses + 1].astype(np.int64))
+
+    def build(self, guesses):
+        """Computes the partitions of guesses and writes them to disk, skipping those already indexed
+
+        Args:
+            guesses (list of strs, ints or numpy.ndarrays): Guesses to index.
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        for guess in guesses:
+
+            guess_id = code_to_id(guess, self.num_colors)
+
+            if self.partition(guess_id) is not None:
+
+                continue
+
+            guess = id_to_array(guess_id, self.board_length, self.num_colors)
+
+            if fits(self.board_length, self.num_colors):
+
+                row = score_packed(guess, *packed_universe(self.board_length, self.num_colors), self.board_length)
+
+            else:
+
+                row = score_many(guess, universe(self.board_length, self.num_colors))
+
+            counts = np.bincount(row, minlength=self.num_responses)
+
+            partition = np.empty(self.num_responses + 1 + self.num_codes, dtype=self.dtype)
+            partition[0] = 0
+            np.cumsum(counts, out=partition[1:self.num_responses + 1])
+            partition[self.num_responses + 1:] = np.argsort(row, kind="stable")
+
+            # Write to a temporary file first so other processes never open a partially built partition
+            temp_path = self.path(guess_id) + "." + str(os.getpid()) + ".tmp"
+
+            with open(temp_path, "wb") as file:
+
+                np.save(file, partition)
+
+            os.replace(temp_path, self.path(guess_id))
+
+            del self.partitions[guess_id]
+
+        return
+
+@lru_cache(maxsize=8)
+def shared_partition_index(board_length, num_colors, directory = "partition_indexes"):
+    """Returns the partition index of a configuration, shared by every CandidateSet and every player
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in a code.
+        directory (str, optional): Directory where indexes are stored. Defaults to "partition_indexes".
+
+    Returns:
+        PartitionIndex: Returns index.
+    """
+
+    return PartitionIndex(board_length, num_colors, directory)
+
+
+class CandidateSet:
+    """Codes that are still consistent with every response of a round
+
+    The codes are kept as one uint8 array in lexicographic order plus a boolean mask of survivors. Each response
+    is applied with a single score_many call over the survivors (or score_packed on bit-packed codes with the swar
+    backend), and survivors are handed out in order by a cursor that only moves forward.
+
+    Responses to guesses already seen in the configuration come from its feedback row cache instead (see
+    FeedbackRows), which every CandidateSet of the configuration shares. Responses to guesses of a partition index
+    (see PartitionIndex) are applied without scoring at all, by keeping the survivors in the bucket of the response.
+    """
+
+    # Number of mask entries looked at per step when searching for the next survivor
+    scan_window = 4096
+
+    # A row missing from the cache is only computed while at least 1 / row_threshold of the codes of the
+    # configuration survive, smaller sets are cheaper to score directly
+    row_threshold = 8
+
+    def __init__(self, board_length, colors, codes_array = None, backend = "numpy", feedback_rows = True, partitions = None):
+        """Constructor for CandidateSet
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            codes_array (numpy.ndarray, optional): Starting codes in the order they should be handed out.
+                                                   Defaults to every code of the configuration.
+            backend (str, optional): How responses are computed, "numpy", or "swar" to score bit-packed codes (see
+                                     swar.py, boards of up to 16 pegs and 16 colors). Defaults to "numpy".
+            feedback_rows (bool or FeedbackRows, optional): Cache of feedback rows to use, True for the one shared by
+                                                            the configuration or False for none. Defaults to True.
+            partitions (str or PartitionIndex, optional): Partition index to apply responses with, or the directory of
+                                                          the one shared by the configuration. codes_array must be in
+                                                          lexicographic order to use one. Defaults to None.
+
+        Raises:
+            ValueError: Unknown backend, codes of the configuration do not fit the backend, or a partition index is
+                        given for codes out of lexicographic order.
+        """
+
+        self.board_length = board_length
+        self.colors = colors
+        self.backend = backend
+
+        # Packed codes and histograms of the swar backend
+        self.words = None
+        self.histograms = None
+
+        if backend == "swar":
+
+            if not fits(board_length, len(colors)):
+
+                raise ValueError("Codes of " + str(board_length) + " pegs and " + str(len(colors)) + " colors do not fit in a packed word")
+
+            if codes_array is None:
+
+                self.words, self.histograms = packed_universe(board_length, len(colors))
+
+            else:
+
+                self.words, self.histograms = pack_codes(codes_array), pack_histograms(codes_array)
+
+        elif backend != "numpy":
+
+            raise ValueError("Unknown backend: " + str(backend))
+
+        # Codes are every code of the configuration in order, without building the universe to compare against
+        every_code = codes_array is None
+
+        if every_code:
+
+            codes_array = universe(board_length, len(colors))
+
+        self.codes = codes_array
+        self.mask = np.ones(len(codes_array), dtype=bool)
+        self.cursor = 0
+
+        if feedback_rows is True:
+
+            feedback_rows = shared_feedback_rows(board_length, len(colors))
+
+        elif feedback_rows is False:
+
+            feedback_rows = None
+
+        self.feedback_rows = feedback_rows
+
+        if isinstance(partitions, str):
+
+            partitions = shared_partition_index(board_length, len(colors), partitions)
+
+        self.partitions = partitions
+
+        # Code id of each code, None when the codes are every code of the configuration in order
+        self.ids = None
+
+        if (self.feedback_rows is not None or self.partitions is not None) and not every_code:
+
+            self.ids = codes_to_ids(codes_array, len(colors))
+
+            if self.partitions is not None and np.any(self.ids[1:] <= self.ids[:-1]):
+
+                raise ValueError("Codes must be in lexicographic order to use a partition index")
+
+    def __len__(self):
+
+        return int(np.count_nonzero(self.mask))
+
+    def apply(self, guess, exact, other):
+        """Removes every code that would not have given this response to guess
+
+        Args:
+            guess (str or numpy.ndarray): Guess of secret code.
+            exact (int): Number of pegs that matched exactly with the answer.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+        """
+
+        if self.apply_bucket(guess, exact, other):
+
+            return
+
+        alive = np.flatnonzero(self.mask)
+
+        responses = self.cached_responses(guess, alive)
+
+        if responses is None and self.words is not None:
+
+            responses = score_packed(guess, self.words[alive], self.histograms[alive], self.board_length)
+
+        elif responses is None:
+
+            responses = score_many(guess, self.codes[alive])
+
+        self.mask[alive[responses != pack_response(exact, other, self.board_length)]] = False
+
+        return
+
+    def apply_bucket(self, guess, exact, other):
+        """Keeps only the survivors in the bucket of the response, if guess is in the partition index
+
+        Args:
+            guess (str or numpy.ndarray): Guess of secret code.
+            exact (int): Number of pegs that matched exactly with the answer.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+
+        Returns:
+            bool: Returns True if the response was applied, False if guess is not indexed.
+        """
+
+        if self.partitions is None:
+
+            return False
+
+        bucket = self.partitions.bucket(guess, exact, other)
+
+        if bucket is None:
+
+            return False
+
+        if self.ids is None:
+
+            positions = bucket.astype(np.intp)
+
+        else:
+
+            # Both are sorted, so each code id of the bucket is found by binary search in the codes
+            positions = np.minimum(np.searchsorted(self.ids, bucket), len(self.ids) - 1)
+            positions = positions[self.ids[positions] == bucket]
+
+        survivors = positions[self.mask[positions]]
+
+        self.mask[:] = False
+        self.mask[survivors] = True
+
+        return True
+
+    def cached_responses(self, guess, alive):
+        """Looks up the responses of some codes to guess in the feedback row cache
+
+        Args:
+            guess (str or numpy.ndarray): Guess of secret code.
+            alive (numpy.ndarray): Positions of the codes.
+
+        Returns:
+            numpy.ndarray: Returns packed response for each code, or None if the row is not cached and not worth computing.
+        """
+
+        if self.feedback_rows is None:
+
+            return None
+
+        row = self.feedback_rows.lookup(guess, len(alive) * self.row_threshold >= self.feedback_rows.num_codes)
+
+        if row is None:
+
+            return None
+
+        if self.ids is None:
+
+            return row[alive]
+
+        return row[self.ids[alive]]
+
+    def next_code(self):
+        """Hands out the first survivor after the previous one in lexicographic order
+
+        Returns:
+            numpy.ndarray: Returns uint8 array of color indices, or None if no survivor is left.
+        """
+
+        while self.cursor < len(self.codes):
+
+            hits = np.flatnonzero(self.mask[self.cursor:self.cursor+self.scan_window])
+
+            if len(hits) > 0:
+
+                index = self.cursor + int(hits[0])
+
+                # A code is only guessed once
+                self.mask[index] = False
+                self.cursor = index + 1
+
+                return self.codes[index]
+
+            self.cursor += self.scan_window
+
+        return None
+
+    def survivors(self):
+        """Returns every code that is still consistent
+
+        Returns:
+            numpy.ndarray: Returns uint8 array of shape (len(self), board_length).
+        """
+
+        return self.codes[self.mask]
+
+
+class LexicographicEnumerator:
+    """Walks codes in lexicographic order like an odometer, skipping every code ruled out by a response
+
+    Nothing proportional to the number of codes is stored. While choosing the color of each peg, the walk keeps
+    the number of exact matches and of right colors that the prefix already scores against every previous guess.
+    A prefix is abandoned, together with every code that starts with it, as soon as it scores too many, or can no
+    longer reach enough, of either count. A 0/0 response therefore excludes its colors everywhere, and an exact
+    count of 0 excludes each guessed color from its position, without looking at the codes below.
+
+    Each call checks at most max_nodes prefixes. A call that runs out hands out the longest allowed prefix it
+    reached, completed with allowed colors into a code not guessed yet, which may not be consistent; the next call
+    resumes the walk where it stopped.
+    """
+
+    # Largest number of prefixes checked per call of next_code
+    max_nodes = 2 ** 13
+
+    def __init__(self, board_length, colors):
+        """Constructor for LexicographicEnumerator
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+        """
+
+        self.board_length = board_length
+        self.colors = colors
+        self.num_colors = len(colors)
+
+        # Bitmasks of colors that may not be used at all, or at a given position
+        self.excluded_colors = 0
+        self.excluded_at = [0] * board_length
+
+        # Each entry is (guess pegs, guess color counts, exact, exact + other)
+        self.history = []
+
+        # Where the walk resumes: pegs[:depth] is an allowed prefix and pegs[depth] the next color to check at
+        # depth, None before the first call
+        self.pegs = None
+        self.depth = 0
+
+    def apply(self, guess, exact, other):
+        """Rules out every code that would not have given this response to guess
+
+        Args:
+            guess (str or numpy.ndarray): Guess of secret code.
+            exact (int): Number of pegs that matched exactly with the answer.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+        """
+
+        pegs = as_code_array(guess).tolist()
+
+        color_count = [0] * self.num_colors
+
+        for peg in pegs:
+
+            color_count[peg] += 1
+
+        self.history.append((pegs, color_count, exact, exact + other))
+
+        if exact + other == 0:
+
+            for peg in pegs:
+
+                self.excluded_colors |= 1 << peg
+
+        elif exact == 0:
+
+            for i, peg in enumerate(pegs):
+
+                self.excluded_at[i] |= 1 << peg
+
+        return
+
+    def next_code(self):
+        """Hands out the first consistent code after the previous one in lexicographic order
+
+        Returns:
+            numpy.ndarray: Returns uint8 array of color indices, or None if no consistent code is left. Once
+                           max_nodes prefixes are checked, returns a code that may not be consistent instead.
+        """
+
+        board_length = self.board_length
+        num_colors = self.num_colors
+        history = self.history
+
+        # exact_prefix[d][h] and common_prefix[d][h] score pegs[:d] against history[h]
+        exact_prefix = [[0] * len(history)]
+        common_prefix = [[0] * len(history)]
+        counts = [0] * num_colors
+
+        if self.pegs is None:
+
+            pegs = [0] * board_length
+            depth = 0
+
+        else:
+
+            # Resume where the walk stopped, rebuilding the scores of its prefix
+            pegs = list(self.pegs)
+            depth = self.depth
+
+            for d in range(depth):
+
+                self.push(pegs, d, exact_prefix, common_prefix, counts)
+
+        node_limit = self.node_limit()
+        nodes = 0
+
+        # Longest allowed prefix reached, handed out completed if the walk runs out of nodes
+        deepest = pegs[:depth]
+
+        while True:
+
+            if pegs[depth] >= num_colors:
+
+                if depth == 0:
+
+                    self.pegs = [num_colors] * board_length
+                    self.depth = 0
+
+                    return None
+
+                # Every code below this prefix was handed out or ruled out, move on to the next prefix
+                depth -= 1
+
+                exact_prefix.pop()
+                common_prefix.pop()
+                counts[pegs[depth]] -= 1
+
+                pegs[depth] += 1
+
+                # The deepest prefix was used up with it, only pegs[:depth] is still allowed
+                if len(deepest) > depth:
+
+                    deepest = pegs[:depth]
+
+                continue
+
+            if node_limit is not None and nodes >= node_limit:
+
+                self.pegs = pegs
+                self.depth = depth
+
+                code = self.complete(deepest)
+
+                return None if code is None else np.array(code, dtype=np.uint8)
+
+            nodes += 1
+
+            if not self.allowed(pegs, depth, exact_prefix[depth], common_prefix[depth], counts):
+
+                pegs[depth] += 1
+
+                continue
+
+            if depth == board_length - 1:
+
+                code = np.array(pegs, dtype=np.uint8)
+
+                # Resume right after this code
+                pegs[depth] += 1
+
+                self.pegs = pegs
+                self.depth = depth
+
+                return code
+
+            self.push(pegs, depth, exact_prefix, common_prefix, counts)
+
+            depth += 1
+            pegs[depth] = 0
+
+            if depth > len(deepest):
+
+                deepest = pegs[:depth]
+
+    def node_limit(self):
+        """Returns the number of prefixes next_code may check, None if the walk is small enough to never stop early
+        """
+
+        if self.num_colors ** self.board_length <= self.max_nodes:
+
+            return None
+
+        return self.max_nodes
+
+    def complete(self, prefix):
+        """Completes a prefix into a code that was not guessed yet, shortening the prefix if every completion was
+
+        Args:
+            prefix (list of ints): First pegs of the code.
+
+        Returns:
+            list of ints: Returns code, or None if every code was guessed.
+        """
+
+        guessed = {tuple(guess) for guess, _, _, _ in self.history}
+
+        for length in range(len(prefix), -1, -1):
+
+            # Each guess rules out at most one completion, so this stops after len(guessed) + 1 completions
+            for pegs in self.completions(prefix[:length]):
+
+                if tuple(pegs) not in guessed:
+
+                    return pegs
+
+        return None
+
+    def completions(self, prefix):
+        """Yields the completions of a prefix, preferring at each remaining position the colors not excluded there
+
+        Args:
+            prefix (list of ints): First pegs of the code.
+
+        Yields:
+            list of ints: Code starting with prefix.
+        """
+
+        orders = []
+
+        for position in range(len(prefix), self.board_length):
+
+            excluded = self.excluded_colors | self.excluded_at[position]
+
+            orders.append(sorted(range(self.num_colors), key=lambda color: excluded >> color & 1))
+
+        for rest in product(*orders):
+
+            yield list(prefix) + list(rest)
+
+    def allowed(self, pegs, depth, exact_prefix, common_prefix, counts):
+        """Checks whether some consistent code starts with pegs[:depth + 1]
+
+        Args:
+            pegs (list of ints): Code being built, pegs[:depth] are already allowed.
+            depth (int): Position of the peg being checked.
+            exact_prefix (list of ints): Exact matches of pegs[:depth] against each previous guess.
+            common_prefix (list of ints): Right colors of pegs[:depth] against each previous guess.
+            counts (list of ints): Number of occurences for each color in pegs[:depth].
+
+        Returns:
+            bool: Returns False if every code with this prefix is ruled out.
+        """
+
+        color = pegs[depth]
+
+        if (self.excluded_colors | self.excluded_at[depth]) >> color & 1:
+
+            return False
+
+        remaining = self.board_length - depth - 1
+
+        for h, (guess, color_count, exact, common) in enumerate(self.history):
+
+            matched = exact_prefix[h] + (guess[depth] == color)
+
+            if matched > exact or matched + remaining < exact:
+
+                return False
+
+            shared = common_prefix[h] + (counts[color] < color_count[color])
+
+            if shared > common or shared + remaining < common:
+
+                return False
+
+        return True
+
+    def push(self, pegs, depth, exact_prefix, common_prefix, counts):
+        """Extends the prefix scores with pegs[depth]
+
+        Args:
+            pegs (list of ints): Code being built.
+            depth (int): Position of the peg being added.
+            exact_prefix (list of lists of ints): Exact matches of each prefix, one list is appended.
+            common_prefix (list of lists of ints): Right colors of each prefix, one list is appended.
+            counts (list of ints): Number of occurences for each color in the prefix, updated in place.
+        """
+
+        color = pegs[depth]
+
+        exact_prefix.append([matched + (guess[depth] == color)
+                             for matched, (guess, _, _, _) in zip(exact_prefix[depth], self.history)])
+
+        common_prefix.append([shared + (counts[color] < color_count[color])
+                              for shared, (_, color_count, _, _) in zip(common_prefix[depth], self.history)])
+
+        counts[color] += 1
+
+        return
+
+
+class ArrangementEnumerator(LexicographicEnumerator):
+    """Walks the arrangements of a known multiset of colors in lexicographic order, skipping ruled out ones
+
+    Every arrangement uses the same colors, so exact + other always equals board_length and only the exact count
+    of a response carries information. Besides the prefix checks of LexicographicEnumerator, the exact counts are
+    turned into per-position masks: a color is excluded from a position once a guess that put it there is known to
+    have no exact match left to spend on it, and a position is fixed (included) once a guess needs every one of its
+    remaining possible matches to reach its exact count, or only one color is left for the position.
+    """
+
+    def __init__(self, board_length, colors, color_counts):
+        """Constructor for ArrangementEnumerator
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            color_counts (list of ints): Number of occurences of each color in the answer, summing to board_length.
+        """
+
+        super().__init__(board_length, colors)
+
+        self.color_counts = list(color_counts)
+
+        for color, count in enumerate(self.color_counts):
+
+            if count == 0:
+
+                self.excluded_colors |= 1 << color
+
+        # Color each position is known to have, None if unknown
+        self.fixed_at = [None] * board_length
+
+    def apply(self, guess, exact, other):
+        """Rules out every arrangement that would not have given this response to guess
+
+        Args:
+            guess (str or numpy.ndarray): Guess of secret code.
+            exact (int): Number of pegs that matched exactly with the answer.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+        """
+
+        super().apply(guess, exact, other)
+
+        self.update_masks()
+
+        return
+
+    def update_masks(self):
+        """Derives position exclusions and inclusions from the exact counts until nothing changes
+        """
+
+        present = ((1 << self.num_colors) - 1) & ~self.excluded_colors
+
+        changed = True
+
+        while changed:
+
+            changed = False
+
+            for guess, _, exact, _ in self.history:
+
+                fixed = 0
+                possible = []
+
+                for i, peg in enumerate(guess):
+
+                    if self.fixed_at[i] == peg:
+
+                        fixed += 1
+
+                    elif not self.excluded_at[i] >> peg & 1:
+
+                        possible.append(i)
+
+                if not possible:
+
+                    continue
+
+                if fixed == exact:
+
+                    # Every exact match of this guess is accounted for, so none of its other pegs are in place
+                    for i in possible:
+
+                        self.excluded_at[i] |= 1 << guess[i]
+
+                    changed = True
+
+                elif fixed + len(possible) == exact:
+
+                    # This guess needs every one of its possible matches
+                    for i in possible:
+
+                        self.excluded_at[i] = present & ~(1 << guess[i])
+
+                    changed = True
+
+            for i in range(self.board_length):
+
+                allowed = present & ~self.excluded_at[i]
+
+                if self.fixed_at[i] is None and allowed and allowed & (allowed - 1) == 0:
+
+                    self.fixed_at[i] = allowed.bit_length() - 1
+
+                    changed = True
+
+        return
+
+    def allowed(self, pegs, depth, exact_prefix, common_prefix, counts):
+        """Checks whether some consistent arrangement starts with pegs[:depth + 1]
+
+        Args:
+            pegs (list of ints): Arrangement being built, pegs[:depth] are already allowed.
+            depth (int): Position of the peg being checked.
+            exact_prefix (list of ints): Exact matches of pegs[:depth] against each previous guess.
+            common_prefix (list of ints): Right colors of pegs[:depth] against each previous guess.
+            counts (list of ints): Number of occurences for each color in pegs[:depth].
+
+        Returns:
+            bool: Returns False if every arrangement with this prefix is ruled out.
+        """
+
+        if counts[pegs[depth]] >= self.color_counts[pegs[depth]]:
+
+            return False
+
+        return super().allowed(pegs, depth, exact_prefix, common_prefix, counts)
+
+    def node_limit(self):
+        """Returns the number of prefixes next_code may check, None if there are few enough arrangements to never stop early
+        """
+
+        # Closed form count of the arrangements, far fewer than num_colors ** board_length codes
+        if arrangements(self.color_counts) <= self.max_nodes:
+
+            return None
+
+        return self.max_nodes
+
+    def completions(self, prefix):
+        """Yields the arrangements that start with a prefix, preferring at each position the colors left that are not
+        excluded there
+
+        Args:
+            prefix (list of ints): First pegs of the arrangement.
+
+        Yields:
+            list of ints: Arrangement of the known colors starting with prefix.
+        """
+
+        left = list(self.color_counts)
+
+        for peg in prefix:
+
+            left[peg] -= 1
+
+        yield from self.arrange(list(prefix), left)
+
+    def arrange(self, pegs, left):
+        """Yields the arrangements that extend pegs with the colors left (see completions)
+
+        Args:
+            pegs (list of ints): First pegs of the arrangement, extended and restored in place.
+            left (list of ints): Number of occurences of each color still to place, updated and restored in place.
+
+        Yields:
+            list of ints: Arrangement of the known colors starting with pegs.
+        """
+
+        position = len(pegs)
+
+        if position == self.board_length:
+
+            yield list(pegs)
+
+            return
+
+        colors = [color for color in range(self.num_colors) if left[color] > 0]
+
+        for color in sorted(colors, key=lambda color: self.excluded_at[position] >> color & 1):
+
+            pegs.append(color)
+            left[color] -= 1
+
+            yield from self.arrange(pegs, left)
+
+            pegs.pop()
+            left[color] += 1
+
+if __name__ == "__main__":
+
+    if len(sys.argv) < 3:
+
+        print("Usage: python candidates.py <board length> <num colors> [guesses]")
+
+        sys.exit(1)
+
+    board_length, num_colors = int(sys.argv[1]), int(sys.argv[2])
+
+    # First guess of Baseline2 (every peg the first color) and of Knuth (half the first color, half the second)
+    half = board_length // 2
+    guesses = sys.argv[3:] or ["A" * board_length, "A" * half + chr(65 + min(1, num_colors - 1)) * (board_length - half)]
+
+    index = shared_partition_index(board_length, num_colors)
+    index.build(guesses)
+
+    for guess in guesses:
+
+        print("Indexed", guess, "into", np.count_nonzero(index.sizes(guess)), "buckets, largest", index.sizes(guess).max(), "codes")
@@ -1,7 +1,7 @@
 # FBI Team members: Michelle, Rinchen, Chen
 
-from itertools import product
 from player import Player
+from codes import CodeSequence, ids_to_array
 
 class Baseline1(Player):
     """Baseline 1 mastermind player
@@ -13,16 +13,17 @@ class Baseline1(Player):
     def __init__(self):
         self.player_name = "Baseline1"
         self.current_guess = -1 #  index of the guess that will be made next from all_possibilities
-        self.all_possibilities = []
+        # Codes are computed from their index on demand, so this never holds c^p strings
+        self.all_possibilities = CodeSequence(0, [])
 
     def next_guess(self, board_length, colors):
-        # If no guesses have been made, generate all_possibilities
+        # If no guesses have been made, start from the first code of this configuration
         if self.current_guess == -1:
-            colors = ''.join(colors)
-            self.all_possibilities = [''.join(p) for p in product(colors, repeat=board_length)]
+            if self.all_possibilities.board_length != board_length or self.all_possibilities.colors != list(colors):
+                self.all_possibilities = CodeSequence(board_length, colors)
             self.current_guess = 0
         else:
-            if self.current_guess == len(self.all_possibilities) - 1:
+            if self.current_guess == self.all_possibilities.num_codes - 1:
                 self.current_guess = 0
             else:
                 self.current_guess += 1
@@ -42,7 +43,27 @@ class Baseline1(Player):
             str: Returns guess
         """
         if last_response[2] == 0:
-            self.all_possibilities = []
             self.current_guess = -1
         self.next_guess(board_length, colors)
-        return self.all_possibilities[self.current_guess]
+        if self.encoding == "int":
+            # The index of a code in lexicographic order is its id
+            return self.current_guess
+        return self.encode_guess(self.all_possibilities[self.current_guess], board_length, colors)
+
+    def make_guesses(self, board_length, colors, scsa, rounds, last_responses):
+        """Makes the next guess of many rounds at once (see batch.BatchPlayer)
+
+        The guesses ignore the responses, so guess n of every round is code n in lexicographic order.
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret codes.
+            rounds (numpy.ndarray): Position in the batch of each round still being played.
+            last_responses (numpy.ndarray): Array of shape (len(rounds), 3), row i is the last_response of round rounds[i].
+
+        Returns:
+            numpy.ndarray: Returns uint8 array of shape (len(rounds), board_length)
+        """
+        num_codes = len(colors) ** board_length
+        return ids_to_array(last_responses[:, 2] % num_codes, board_length, len(colors))
@@ -0,0 +1,797 @@
+# File contains players that run in their own worker processes, and the pipe protocol used to talk to them
+# Every message is a frame: a 4-byte big-endian payload length followed by the payload, whose first byte is the
+# message type. Guess requests and str guesses use fixed binary layouts, everything else is pickled. Guesses come
+# with the CPU time the worker spent making them.
+#
+# Example usage:
+#     pool = WorkerPool(size = 2, time_limit = 5.1, memory_limit = 2**30)
+#     Mastermind(4, colors).play_tournament(RemotePlayer(RandomFolks(), pool), InsertColors(), 100)
+#     pool.close()
+
+import os
+import time
+import pickle
+import select
+import struct
+import traceback
+import multiprocessing
+from player import *
+from watchdog import GuessTimeout
+
+try:
+
+    import resource
+
+except ImportError: # Not available on Windows, memory limits are not enforced there
+
+    resource = None
+
+FRAME_HEADER = struct.Struct("!I")
+
+# Engine to worker
+LOAD = b"L"     # Pickled player, replaces the player of the worker
+SEED = b"R"     # Pickled source of randomness (see Player.seed)
+CONFIG = b"C"   # Pickled (board_length, colors, scsa) of the guesses that follow
+GUESS = b"G"    # Last response, as RESPONSE
+QUIT = b"Q"
+
+# Worker to engine
+READY = b"K"
+STR_GUESS = b"S" # GUESS_TIMES, then the guess as utf-8 bytes
+ANY_GUESS = b"P" # GUESS_TIMES, then the pickled guess of any other encoding
+ERROR = b"E"     # Formatted traceback of an exception raised by the player
+
+RESPONSE = struct.Struct("!iii")
+
+# Nanoseconds of CPU time of the worker process and of its thread spent on a guess
+GUESS_TIMES = struct.Struct("!qq")
+
+class RemoteError(Exception):
+    """Raised when a worker times out, dies or reports an exception
+    """
+
+class RemoteTimeout(RemoteError):
+    """Raised when a worker takes longer than it is allowed to
+    """
+
+def write_frame(fd, payload):
+    """Writes one frame to a pipe
+
+    Args:
+        fd (int): File descriptor of the write end of the pipe.
+        payload (bytes): Message, starting with its type.
+    """
+
+    view = memoryview(FRAME_HEADER.pack(len(payload)) + payload)
+
+    while view:
+
+        view = view[os.write(fd, view):]
+
+    return
+
+def read_exactly(fd, size):
+    """Reads size bytes from a pipe
+
+    Args:
+        fd (int): File descriptor of the read end of the pipe.
+        size (int): Number of bytes to read.
+
+    Raises:
+        EOFError: The other end of the pipe was closed.
+
+    Returns:
+        bytes: Returns the bytes read.
+    """
+
+    chunks = []
+
+    while size > 0:
+
+        chunk = os.read(fd, size)
+
+        if not chunk:
+
+            raise EOFError("Pipe closed")
+
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b"".join(chunks)
+
+def read_frame(fd, timeout = None):
+    """Reads one frame from a pipe
+
+    Args:
+        fd (int): File descriptor of the read end of the pipe.
+        timeout (float, optional): Seconds to wait for the frame to start. Defaults to None, waiting forever.
+
+    Raises:
+        TimeoutError: No frame started within timeout seconds.
+        EOFError: The other end of the pipe was closed.
+
+    Returns:
+        bytes: Returns the payload of the frame.
+    """
+
+    if timeout is not None:
+
+        readable, _, _ = select.select([fd], [], [], max(timeout, 0))
+
+        if not readable:
+
+            raise TimeoutError("No frame within " + str(timeout) + " seconds")
+
+    size, = FRAME_HEADER.unpack(read_exactly(fd, FRAME_HEADER.size))
+
+    return read_exactly(fd, size)
+
+def address_space():
+    """Returns the size of the virtual memory of the current process
+
+    Returns:
+        int: Returns size in bytes, 0 if it cannot be read.
+    """
+
+    try:
+
+        with open("/proc/self/statm") as file:
+
+            return int(file.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+
+    except (OSError, ValueError):
+
+        return 0
+
+def limit_memory(memory_limit):
+    """Limits the memory the current process can allocate from now on
+
+    Allocations beyond the limit raise MemoryError.
+
+    Args:
+        memory_limit (int): Bytes of virtual memory the process may add to what it already uses.
+    """
+
+    if resource is None:
+
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = address_space() + memory_limit
+
+    if hard != resource.RLIM_INFINITY:
+
+        limit = min(limit, hard)
+
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+    return
+
+def encode_guess(guess, process_ns, thread_ns):
+    """Converts a guess to a reply frame payload
+
+    Args:
+        guess (str, int or numpy.ndarray): Guess of secret code, in any encoding.
+        process_ns (int): Nanoseconds of CPU time of the worker process spent on the guess.
+        thread_ns (int): Nanoseconds of CPU time of the worker thread spent on the guess.
+
+    Returns:
+        bytes: Returns payload of the reply.
+    """
+
+    times = GUESS_TIMES.pack(process_ns, thread_ns)
+
+    if isinstance(guess, str):
+
+        return STR_GUESS + times + guess.encode("utf-8")
+
+    return ANY_GUESS + times + pickle.dumps(guess, pickle.HIGHEST_PROTOCOL)
+
+def decode_guess(payload):
+    """Converts a reply frame payload back to a guess
+
+    Args:
+        payload (bytes): Payload of a reply.
+
+    Raises:
+        RemoteError: The reply is an error report or not a guess.
+
+    Returns:
+        guess (str, int or numpy.ndarray): Guess of secret code.
+        times (tuple of ints): CPU time of the worker process and thread spent on the guess, in nanoseconds.
+    """
+
+    kind, body = payload[:1], payload[1:]
+
+    if kind == STR_GUESS:
+
+        return body[GUESS_TIMES.size:].decode("utf-8"), GUESS_TIMES.unpack_from(body)
+
+    if kind == ANY_GUESS:
+
+        return pickle.loads(body[GUESS_TIMES.size:]), GUESS_TIMES.unpack_from(body)
+
+    if kind == ERROR:
+
+        raise RemoteError(body.decode("utf-8"))
+
+    raise RemoteError("Unexpected reply: " + repr(kind))
+
+def serve(read_fd, write_fd, memory_limit = None, warm = None):
+    """Answers requests of the engine until it quits or closes the pipe
+
+    Args:
+        read_fd (int): File descriptor of the pipe requests come from.
+        write_fd (int): File descriptor of the pipe replies go to.
+        memory_limit (int, optional): Bytes the player may allocate (see limit_memory). Defaults to None, no limit.
+        warm (callable, optional): Called once before the first request, to load what every player needs. Defaults to None.
+    """
+
+    if warm is not None:
+
+        warm()
+
+    if memory_limit is not None:
+
+        limit_memory(memory_limit)
+
+    write_frame(write_fd, READY)
+
+    player = None
+    config = None
+
+    while True:
+
+        try:
+
+            payload = read_frame(read_fd)
+
+        except EOFError:
+
+            return
+
+        kind, body = payload[:1], payload[1:]
+
+        try:
+
+            if kind == GUESS:
+
+                process_start, thread_start = time.process_time_ns(), time.thread_time_ns()
+
+                guess = player.make_guess(*config, RESPONSE.unpack(body))
+
+                reply = encode_guess(guess, time.process_time_ns() - process_start, time.thread_time_ns() - thread_start)
+
+            elif kind == LOAD:
+
+                player = pickle.loads(body)
+                reply = READY
+
+            elif kind == SEED:
+
+                player.seed(pickle.loads(body))
+                reply = READY
+
+            elif kind == CONFIG:
+
+                config = pickle.loads(body)
+                reply = READY
+
+            elif kind == QUIT:
+
+                return
+
+            else:
+
+                reply = ERROR + ("Unknown request: " + repr(kind)).encode("utf-8")
+
+        except Exception:
+
+            reply = ERROR + traceback.format_exc().encode("utf-8")
+
+        write_frame(write_fd, reply)
+
+def run_worker(read_fd, write_fd, parent_fds, memory_limit, warm):
+    """Entry point of a forked worker process (see serve)
+
+    Args:
+        read_fd (int): File descriptor of the pipe requests come from.
+        write_fd (int): File descriptor of the pipe replies go to.
+        parent_fds (tuple of ints): Ends of the pipes used by the engine, closed in the worker.
+        memory_limit (int): Bytes the player may allocate, or None.
+        warm (callable): Called once before the first request, or None.
+    """
+
+    for fd in parent_fds:
+
+        os.close(fd)
+
+    try:
+
+        serve(read_fd, write_fd, memory_limit, warm)
+
+    except (EOFError, BrokenPipeError):
+
+        pass
+
+    return
+
+
+class Worker:
+    """Engine side of one worker process
+    """
+
+    def __init__(self, context, memory_limit = None, warm = None):
+        """Constructor for Worker, forks the worker process
+
+        Args:
+            context (multiprocessing.context.BaseContext): Context that starts the process.
+            memory_limit (int, optional): Bytes the player may allocate (see limit_memory). Defaults to None.
+            warm (callable, optional): Called once in the worker before it is ready. Defaults to None.
+        """
+
+        request_read, self.request_fd = os.pipe()
+        self.reply_fd, reply_write = os.pipe()
+
+        self.process = context.Process(target=run_worker, args=(request_read, reply_write, (self.request_fd, self.reply_fd), memory_limit, warm), daemon=True)
+        self.process.start()
+
+        os.close(request_read)
+        os.close(reply_write)
+
+        self.ready = False
+
+    def wait_ready(self):
+        """Waits for the worker to finish warming up
+
+        Raises:
+            RemoteError: The worker died while warming up.
+        """
+
+        if not self.ready:
+
+            self.check(self.receive(None))
+
+            self.ready = True
+
+        return
+
+    def receive(self, timeout):
+        """Reads the next reply of the worker
+
+        Args:
+            timeout (float): Seconds to wait for it, or None to wait forever.
+
+        Raises:
+            RemoteTimeout: The worker timed out.
+            RemoteError: The worker died.
+
+        Returns:
+            bytes: Returns payload of the reply.
+        """
+
+        try:
+
+            return read_frame(self.reply_fd, timeout)
+
+        except TimeoutError:
+
+            raise RemoteTimeout("Worker took more than " + str(timeout) + " seconds")
+
+        except EOFError:
+
+            raise RemoteError("Worker exited with code " + str(self.process.exitcode))
+
+    def check(self, payload):
+        """Checks that a reply acknowledges a request
+
+        Args:
+            payload (bytes): Payload of the reply.
+
+        Raises:
+            RemoteError: The reply is an error report or not an acknowledgment.
+        """
+
+        if payload[:1] == ERROR:
+
+            raise RemoteError(payload[1:].decode("utf-8"))
+
+        if payload[:1] != READY:
+
+            raise RemoteError("Unexpected reply: " + repr(payload[:1]))
+
+        return
+
+    def request(self, kind, body = b"", timeout = None):
+        """Sends a request to the worker and waits for its reply
+
+        Args:
+            kind (bytes): Type of the request.
+            body (bytes, optional): Rest of the payload. Defaults to b"".
+            timeout (float, optional): Seconds to wait for the reply. Defaults to None, waiting forever.
+
+        Raises:
+            RemoteError: The worker timed out or died.
+
+        Returns:
+            bytes: Returns payload of the reply.
+        """
+
+        self.wait_ready()
+
+        try:
+
+            write_frame(self.request_fd, kind + body)
+
+        except BrokenPipeError:
+
+            raise RemoteError("Worker exited with code " + str(self.process.exitcode))
+
+        return self.receive(timeout)
+
+    def send(self, kind, obj):
+        """Sends a pickled object to the worker
+
+        Args:
+            kind (bytes): Type of the request (LOAD, SEED or CONFIG).
+            obj (object): Object to send.
+
+        Raises:
+            RemoteError: The worker died or failed to unpickle obj.
+        """
+
+        self.check(self.request(kind, pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)))
+
+        return
+
+    def guess(self, last_response, timeout = None):
+        """Asks the player of the worker for a guess
+
+        Args:
+            last_response (tuple of ints): Last response, see Player.make_guess.
+            timeout (float, optional): Seconds to wait for the guess. Defaults to None, waiting forever.
+
+        Raises:
+            RemoteError: The worker timed out, died or the player raised an exception.
+
+        Returns:
+            guess (str, int or numpy.ndarray): Guess of secret code.
+            times (tuple of ints): CPU time of the worker process and thread spent on the guess (see decode_guess).
+        """
+
+        return decode_guess(self.request(GUESS, RESPONSE.pack(*last_response[:3]), timeout))
+
+    def kill(self):
+        """Kills the worker process and closes its pipes
+        """
+
+        self.process.kill()
+        self.process.join()
+        self.close_pipes()
+
+        return
+
+    def stop(self, timeout = 1):
+        """Asks the worker process to quit, killing it if it does not
+
+        Args:
+            timeout (float, optional): Seconds to wait for the worker to quit. Defaults to 1.
+        """
+
+        try:
+
+            write_frame(self.request_fd, QUIT)
+
+        except OSError:
+
+            pass
+
+        self.process.join(timeout)
+
+        if self.process.is_alive():
+
+            self.process.kill()
+            self.process.join()
+
+        self.close_pipes()
+
+        return
+
+    def close_pipes(self):
+        """Closes the engine ends of the pipes
+        """
+
+        for fd in (self.request_fd, self.reply_fd):
+
+            try:
+
+                os.close(fd)
+
+            except OSError:
+
+                pass
+
+        return
+
+
+class WorkerPool:
+    """Pool of worker processes forked ahead of time, ready to host remote players
+
+    Workers are forked when the pool is created, so they start with every module the engine has imported, and
+    warm is run in each of them before its first player. A worker that exceeds a limit is killed and replaced by
+    a newly forked one.
+    """
+
+    def __init__(self, size = 1, time_limit = 5.1, memory_limit = None, warm = None):
+        """Constructor for WorkerPool
+
+        Args:
+            size (int, optional): Number of workers forked ahead of time. Defaults to 1.
+            time_limit (float, optional): Seconds a player may take for one guess. Defaults to 5.1, the time allowed
+                                          for a whole round plus its buffer (see Round).
+            memory_limit (int, optional): Bytes a player may allocate in its worker. Defaults to None, no limit.
+            warm (callable, optional): Called once in every worker before its first player, for example to load a
+                                       feedback table. Defaults to None.
+        """
+
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.warm = warm
+
+        # Only forked workers inherit what the engine has already loaded
+        self.context = multiprocessing.get_context("fork")
+
+        self.workers = []
+        self.idle = [self.start_worker() for _ in range(size)]
+
+        # Number of workers killed for exceeding a limit, dying or failing
+        self.recycled = 0
+
+    def start_worker(self):
+        """Forks a new worker
+
+        Returns:
+            Worker: Returns the worker, which may still be warming up.
+        """
+
+        worker = Worker(self.context, self.memory_limit, self.warm)
+
+        self.workers.append(worker)
+
+        return worker
+
+    def acquire(self):
+        """Takes an idle worker out of the pool, forking a new one if there is none
+
+        Returns:
+            Worker: Returns worker, warmed up.
+        """
+
+        worker = self.idle.pop(0) if self.idle else self.start_worker()
+
+        worker.wait_ready()
+
+        return worker
+
+    def release(self, worker):
+        """Puts a worker back in the pool
+
+        Args:
+            worker (Worker): Worker taken with acquire.
+        """
+
+        self.idle.append(worker)
+
+        return
+
+    def recycle(self, worker):
+        """Kills a worker and forks a replacement for the pool
+
+        Args:
+            worker (Worker): Worker taken with acquire.
+        """
+
+        worker.kill()
+
+        self.workers.remove(worker)
+        self.recycled += 1
+
+        self.idle.append(self.start_worker())
+
+        return
+
+    def close(self):
+        """Stops every worker of the pool
+        """
+
+        for worker in self.workers:
+
+            worker.stop()
+
+        self.workers = []
+        self.idle = []
+
+        return
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.close()
+
+        return False
+
+
+class RemotePlayer(Player):
+    """Player whose guesses are made by a copy of another player in a worker process
+
+    Round.play_round plays it like any other player. The engine waits at most time_limit seconds of the pool for
+    each guess; a worker that takes longer, dies, runs out of memory or raises an exception is killed and
+    replaced, and the guess is None, which is invalid. A guess that timed out raises GuessTimeout instead, like
+    the watchdog, so the round is lost rather than failed whatever the clock.
+
+    The copy of the player keeps its state from round to round, until its worker is replaced, which starts over
+    from a new copy of player. On a CPU clock the player is charged the CPU time of its worker, and a guess that
+    timed out is charged the whole time limit.
+    """
+
+    def __init__(self, player, pool = None):
+        """Constructor for RemotePlayer
+
+        Args:
+            player (Player): Player to copy into the worker, it must be picklable.
+            pool (WorkerPool, optional): Pool to take the worker from. Defaults to a new pool with one worker.
+        """
+
+        self.player = player
+        self.player_name = player.player_name
+        self.encoding = player.encoding
+        self.pool = pool if pool is not None else WorkerPool()
+
+        self.worker = None
+        self.config = None
+
+        # CPU time of the worker spent on the last guess in seconds, by clock
+        self.guess_times = {}
+
+        # Error of the last worker that was replaced, None if none was
+        self.last_error = None
+
+    def attach(self):
+        """Takes a worker from the pool and copies the player into it, if not done yet
+
+        Returns:
+            Worker: Returns the worker of the player.
+        """
+
+        if self.worker is None:
+
+            worker = self.pool.acquire()
+
+            try:
+
+                worker.send(LOAD, self.player)
+
+            except RemoteError:
+
+                self.pool.recycle(worker)
+
+                raise
+
+            self.worker = worker
+            self.config = None
+
+        return self.worker
+
+    def recycle(self, error):
+        """Replaces the worker of the player after it failed
+
+        Args:
+            error (RemoteError): Why the worker failed.
+        """
+
+        self.last_error = str(error)
+
+        if self.worker is not None:
+
+            self.pool.recycle(self.worker)
+
+            self.worker = None
+
+        return
+
+    def seed(self, rng):
+        """Replaces the source of randomness of the player, in the worker as well
+
+        Args:
+            rng (numpy.random.Generator, int or numpy.random.SeedSequence): Source of randomness, or seed for a new one.
+        """
+
+        self.player.seed(rng)
+
+        try:
+
+            self.attach().send(SEED, rng)
+
+        except RemoteError as error:
+
+            self.recycle(error)
+
+        return
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind, in the worker
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chr): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): See Player.make_guess.
+
+        Raises:
+            GuessTimeout: The worker took longer than the time limit of the pool.
+
+        Returns:
+            str, int or numpy.ndarray: Returns guess of the player, or None if its worker failed.
+        """
+
+        config = (board_length, colors, scsa)
+
+        try:
+
+            worker = self.attach()
+
+            if self.config is None or self.config[0] != board_length or self.config[1] != colors or self.config[2] is not scsa:
+
+                worker.send(CONFIG, config)
+
+                self.config = config
+
+            guess, (process_ns, thread_ns) = worker.guess(last_response, self.pool.time_limit)
+
+        except RemoteTimeout as error:
+
+            self.guess_times = {"process": self.pool.time_limit, "thread": self.pool.time_limit}
+
+            self.recycle(error)
+
+            raise GuessTimeout(str(error))
+
+        except RemoteError as error:
+
+            self.guess_times = {}
+
+            self.recycle(error)
+
+            return None
+
+        self.guess_times = {"process": process_ns / 1e9, "thread": thread_ns / 1e9}
+
+        return guess
+
+    def guess_time(self, clock, measured):
+        """Returns the time the player is charged for its last guess, the CPU time of its worker on CPU clocks
+
+        Args:
+            clock (str): Clock the round is timed with (see watchdog.CLOCKS).
+            measured (float): Seconds the round measured on that clock around make_guess.
+
+        Returns:
+            float: Returns seconds charged.
+        """
+
+        return self.guess_times.get(clock, measured)
+
+    def close(self):
+        """Gives the worker of the player back to the pool
+        """
+
+        if self.worker is not None:
+
+            self.pool.release(self.worker)
+
+            self.worker = None
+
+        return
@@ -0,0 +1,144 @@
+# File contains a microbenchmark of the work Round does for every guess
+# Usage: python round_benchmark.py [board_length] [num_colors] [rounds]
+
+import sys
+import time
+import numpy as np
+from mastermind import *
+
+def reference_response(round, guess):
+    """Responds to a str guess the way Round did before it precomputed the answer, to check and time against
+
+    Args:
+        round (Round): Round being played.
+        guess (str): Guess of secret code.
+
+    Returns:
+        string or tuple of ints: Same as Round.respond_to_guess.
+    """
+
+    if guess == round.answer:
+
+        return "win"
+
+    if len(guess) != round.board_length:
+
+        return "invalid"
+
+    for peg in guess:
+
+        if peg not in round.colors:
+
+            return "invalid"
+
+    guess_color_count = round.count_colors(guess)
+    answer_color_count = round.count_colors(round.answer)
+
+    exact = 0
+    other = 0
+
+    for i in range(round.board_length):
+
+        if guess[i] == round.answer[i]:
+
+            exact += 1
+
+            guess_color_count[letter_to_num(guess[i])-1] -= 1
+            answer_color_count[letter_to_num(round.answer[i])-1] -= 1
+
+    for i in range(len(round.colors)):
+
+        if answer_color_count[i] <= guess_color_count[i]:
+
+            other += answer_color_count[i]
+
+        elif guess_color_count[i] < answer_color_count[i] and guess_color_count[i] > 0:
+
+            other += guess_color_count[i]
+
+    return (exact, other, round.guesses)
+
+def round_guesses(rng, board_length, colors, num_guesses, distinct):
+    """Returns the guesses of one benchmark round, a few of them invalid
+
+    Args:
+        rng (numpy.random.Generator): Source of randomness.
+        board_length (int): Number of pegs.
+        colors (list of chrs): Colors of the game.
+        num_guesses (int): Number of guesses.
+        distinct (int): Number of different guesses, guesses repeat beyond it.
+
+    Returns:
+        list of strs: Returns guesses.
+    """
+
+    pool = [array_to_str(code) for code in rng.integers(len(colors), size=(distinct, board_length))]
+
+    pool[-1] = pool[-1][:-1] + "?"
+
+    return [pool[i] for i in rng.integers(distinct, size=num_guesses)]
+
+def benchmark(board_length = 4, num_colors = 26, rounds = 1000, guesses_per_round = 100, seed = 0):
+    """Times Round.respond_to_guess against reference_response and checks that they agree
+
+    Args:
+        board_length (int, optional): Number of pegs. Defaults to 4.
+        num_colors (int, optional): Number of colors. Defaults to 26, the default of Mastermind.
+        rounds (int, optional): Number of rounds. Defaults to 1000.
+        guesses_per_round (int, optional): Number of guesses of each round. Defaults to 100.
+        seed (int, optional): Seed of the answers and guesses. Defaults to 0.
+    """
+
+    colors = [chr(65 + i) for i in range(num_colors)]
+    rng = np.random.default_rng(seed)
+
+    print("Game:", board_length, "Pegs", num_colors, "Colors,", rounds, "rounds of", guesses_per_round, "guesses")
+
+    # Players like RandomFolks rarely repeat a guess, players like Boring always do
+    for label, distinct in (("distinct guesses", guesses_per_round), ("repeated guesses", 4)):
+
+        answers = [array_to_str(code) for code in rng.integers(num_colors, size=(rounds, board_length))]
+        guesses = [round_guesses(rng, board_length, colors, guesses_per_round, distinct) for _ in range(rounds)]
+
+        timings = {}
+        responses = {}
+
+        for name in ("reference", "Round"):
+
+            results = []
+            elapsed = 0
+
+            for answer, moves in zip(answers, guesses):
+
+                game = Round(board_length, colors, answer, None)
+                respond = game.respond_to_guess if name == "Round" else lambda guess: reference_response(game, guess)
+
+                start = time.perf_counter_ns()
+
+                for guess in moves:
+
+                    results.append(respond(guess))
+
+                elapsed += time.perf_counter_ns() - start
+
+            timings[name] = elapsed / (rounds * guesses_per_round)
+            responses[name] = results
+
+        if responses["reference"] != responses["Round"]:
+
+            raise AssertionError("Round and reference_response disagree")
+
+        print(label + ":", round_ns(timings["reference"]), "ns per guess before,", round_ns(timings["Round"]), "ns now,",
+              str(round(timings["reference"] / timings["Round"], 1)) + "x faster, responses identical")
+
+    return
+
+def round_ns(ns):
+    """Rounds nanoseconds for printing
+    """
+
+    return int(round(ns))
+
+if __name__ == "__main__":
+
+    benchmark(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,343 @@
+# File contains scoring on bit-packed codes, for boards of up to 16 pegs and 16 colors
+# A code is one 64-bit word with 4 bits per peg (peg i in bits 4i to 4i+3), and its color histogram is a row of
+# 8-bit counters, one per color (colors 0 to 7 in the first uint64, 8 to 15 in the second). Scoring a guess is then a
+# handful of word operations (SIMD within a register), with no loop over pegs or colors:
+#   exact matches: XOR the words, fold each nibble onto its low bit and count the nonzero nibbles
+#   common colors: take the lane-wise minimum of the histograms and add the lanes up with one multiplication
+# Functions work on numpy uint64 arrays, except those named *_int which work on Python ints for a single code.
+# Run this file to check it against feedback.score_many and Round.process_guess (see check_conformance).
+
+import sys
+import numpy as np
+from codes import *
+from feedback import *
+
+MAX_PEGS = 16
+MAX_COLORS = 16
+
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# Low bit of every nibble
+NIBBLE_LOW = 0x1111111111111111
+
+# Every byte lane of 64 and of 128 bits, and the high bit of each lane
+LANE_ONES = 0x0101010101010101
+LANE_HIGH = 0x8080808080808080
+LANE_ONES_128 = LANE_ONES | (LANE_ONES << 64)
+LANE_HIGH_128 = LANE_HIGH | (LANE_HIGH << 64)
+
+# Masks that squeeze byte lanes into nibbles, halving the width of each group every step
+SQUEEZE = [(4, 0x00FF00FF00FF00FF00FF00FF00FF00FF), (8, 0x0000FFFF0000FFFF0000FFFF0000FFFF),
+           (16, 0x00000000FFFFFFFF00000000FFFFFFFF), (32, MASK_64)]
+
+# Histogram of a single peg of each color, in the 128-bit lanes of the *_int functions
+PEG_COUNTERS = [1 << (8 * color) for color in range(MAX_COLORS)]
+
+def fits(board_length, num_colors):
+    """Checks whether codes of a configuration fit in a packed word
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in a code.
+
+    Returns:
+        bool: Returns True if they do, False otherwise.
+    """
+
+    return board_length <= MAX_PEGS and num_colors <= MAX_COLORS
+
+def pack_codes(codes_array):
+    """Packs codes into words of 4 bits per peg
+
+    Args:
+        codes_array (numpy.ndarray): Codes of shape (N, board_length), at most 16 pegs of colors below 16.
+
+    Returns:
+        numpy.ndarray: Returns uint64 array of shape (N,).
+    """
+
+    codes_array = np.asarray(codes_array, dtype=np.uint8)
+
+    lanes = np.zeros((len(codes_array), MAX_PEGS), dtype=np.uint8)
+    lanes[:, :codes_array.shape[1]] = codes_array
+
+    # One byte lane per peg, pegs 0 to 7 in the first word and 8 to 15 in the second
+    low, high = lanes.view("<u8").T
+
+    return squeeze_half(low) | (squeeze_half(high) << np.uint64(32))
+
+def squeeze_half(lanes):
+    """Squeezes 8 byte lanes into the 8 low nibbles of each word (see SQUEEZE)
+
+    Args:
+        lanes (numpy.ndarray): uint64 array of byte lanes, each below 16.
+
+    Returns:
+        numpy.ndarray: Returns uint64 array with the lanes packed in the low 32 bits.
+    """
+
+    for shift, mask in SQUEEZE[:3]:
+
+        lanes = (lanes | (lanes >> np.uint64(shift))) & np.uint64(mask & MASK_64)
+
+    return lanes
+
+def pack_histograms(codes_array):
+    """Counts the pegs of each color of each code into byte lanes
+
+    Args:
+        codes_array (numpy.ndarray): Codes of shape (N, board_length), colors below 16.
+
+    Returns:
+        numpy.ndarray: Returns uint64 array of shape (N, 2), lane c of the row holds the number of pegs of color c.
+    """
+
+    return np.ascontiguousarray(color_histograms(np.asarray(codes_array), MAX_COLORS)).view("<u8").astype(np.uint64)
+
+def popcount(words):
+    """Counts the bits set in each word
+
+    Args:
+        words (numpy.ndarray): uint64 array.
+
+    Returns:
+        numpy.ndarray: Returns number of bits set in each word.
+    """
+
+    if hasattr(np, "bitwise_count"):
+
+        return np.bitwise_count(words)
+
+    words = words - ((words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    words = (words & np.uint64(0x3333333333333333)) + ((words >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    words = (words + (words >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+
+    return (words * np.uint64(LANE_ONES)) >> np.uint64(56)
+
+def exact_matches(guess_word, words, board_length):
+    """Counts the pegs of each code equal to those of the guess
+
+    Args:
+        guess_word (numpy.uint64): Packed guess.
+        words (numpy.ndarray): Packed codes.
+        board_length (int): Number of pegs.
+
+    Returns:
+        numpy.ndarray: Returns number of exact matches with each code.
+    """
+
+    # Bit 0 of a nibble of folded is set if any bit of the nibble differs, no bit moves across nibbles into it
+    folded = words ^ guess_word
+    folded |= folded >> np.uint64(1)
+    folded |= folded >> np.uint64(2)
+
+    return board_length - popcount(folded & np.uint64(NIBBLE_LOW)).astype(np.intp)
+
+def lane_minimum(first, second):
+    """Returns the lane-wise minimum of two rows of byte lanes, every lane below 128
+
+    Args:
+        first (numpy.ndarray): uint64 array.
+        second (numpy.ndarray): uint64 array.
+
+    Returns:
+        numpy.ndarray: Returns uint64 array.
+    """
+
+    # A lane of (first | 0x80) - second cannot borrow from the next one, and keeps its high bit iff first >= second
+    first_larger = (((first | np.uint64(LANE_HIGH)) - second) & np.uint64(LANE_HIGH)) >> np.uint64(7)
+    take_second = first_larger * np.uint64(0xFF)
+
+    return (second & take_second) | (first & ~take_second)
+
+def lane_sum(lanes):
+    """Adds up the byte lanes of each word, whose sum must be below 256
+
+    Args:
+        lanes (numpy.ndarray): uint64 array.
+
+    Returns:
+        numpy.ndarray: Returns sum of the lanes of each word.
+    """
+
+    return (lanes * np.uint64(LANE_ONES)) >> np.uint64(56)
+
+def common_colors(guess_histogram, histograms):
+    """Counts the pegs each code has in common with the guess, in any position
+
+    Args:
+        guess_histogram (numpy.ndarray): Packed histogram of the guess, shape (2,).
+        histograms (numpy.ndarray): Packed histograms of the codes, shape (N, 2).
+
+    Returns:
+        numpy.ndarray: Returns number of common pegs with each code.
+    """
+
+    common = lane_sum(lane_minimum(histograms[:, 0], guess_histogram[0])).astype(np.intp)
+
+    # Colors 8 to 15 only matter if the guess has one of them
+    if guess_histogram[1]:
+
+        common += lane_sum(lane_minimum(histograms[:, 1], guess_histogram[1])).astype(np.intp)
+
+    return common
+
+def score_packed(guess, words, histograms, board_length):
+    """Scores one guess against many packed codes at once, like feedback.score_many
+
+    Args:
+        guess (str or numpy.ndarray): Guess of secret code.
+        words (numpy.ndarray): Packed codes (see pack_codes).
+        histograms (numpy.ndarray): Packed histograms of the codes (see pack_histograms).
+        board_length (int): Number of pegs.
+
+    Returns:
+        numpy.ndarray: Returns packed response (see feedback.pack_response) for each code.
+    """
+
+    guess = as_code_array(guess)[None]
+
+    exact = exact_matches(pack_codes(guess)[0], words, board_length)
+    common = common_colors(pack_histograms(guess)[0], histograms)
+
+    packed = exact * (board_length + 1) + (common - exact)
+
+    return packed.astype(response_dtype(board_length))
+
+def pack_int(pegs):
+    """Packs one code into a word of 4 bits per peg
+
+    Args:
+        pegs (bytes or list of ints): Color index of each peg, at most 16 pegs of colors below 16.
+
+    Returns:
+        int: Returns packed code.
+    """
+
+    word = int.from_bytes(bytes(pegs), "little")
+
+    for shift, mask in SQUEEZE:
+
+        word = (word | (word >> shift)) & mask
+
+    return word
+
+def histogram_int(pegs):
+    """Counts the pegs of each color of one code into the byte lanes of a 128-bit int
+
+    Args:
+        pegs (bytes or list of ints): Color index of each peg, colors below 16.
+
+    Returns:
+        int: Returns packed histogram.
+    """
+
+    return sum(map(PEG_COUNTERS.__getitem__, pegs))
+
+def score_int(guess_word, guess_histogram, answer_word, answer_histogram, board_length):
+    """Scores one packed guess against one packed answer
+
+    Args:
+        guess_word (int): Packed guess (see pack_int).
+        guess_histogram (int): Packed histogram of the guess (see histogram_int).
+        answer_word (int): Packed answer.
+        answer_histogram (int): Packed histogram of the answer.
+        board_length (int): Number of pegs.
+
+    Returns:
+        exact (int): Number of pegs that match exactly with the answer.
+        other (int): Number of pegs that are the right color, but in the wrong location.
+    """
+
+    folded = guess_word ^ answer_word
+    folded |= folded >> 1
+    folded |= folded >> 2
+
+    exact = board_length - (folded & NIBBLE_LOW).bit_count()
+
+    # Same lane-wise minimum as lane_minimum, on 16 lanes at once
+    first_larger = (((guess_histogram | LANE_HIGH_128) - answer_histogram) & LANE_HIGH_128) >> 7
+    take_answer = first_larger * 0xFF
+    lowest = (answer_histogram & take_answer) | (guess_histogram & ~take_answer)
+
+    common = ((lowest * LANE_ONES_128) >> 120) & 0xFF
+
+    return exact, common - exact
+
+def check_conformance(board_length, num_colors, num_codes = 4096, num_guesses = 64, seed = 0):
+    """Checks that every packed scoring function agrees with the existing ones on one configuration
+
+    Codes and guesses are every code of the configuration when there are at most num_codes of them, and random
+    codes otherwise.
+
+    Args:
+        board_length (int): Number of pegs, at most 16.
+        num_colors (int): Number of colors, at most 16.
+        num_codes (int, optional): Number of codes scored against. Defaults to 4096.
+        num_guesses (int, optional): Number of guesses scored. Defaults to 64.
+        seed (int, optional): Seed of the random codes. Defaults to 0.
+
+    Raises:
+        AssertionError: A packed function disagrees with feedback.score_many or Round.process_guess.
+    """
+
+    from mastermind import Round
+
+    rng = np.random.default_rng(seed)
+    colors = [chr(65 + i) for i in range(num_colors)]
+
+    if num_colors ** board_length <= num_codes:
+
+        codes = all_codes_array(board_length, num_colors)
+
+    else:
+
+        codes = rng.integers(num_colors, size=(num_codes, board_length), dtype=np.uint8)
+
+    guesses = np.concatenate([codes[:1], codes[-1:], rng.integers(num_colors, size=(num_guesses, board_length), dtype=np.uint8)])
+
+    words = pack_codes(codes)
+    histograms = pack_histograms(codes)
+
+    for guess in guesses:
+
+        expected = score_many(guess, codes)
+
+        if not np.array_equal(score_packed(guess, words, histograms, board_length), expected):
+
+            raise AssertionError("score_packed disagrees with score_many for guess " + array_to_str(guess))
+
+        guess_word, guess_histogram = pack_int(guess.tolist()), histogram_int(guess.tolist())
+
+        for code, response in zip(codes[:num_guesses], expected[:num_guesses]):
+
+            exact, other = score_int(guess_word, guess_histogram, pack_int(code.tolist()), histogram_int(code.tolist()), board_length)
+
+            if (exact, other) != tuple(unpack_response(int(response), board_length)):
+
+                raise AssertionError("score_int disagrees with score_many for " + array_to_str(guess) + " and " + array_to_str(code))
+
+        for code in codes[:4]:
+
+            game = Round(board_length, colors, array_to_str(code), None)
+            packed_game = Round(board_length, colors, array_to_str(code), None, backend="swar")
+
+            if game.process_guess(array_to_str(guess)) != packed_game.process_guess(array_to_str(guess)):
+
+                raise AssertionError("Round backends disagree for " + array_to_str(guess) + " and " + array_to_str(code))
+
+    return
+
+if __name__ == "__main__":
+
+    configurations = [(4, 6), (5, 8), (1, 1), (1, 16), (3, 2), (6, 9), (8, 10), (10, 16), (15, 16), (16, 1), (16, 8), (16, 16)]
+
+    if len(sys.argv) == 3:
+
+        configurations = [(int(sys.argv[1]), int(sys.argv[2]))]
+
+    for board_length, num_colors in configurations:
+
+        check_conformance(board_length, num_colors)
+
+        print("Packed scoring agrees on", board_length, "Pegs", num_colors, "Colors")
@@ -0,0 +1,364 @@
+# File contains an engine that plays many rounds of Mastermind in lockstep
+# See Mastermind.play_batch_tournament in mastermind.py for example usage
+
+import copy
+import time
+import numpy as np
+from codes import *
+from feedback import *
+from watchdog import *
+
+class BatchPlayer:
+    """Player for many rounds of Mastermind played in lockstep
+
+    Each step the player makes one guess for every round still being played, and gets every response back from a
+    single vectorized scoring call.
+    """
+
+    def __init__(self):
+        """Constructor for BatchPlayer
+        """
+
+        self.player_name = ""
+
+    def start_rounds(self, board_length, colors, scsa, rngs):
+        """Prepares the player for a new batch of rounds
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret codes.
+            rngs (list of numpy.random.Generator): Source of randomness for each round, or None if not seeded.
+        """
+
+        return
+
+    def make_guesses(self, board_length, colors, scsa, rounds, last_responses):
+        """Makes a guess for every round still being played
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret codes.
+            rounds (numpy.ndarray): Position in the batch of each round still being played.
+            last_responses (numpy.ndarray): Array of shape (len(rounds), 3), row i is the last_response of round
+                                            rounds[i] (see Player.make_guess).
+
+        Raises:
+            NotImplementedError: Function must be implemented by children classes.
+        """
+
+        raise NotImplementedError
+
+
+class SingleRoundPlayers(BatchPlayer):
+    """Plays a batch of rounds with a regular Player, one copy of it per round
+
+    Each copy is timed on its own (see make_timed_guesses), so every round is charged what its copy took, as in
+    Round.play_round.
+    """
+
+    def __init__(self, player):
+        """Constructor for SingleRoundPlayers
+
+        Args:
+            player (Player): Player to copy for every round.
+        """
+
+        self.player = player
+        self.player_name = player.player_name
+        self.players = []
+
+    def start_rounds(self, board_length, colors, scsa, rngs):
+        """Copies the player for every round, seeding each copy with the stream of its round
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret codes.
+            rngs (list of numpy.random.Generator): Source of randomness for each round, or None if not seeded.
+        """
+
+        self.players = []
+
+        for rng in rngs:
+
+            player = copy.deepcopy(self.player)
+
+            if rng is not None:
+
+                player.seed(rng)
+
+            self.players.append(player)
+
+        return
+
+    def make_guesses(self, board_length, colors, scsa, rounds, last_responses):
+        """Asks the copy of the player of every round still being played for its guess
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret codes.
+            rounds (numpy.ndarray): Position in the batch of each round still being played.
+            last_responses (numpy.ndarray): Last response of each round (see BatchPlayer.make_guesses).
+
+        Returns:
+            numpy.ndarray: Returns uint8 array of shape (len(rounds), board_length), invalid guesses get invalid colors.
+        """
+
+        return self.make_timed_guesses(board_length, colors, scsa, rounds, last_responses, "wall")[0]
+
+    def make_timed_guesses(self, board_length, colors, scsa, rounds, last_responses, clock):
+        """Asks the copy of the player of every round still being played for its guess, timing each copy
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret codes.
+            rounds (numpy.ndarray): Position in the batch of each round still being played.
+            last_responses (numpy.ndarray): Last response of each round (see BatchPlayer.make_guesses).
+            clock (str): Clock the copies are timed on (see watchdog.CLOCKS).
+
+        Returns:
+            guesses (numpy.ndarray): Guess of each round (see make_guesses).
+            times (numpy.ndarray): Seconds charged to each round (see Player.guess_time).
+            timed_out (numpy.ndarray): Whether the copy of each round raised GuessTimeout, which loses the round.
+        """
+
+        read_clock = CLOCKS[clock]
+
+        guesses = []
+        times = np.zeros(len(rounds))
+        timed_out = np.zeros(len(rounds), dtype=bool)
+
+        for i, (index, response) in enumerate(zip(rounds.tolist(), last_responses.tolist())):
+
+            player = self.players[index]
+
+            start = read_clock()
+
+            try:
+
+                guesses.append(player.make_guess(board_length, colors, scsa, tuple(response)))
+
+            except GuessTimeout:
+
+                guesses.append(None)
+                timed_out[i] = True
+
+            end = read_clock()
+
+            times[i] = player.guess_time(clock, (end - start) / 1e9)
+
+        return self.pack_guesses(guesses, board_length, colors), times, timed_out
+
+    def pack_guesses(self, guesses, board_length, colors):
+        """Converts the guesses of every round to color indices
+
+        Args:
+            guesses (list): Guess of each round, in any encoding.
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+
+        Returns:
+            numpy.ndarray: Returns uint8 array of shape (len(guesses), board_length), invalid guesses get invalid colors.
+        """
+
+        # Most players guess strs, which convert all at once
+        if all(isinstance(guess, str) and len(guess) == board_length for guess in guesses):
+
+            try:
+
+                return codes_to_array(guesses, board_length)
+
+            except UnicodeEncodeError:
+
+                pass
+
+        return np.array([self.guess_pegs(guess, board_length, len(colors)) for guess in guesses], dtype=np.uint8)
+
+    def guess_pegs(self, guess, board_length, num_colors):
+        """Converts a guess in any encoding to color indices
+
+        Args:
+            guess (str, int, numpy.ndarray or sequence of chrs): Guess of secret code.
+            board_length (int): Number of pegs of secret code.
+            num_colors (int): Number of colors that could be used in the secret code.
+
+        Returns:
+            numpy.ndarray: Returns uint8 array of color indices, all of them invalid if guess is not a valid code.
+        """
+
+        guess = join_colors(guess)
+
+        invalid = np.full(board_length, 255, dtype=np.uint8)
+
+        if code_encoding(guess) == "int" and not 0 <= guess < num_colors ** board_length:
+
+            return invalid
+
+        try:
+
+            pegs = np.asarray(encode_code(guess, board_length, num_colors, "array"))
+
+        except (ValueError, TypeError):
+
+            return invalid
+
+        if pegs.shape != (board_length,):
+
+            return invalid
+
+        return pegs
+
+
+def as_batch_player(player):
+    """Returns player if it can play batches of rounds, otherwise wraps it in SingleRoundPlayers
+
+    Args:
+        player (Player or BatchPlayer): Player, anything with a make_guesses method can play batches.
+
+    Returns:
+        BatchPlayer: Returns player that can play batches of rounds.
+    """
+
+    if hasattr(player, "make_guesses"):
+
+        return player
+
+    return SingleRoundPlayers(player)
+
+
+class BatchRounds:
+    """Rounds of Mastermind played in lockstep, one guess for every unfinished round per step
+
+    Rules are those of Round.play_round: a round is lost once its player has used more than time_cutoff seconds
+    (plus a buffer) or guess_cutoff guesses, failed on an invalid guess and won on a guess equal to its answer.
+    Players with a make_timed_guesses method (like SingleRoundPlayers) report the time of each round themselves.
+    Other batch players guess for every round in one call, whose time is shared equally between the rounds that
+    were still being played, since the work of each round cannot be told apart.
+    """
+
+    def __init__(self, board_length, colors, answers, scsa, guess_cutoff = 100, time_cutoff = 5, clock = "wall"):
+        """Constructor for BatchRounds
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list of strs): All possible colors that can be used to generate a code.
+            answers (list of strs or numpy.ndarray): Answer of every round, in any encoding (see codes.encode_codes).
+            scsa (SCSA): Instance of secret-code selection algorithm.
+            guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
+            time_cutoff (int, optional): Amount of time in seconds allowed for each round. Defaults to 5.
+            clock (str, optional): Clock the player's time is counted on (see Round). Defaults to "wall".
+        """
+
+        self.board_length = board_length
+        self.colors = colors
+        self.num_colors = len(colors)
+        self.answers = encode_codes(answers, board_length, self.num_colors, "array")
+        self.scsa = scsa
+        self.guess_cutoff = guess_cutoff
+        self.time_cutoff = time_cutoff
+        self.time_buffer = 0.1 # Seconds
+        self.clock = clock
+        self.read_clock = CLOCKS[clock]
+
+        self.guesses = np.zeros(len(self.answers), dtype=np.int64)
+        self.time_used = np.zeros(len(self.answers))
+        self.results = [None] * len(self.answers)
+
+        # Rounds played per second of the last call to play
+        self.rounds_per_second = None
+
+    def play(self, player, rngs = None):
+        """Plays out every round
+
+        Args:
+            player (Player or BatchPlayer): Player to guess the secret codes (see as_batch_player).
+            rngs (list of numpy.random.Generator, optional): Source of randomness of the player in each round.
+                                                             Defaults to None.
+
+        Returns:
+            results (list of strs): Result of each round (win, loss, or failure).
+            guesses (numpy.ndarray): Number of guesses of each round.
+            time_used (numpy.ndarray): Seconds used by the player in each round.
+        """
+
+        player = as_batch_player(player)
+
+        if rngs is None:
+
+            rngs = [None] * len(self.answers)
+
+        # Players that only have make_guesses need no preparation
+        if hasattr(player, "start_rounds"):
+
+            player.start_rounds(self.board_length, self.colors, self.scsa, rngs)
+
+        responses = np.zeros((len(self.answers), 3), dtype=np.int64)
+        active = np.arange(len(self.answers))
+
+        started = time.time()
+
+        while len(active) > 0:
+
+            if hasattr(player, "make_timed_guesses"):
+
+                guesses, times, timed_out = player.make_timed_guesses(self.board_length, self.colors, self.scsa, active, responses[active], self.clock)
+
+            else:
+
+                start = self.read_clock()
+                guesses = player.make_guesses(self.board_length, self.colors, self.scsa, active, responses[active])
+                end = self.read_clock()
+
+                times = (end - start) / 1e9 / len(active)
+                timed_out = np.zeros(len(active), dtype=bool)
+
+            guesses = np.asarray(guesses)
+
+            self.guesses[active] += 1
+            self.time_used[active] += times
+
+            late = timed_out | (self.time_used[active] > self.time_cutoff + self.time_buffer)
+
+            if guesses.shape != (len(active), self.board_length):
+
+                invalid = np.ones(len(active), dtype=bool)
+
+            else:
+
+                invalid = np.any((guesses < 0) | (guesses >= self.num_colors), axis=1)
+
+            scored = ~late & ~invalid
+
+            exact = np.zeros(len(active), dtype=np.int64)
+            other = np.zeros(len(active), dtype=np.int64)
+
+            if scored.any():
+
+                packed = score_pairs(guesses[scored].astype(np.uint8), self.answers[active[scored]], self.num_colors)
+
+                exact[scored], other[scored] = unpack_response(packed.astype(np.int64), self.board_length)
+
+            won = scored & (exact == self.board_length)
+            out_of_guesses = scored & ~won & (self.guesses[active] >= self.guess_cutoff)
+
+            for result, finished in (("loss", late), ("failure", ~late & invalid), ("win", won), ("loss", out_of_guesses)):
+
+                for index in active[finished]:
+
+                    self.results[index] = result
+
+            playing = scored & ~won & ~out_of_guesses
+
+            active = active[playing]
+
+            responses[active, 0] = exact[playing]
+            responses[active, 1] = other[playing]
+            responses[active, 2] = self.guesses[active]
+
+        self.rounds_per_second = len(self.answers) / max(time.time() - started, 1e-9)
+
+        return self.results, self.guesses, self.time_used
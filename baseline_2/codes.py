@@ -0,0 +1,403 @@
+# File contains helpers to convert secret codes between their encodings
+# A code can be a str ("ABCA"), a base-c integer id (its position in lexicographic order) or a uint8 array of color
+# indices ("A" is 0). Lists of codes can be lists of strs, int64 arrays of ids or uint8 matrices with one code per row.
+# See feedback.py for example usages
+
+from math import factorial
+import numpy as np
+
+def str_to_array(code):
+    """Converts a code to an array of color indices
+
+    Args:
+        code (str): Code made of colors "A", "B", ...
+
+    Returns:
+        numpy.ndarray: Returns uint8 array where "A" is 0, "B" is 1 and so on.
+    """
+
+    return np.frombuffer(code.encode("ascii"), dtype=np.uint8) - 65
+
+def array_to_str(code):
+    """Converts an array of color indices back to a code
+
+    Args:
+        code (numpy.ndarray): Array of color indices.
+
+    Returns:
+        str: Returns code made of colors "A", "B", ...
+    """
+
+    return (np.asarray(code, dtype=np.uint8) + 65).tobytes().decode("ascii")
+
+def codes_to_array(codes, board_length):
+    """Converts a list of codes to a matrix of color indices
+
+    Args:
+        codes (list of strs): Codes to convert, all of length board_length.
+        board_length (int): Number of pegs.
+
+    Returns:
+        numpy.ndarray: Returns uint8 array of shape (len(codes), board_length).
+    """
+
+    flat = np.frombuffer("".join(codes).encode("ascii"), dtype=np.uint8) - 65
+
+    return flat.reshape(-1, board_length)
+
+def join_colors(code):
+    """Joins a code given as a sequence of colors, like list("ABCA"), into a str
+
+    Args:
+        code (str, int, numpy.ndarray or sequence of chrs): Code in any encoding.
+
+    Returns:
+        str, int or numpy.ndarray: Returns the colors joined into a str, or code unchanged if it is not a sequence of
+                                   single characters.
+    """
+
+    if isinstance(code, (list, tuple)) and code and all(isinstance(peg, str) and len(peg) == 1 for peg in code):
+
+        return "".join(code)
+
+    return code
+
+def as_code_array(code):
+    """Returns code as an array of color indices, converting from a string if needed
+
+    Args:
+        code (str or numpy.ndarray): Code to convert.
+
+    Returns:
+        numpy.ndarray: Returns uint8 array of color indices.
+    """
+
+    if isinstance(code, str):
+
+        return str_to_array(code)
+
+    return np.asarray(code, dtype=np.uint8)
+
+def code_to_id(code, num_colors):
+    """Converts a code to its position in lexicographic order (AAAA is 0, AAAB is 1, ...)
+
+    Args:
+        code (str, int or numpy.ndarray): Code to convert, ids are returned unchanged.
+        num_colors (int): Number of colors that could be used in the code.
+
+    Returns:
+        int: Returns the code read as a base num_colors integer.
+    """
+
+    if code_encoding(code) == "int":
+
+        return int(code)
+
+    code_id = 0
+
+    for peg in as_code_array(code).tolist():
+
+        code_id = code_id * num_colors + peg
+
+    return code_id
+
+def id_to_array(code_id, board_length, num_colors):
+    """Converts a code id back to an array of color indices
+
+    Args:
+        code_id (int): Position of code in lexicographic order.
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in the code.
+
+    Returns:
+        numpy.ndarray: Returns uint8 array of color indices.
+    """
+
+    pegs = [0] * board_length
+
+    for i in range(board_length - 1, -1, -1):
+
+        code_id, pegs[i] = divmod(code_id, num_colors)
+
+    return np.array(pegs, dtype=np.uint8)
+
+def check_ids_fit(board_length, num_colors):
+    """Checks that every code id of a configuration fits in an int64, as arrays of ids require
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in a code.
+
+    Raises:
+        ValueError: The last code id, num_colors ** board_length - 1, is larger than the largest int64.
+    """
+
+    if num_colors ** board_length - 1 > np.iinfo(np.int64).max:
+
+        raise ValueError("Code ids of " + str(board_length) + " pegs and " + str(num_colors) + " colors do not fit in "
+                         "an int64, use the str or array encoding instead")
+
+    return
+
+def codes_to_ids(codes_array, num_colors):
+    """Converts a matrix of codes to their ids
+
+    Args:
+        codes_array (numpy.ndarray): Codes of shape (N, board_length).
+        num_colors (int): Number of colors that could be used in a code.
+
+    Raises:
+        ValueError: Code ids of this configuration do not fit in an int64 (see check_ids_fit).
+
+    Returns:
+        numpy.ndarray: Returns int64 array of code ids.
+    """
+
+    board_length = codes_array.shape[1]
+
+    check_ids_fit(board_length, num_colors)
+
+    powers = num_colors ** np.arange(board_length - 1, -1, -1, dtype=np.int64)
+
+    return codes_array.astype(np.int64) @ powers
+
+def ids_to_array(ids, board_length, num_colors):
+    """Converts code ids to a matrix of codes
+
+    Args:
+        ids (numpy.ndarray): Code ids.
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in a code.
+
+    Raises:
+        ValueError: Code ids of this configuration do not fit in an int64 (see check_ids_fit).
+
+    Returns:
+        numpy.ndarray: Returns uint8 array of shape (len(ids), board_length).
+    """
+
+    check_ids_fit(board_length, num_colors)
+
+    powers = num_colors ** np.arange(board_length - 1, -1, -1, dtype=np.int64)
+
+    return (np.asarray(ids, dtype=np.int64)[:, None] // powers % num_colors).astype(np.uint8)
+
+def all_codes_array(board_length, num_colors):
+    """Generates every code for a configuration in lexicographic order
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in a code.
+
+    Returns:
+        numpy.ndarray: Returns uint8 array of shape (num_colors ** board_length, board_length), row i is code i.
+    """
+
+    return ids_to_array(np.arange(num_colors ** board_length, dtype=np.int64), board_length, num_colors)
+
+def code_encoding(code):
+    """Returns the encoding of a code
+
+    Args:
+        code (str, int or numpy.ndarray): Code in any encoding.
+
+    Returns:
+        str: Returns "str", "int" or "array".
+    """
+
+    if isinstance(code, str):
+
+        return "str"
+
+    if isinstance(code, (int, np.integer)):
+
+        return "int"
+
+    return "array"
+
+def encode_code(code, board_length, num_colors, encoding = "str"):
+    """Converts a code to the requested encoding
+
+    Args:
+        code (str, int or numpy.ndarray): Code in any encoding.
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in the code.
+        encoding (str, optional): "str", "int" or "array". Defaults to "str".
+
+    Returns:
+        str, int or numpy.ndarray: Returns code in the requested encoding.
+    """
+
+    current = code_encoding(code)
+
+    if current == encoding:
+
+        return code
+
+    if current == "int":
+
+        code = id_to_array(int(code), board_length, num_colors)
+
+    if encoding == "str":
+
+        return array_to_str(code)
+
+    if encoding == "int":
+
+        return code_to_id(code, num_colors)
+
+    if encoding == "array":
+
+        return as_code_array(code)
+
+    raise ValueError("Unknown code encoding: " + str(encoding))
+
+def encode_codes(codes, board_length, num_colors, encoding = "str"):
+    """Converts a list of codes to the requested encoding
+
+    Args:
+        codes (list of strs, numpy.ndarray of ids or numpy.ndarray of codes): Codes in any encoding.
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors that could be used in a code.
+        encoding (str, optional): "str" for a list of strs, "int" for an int64 array of ids or "array" for a uint8
+                                  matrix of codes. Defaults to "str".
+
+    Returns:
+        list of strs or numpy.ndarray: Returns codes in the requested encoding.
+    """
+
+    if isinstance(codes, np.ndarray) and codes.ndim == 1:
+
+        if encoding == "int":
+
+            return codes.astype(np.int64)
+
+        codes = ids_to_array(codes, board_length, num_colors)
+
+    elif not isinstance(codes, np.ndarray):
+
+        if encoding == "str":
+
+            return list(codes)
+
+        codes = codes_to_array(codes, board_length)
+
+    if encoding == "str":
+
+        flat = (codes.astype(np.uint8) + 65).tobytes().decode("ascii")
+
+        return [flat[i:i+board_length] for i in range(0, len(flat), board_length)]
+
+    if encoding == "int":
+
+        return codes_to_ids(codes, num_colors)
+
+    if encoding == "array":
+
+        return codes.astype(np.uint8)
+
+    raise ValueError("Unknown code encoding: " + str(encoding))
+
+
+class CodeSequence:
+    """Every code of a configuration in lexicographic order, computed on demand
+
+    Behaves like a read-only list of strs (AAAA, AAAB, ...) without storing any code: the code at an index is that
+    index written in base len(colors), so lookups take O(board_length) time and the sequence takes O(1) memory.
+    """
+
+    def __init__(self, board_length, colors):
+        """Constructor for CodeSequence
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+        """
+
+        self.board_length = board_length
+        self.colors = list(colors)
+        self.num_colors = len(colors)
+        self.num_codes = self.num_colors ** board_length
+
+    def __len__(self):
+
+        return self.num_codes
+
+    def __getitem__(self, index):
+        """Returns the code at a position in lexicographic order
+
+        Args:
+            index (int): Position of the code, negative positions count from the end.
+
+        Raises:
+            IndexError: Position is out of range.
+
+        Returns:
+            str: Returns code at index.
+        """
+
+        if index < 0:
+
+            index += self.num_codes
+
+        if index < 0 or index >= self.num_codes:
+
+            raise IndexError("code index out of range")
+
+        pegs = [""] * self.board_length
+
+        for i in range(self.board_length - 1, -1, -1):
+
+            index, color = divmod(index, self.num_colors)
+
+            pegs[i] = self.colors[color]
+
+        return "".join(pegs)
+
+    def __contains__(self, code):
+
+        return len(code) == self.board_length and all(peg in self.colors for peg in code)
+
+    def index(self, code):
+        """Returns the position of a code in lexicographic order
+
+        Args:
+            code (str): Code to look up.
+
+        Raises:
+            ValueError: Code is not part of the sequence.
+
+        Returns:
+            int: Returns position of code.
+        """
+
+        if code not in self:
+
+            raise ValueError(str(code) + " is not a code of this configuration")
+
+        index = 0
+
+        for peg in code:
+
+            index = index * self.num_colors + self.colors.index(peg)
+
+        return index
+
+
+def arrangements(counts):
+    """Counts distinct arrangements of a multiset
+
+    Args:
+        counts (list of ints): Number of occurences for each color.
+
+    Returns:
+        int: Returns sum(counts)! / (counts[0]! * counts[1]! * ...).
+    """
+
+    total = factorial(sum(counts))
+
+    for count in counts:
+
+        total //= factorial(count)
+
+    return total
@@ -1,5 +1,5 @@
-from itertools import product
 from player import Player
+from candidates import CandidateSet, LexicographicEnumerator
 
 
 class Baseline2(Player):
@@ -8,27 +8,29 @@ class Baseline2(Player):
         For example, for p = 4, if guess AAAB got 0 0 1 in response, you would never again on that round make any guess that began with AAA or ended in B.
     """
 
+    # Largest number of possibilities kept in memory as an array, larger games walk the possibilities instead
+    max_candidates = 2 ** 20
+
+    # Directory of partition indexes to apply responses with (see candidates.PartitionIndex), None to score the
+    # possibilities instead
+    partition_directory = None
+
     def __init__(self):
         self.player_name = "baseline_B2_fbi"
-        self.last_guess = ""
-        self.updated_list = []
+        self.last_guess = None
+        # Codes not yet ruled out by any response of the current round
+        self.candidates = None
 
     def next_guess(self, board_length, colors, last_response):
-        # If no guesses have been made, generate all_possibilities
-        # print("a response was received: " + str(last_response))
+        # If no guesses have been made, start from every possibility
         if last_response[2] == 0:
-            colors = ''.join(colors)
-            self.all_possibilities = [
-                ''.join(p) for p in product(colors, repeat=board_length)]
-            self.updated_list = self.all_possibilities
-            self.current_guess = 0
-        elif(last_response[0] == 0 and last_response[1] == 0):
-            x = self.updated_list
-            last_guess = self.last_guess
-            for i in range(5):
-                noBull_nocow_remaining = [
-                    x for x in self.updated_list if last_guess[i] not in x]
-            self.updated_list = noBull_nocow_remaining
+            if len(colors) ** board_length <= self.max_candidates:
+                self.candidates = CandidateSet(board_length, colors, partitions=self.partition_directory)
+            else:
+                self.candidates = LexicographicEnumerator(board_length, colors)
+        else:
+            # Rule out every code that would have given a different response to the last guess
+            self.candidates.apply(self.last_guess, last_response[0], last_response[1])
 
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
@@ -44,11 +46,6 @@ class Baseline2(Player):
         Returns:
             str: Returns guess
         """
-        if last_response[2] == 0:
-            self.all_possibilities = []
         self.next_guess(board_length, colors, last_response)
-        # print(self.next_guess(board_length, colors))
-        self.last_guess = self.updated_list[0]
-        self.updated_list.remove(self.last_guess)
-        # print("guessing: " + self.last_guess)
-        return self.last_guess
+        self.last_guess = self.candidates.next_code()
+        return self.encode_guess(self.last_guess, board_length, colors)
@@ -1,15 +1,18 @@
 # File contains implementations for the players for Mastermind
 # See main.py or examples.ipynb for example usages
 
-import random
 from scsa import *
-from itertools import *
-
 
 class Player:
     """Player for Mastermind
     """
 
+    # Encoding of the guesses returned by make_guess ("str", "int" or "array"), Round accepts all of them
+    encoding = "str"
+
+    # Source of randomness of players that guess at random, seeded tournaments replace it every round
+    rng = None
+
     def __init__(self):
         """Constructor for Player
         """
@@ -33,16 +36,59 @@ class Player:
 
         raise NotImplementedError
 
+    def seed(self, rng):
+        """Replaces the source of randomness of the player
+
+        Args:
+            rng (numpy.random.Generator, int or numpy.random.SeedSequence): Source of randomness, or seed for a new one.
+        """
+
+        self.rng = np.random.default_rng(rng)
+
+        return
+
+    def guess_time(self, clock, measured):
+        """Returns the time the player is charged for its last guess
+
+        Args:
+            clock (str): Clock the round is timed with (see watchdog.CLOCKS).
+            measured (float): Seconds the round measured on that clock around make_guess.
+
+        Returns:
+            float: Returns measured, players that make their guesses in another process report their own time.
+        """
+
+        return measured
+
+    def encode_guess(self, guess, board_length, colors):
+        """Converts a guess to the encoding used by the player
+
+        Args:
+            guess (str, int or numpy.ndarray): Guess of secret code.
+            board_length (int): Number of pegs of secret code.
+            colors (list of chr): Colors that could be used in the secret code.
+
+        Returns:
+            str, int or numpy.ndarray: Returns guess in self.encoding.
+        """
+
+        return encode_code(guess, board_length, len(colors), self.encoding)
+
 
 class RandomFolks(Player):
     """Mastermind Player that makes random guesses
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for RandomFolks
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.player_name = "RandomFolks"
+        self.rng = np.random.default_rng(rng)
 
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
@@ -61,7 +107,7 @@ class RandomFolks(Player):
 
         scsa = InsertColors()
 
-        guess = scsa.generate_codes(board_length, colors)
+        guess = scsa.generate_codes(board_length, colors, 1, self.encoding, self.rng)
 
         return guess
 
@@ -70,11 +116,16 @@ class Boring(Player):
     """Mastermind Player that guesses all the same color and chooses that color at random
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for Boring
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.player_name = "Boring"
+        self.rng = np.random.default_rng(rng)
 
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
@@ -91,11 +142,11 @@ class Boring(Player):
             str: Returns guess
         """
 
-        color = random.sample(colors, k=1)
+        color = colors[self.rng.integers(len(colors))]
 
-        guess = list_to_str(color*board_length)
+        guess = color * board_length
 
-        return guess
+        return self.encode_guess(guess, board_length, colors)
 
 
 class B1Player(Player):
@@ -110,17 +161,17 @@ class B1Player(Player):
         self.player_name = "Baseline1"
         # index of the guess that will be made next from all_possibilities
         self.current_guess = -1
-        self.all_possibilities = []
+        # Codes are computed from their index on demand, so this never holds c^p strings
+        self.all_possibilities = CodeSequence(0, [])
 
     def next_guess(self, board_length, colors):
-        # If no guesses have been made, generate all_possibilities
+        # If no guesses have been made, start from the first code of this configuration
         if self.current_guess == -1:
-            colors = ''.join(colors)
-            self.all_possibilities = [
-                ''.join(p) for p in product(colors, repeat=board_length)]
+            if self.all_possibilities.board_length != board_length or self.all_possibilities.colors != list(colors):
+                self.all_possibilities = CodeSequence(board_length, colors)
             self.current_guess = 0
         else:
-            if self.current_guess == len(self.all_possibilities) - 1:
+            if self.current_guess == self.all_possibilities.num_codes - 1:
                 self.current_guess = 0
             else:
                 self.current_guess += 1
@@ -140,7 +191,27 @@ class B1Player(Player):
             str: Returns guess
         """
         if last_response[2] == 0:
-            self.all_possibilities = []
             self.current_guess = -1
         self.next_guess(board_length, colors)
-        return self.all_possibilities[self.current_guess]
+        if self.encoding == "int":
+            # The index of a code in lexicographic order is its id
+            return self.current_guess
+        return self.encode_guess(self.all_possibilities[self.current_guess], board_length, colors)
+
+    def make_guesses(self, board_length, colors, scsa, rounds, last_responses):
+        """Makes the next guess of many rounds at once (see batch.BatchPlayer)
+
+        The guesses ignore the responses, so guess n of every round is code n in lexicographic order.
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret codes.
+            rounds (numpy.ndarray): Position in the batch of each round still being played.
+            last_responses (numpy.ndarray): Array of shape (len(rounds), 3), row i is the last_response of round rounds[i].
+
+        Returns:
+            numpy.ndarray: Returns uint8 array of shape (len(rounds), board_length)
+        """
+        num_codes = len(colors) ** board_length
+        return ids_to_array(last_responses[:, 2] % num_codes, board_length, len(colors))
@@ -1,5 +1,7 @@
-from itertools import permutations
 from player import Player
+from candidates import ArrangementEnumerator
+from codes import array_to_str
+from color_discovery import ColorDiscovery
 
 class Baseline3(Player):
     """ Baseline 3 mastermind player
@@ -7,15 +9,19 @@ class Baseline3(Player):
     will tell you how many pegs of each color are in the answer. (You don't need to actually guess the last color;
     you can compute how many of those there are from the other answers.) Then you generate and test only answers
     consistent with that known color distribution. 
+    The color distribution is found with mixed-color group guesses (see ColorDiscovery), which takes fewer guesses
+    than c - 1 monochromatic ones when only a few of the colors are used.
     """
     def __init__(self):
         self.player_name = "Baseline3"
-        self.monochromatic_guess_list = []
+        # First phase, finds the # of pegs of each color
+        self.color_discovery = None
         # Keys: color
         # Value: # of color present in the secret code
         self.color_count_dict = {} 
-        self.informed_guess_list = []
-        self.informed_guess_list_counter = 0
+        # Arrangements of the known colors that are still consistent with every response
+        self.informed_guesses = None
+        self.last_guess = None
         
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
@@ -35,44 +41,30 @@ class Baseline3(Player):
         guess = ''
         if num_guess == 0:
             # Clear values for each round
-            self.informed_guess_list_counter = 0
             self.color_count_dict.clear()
-            self.monochromatic_guess_list = []
-            self.informed_guess_list = []
+            self.informed_guesses = None
+            self.color_discovery = ColorDiscovery(board_length, colors)
+        elif self.informed_guesses is None:
+            self.color_discovery.update(match_pegs, mismatch_pegs)
 
-            # Makes a list of c - 1 colors
-            self.monochromatic_guess_list = [ colors[i] * board_length for i in range(len(colors)-1)]
-            guess = self.monochromatic_guess_list[num_guess]
+        if self.informed_guesses is None:
+            guess = self.color_discovery.next_guess()
 
-        elif num_guess > 0 and num_guess <= len(self.monochromatic_guess_list):
-            total_pegs_of_a_color = match_pegs + mismatch_pegs 
-            
-            # Keys: color
-            # Value: # of color present in the secret code
-            self.color_count_dict[colors[num_guess-1]] = total_pegs_of_a_color
+            if guess is None:
+                # Keys: color
+                # Value: # of color present in the secret code
+                self.color_count_dict.update(self.color_discovery.counts)
 
-            if num_guess == len(self.monochromatic_guess_list):
-                # Calculating how times the c color appears in secret code
-                values = self.color_count_dict.values()
-                num_pegs_left = board_length - sum(values)
-                self.color_count_dict[colors[num_guess]] = num_pegs_left
-
-                # Generate an informed guess list based on the permutations of the color and the # of times the color appears in secret code
-                informed_string = ''
-                for key, value in self.color_count_dict.items():
-                    informed_string += key * value
-                self.informed_guess_list = [''.join(p) for p in permutations(informed_string)]
-                
-                # Removes duplicates in informed guess list
-                self.informed_guess_list = list(set(self.informed_guess_list))
-                guess = self.informed_guess_list[self.informed_guess_list_counter]
-
-            else:
-                guess = self.monochromatic_guess_list[num_guess]
+                # Walk the arrangements of the colors by the # of times each color appears in secret code,
+                # skipping arrangements that later responses rule out
+                color_counts = [self.color_count_dict.get(color, 0) for color in colors]
+                self.informed_guesses = ArrangementEnumerator(board_length, colors, color_counts)
+                guess = array_to_str(self.informed_guesses.next_code())
 
         else:
-            # Go through the informed guess list
-            self.informed_guess_list_counter += 1
-            guess = self.informed_guess_list[self.informed_guess_list_counter]
+            # Rule out arrangements that would have given a different response to the last guess
+            self.informed_guesses.apply(self.last_guess, match_pegs, mismatch_pegs)
+            guess = array_to_str(self.informed_guesses.next_code())
 
-        return guess
\ No newline at end of file
+        self.last_guess = guess
+        return self.encode_guess(guess, board_length, colors)
\ No newline at end of file
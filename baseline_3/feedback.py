@@ -0,0 +1,351 @@
+# File contains vectorized computation of Mastermind responses
+# See mastermind.py, fbi_B2.py or fbi_B3.py for example usages
+
+import os
+import numpy as np
+from codes import *
+
+def response_dtype(board_length):
+    """Returns the smallest unsigned dtype that can hold a packed response
+
+    Args:
+        board_length (int): Number of pegs.
+
+    Returns:
+        numpy.dtype: Returns uint8 while num_responses(board_length) <= 256 (boards of up to 15 pegs) and uint16
+                     otherwise.
+    """
+
+    if num_responses(board_length) <= 256:
+
+        return np.dtype(np.uint8)
+
+    return np.dtype(np.uint16)
+
+def num_responses(board_length):
+    """Returns number of distinct packed responses for a board
+
+    Args:
+        board_length (int): Number of pegs.
+
+    Returns:
+        int: Returns (board_length + 1) ** 2, an upper bound on packed response values.
+    """
+
+    return (board_length + 1) ** 2
+
+def pack_response(exact, other, board_length):
+    """Packs a response into a single integer
+
+    Args:
+        exact (int): Number of pegs that match exactly with the answer.
+        other (int): Number of pegs that are the right color, but in the wrong location.
+        board_length (int): Number of pegs.
+
+    Returns:
+        int: Returns exact * (board_length + 1) + other.
+    """
+
+    return exact * (board_length + 1) + other
+
+def unpack_response(packed, board_length):
+    """Unpacks a response packed by pack_response or score_many
+
+    Args:
+        packed (int or numpy.ndarray): Packed response(s).
+        board_length (int): Number of pegs.
+
+    Returns:
+        exact (int or numpy.ndarray): Number of pegs that match exactly with the answer.
+        other (int or numpy.ndarray): Number of pegs that are the right color, but in the wrong location.
+    """
+
+    return divmod(packed, board_length + 1)
+
+def score_many(guess, codes_array):
+    """Scores one guess against many codes at once
+
+    The number of exact matches is a row-wise comparison. The number of pegs of the right color is
+    the sum over colors of min(count in guess, count in code), which only needs to look at colors
+    present in the guess. Subtracting the exact matches leaves the "other" count, the same as
+    Round.process_guess.
+
+    Args:
+        guess (str or numpy.ndarray): Guess of secret code.
+        codes_array (numpy.ndarray or list of strs): Codes to score the guess against, shape (N, board_length).
+
+    Returns:
+        numpy.ndarray: Returns packed response (see pack_response) for each code.
+    """
+
+    guess = as_code_array(guess)
+    board_length = len(guess)
+
+    if not isinstance(codes_array, np.ndarray):
+
+        codes_array = codes_to_array(codes_array, board_length)
+
+    exact = np.count_nonzero(codes_array == guess, axis=1)
+
+    common = np.zeros(len(codes_array), dtype=np.intp)
+
+    colors, guess_counts = np.unique(guess, return_counts=True)
+
+    for color, guess_count in zip(colors, guess_counts):
+
+        code_counts = np.count_nonzero(codes_array == color, axis=1)
+
+        common += np.minimum(code_counts, guess_count)
+
+    packed = exact * (board_length + 1) + (common - exact)
+
+    return packed.astype(response_dtype(board_length))
+
+def score_pairs(guesses, answers, num_colors):
+    """Scores each guess against its own answer, for many rounds at once
+
+    Args:
+        guesses (numpy.ndarray): Guesses of shape (K, board_length).
+        answers (numpy.ndarray): Answers of shape (K, board_length), answers[i] is the answer for guesses[i].
+        num_colors (int): Number of colors that could be used in a code.
+
+    Returns:
+        numpy.ndarray: Returns packed response (see pack_response) for each pair.
+    """
+
+    board_length = answers.shape[1]
+
+    exact = np.count_nonzero(guesses == answers, axis=1)
+
+    common = np.minimum(color_histograms(guesses, num_colors), color_histograms(answers, num_colors)).sum(axis=1)
+
+    packed = exact * (board_length + 1) + (common - exact)
+
+    return packed.astype(response_dtype(board_length))
+
+def score_matrix(guesses, codes_array, num_colors):
+    """Scores many guesses against many codes at once
+
+    Works on columns like FeedbackTable.build, so each step is a (guesses, codes) operation instead of a
+    reduction over pegs.
+
+    Args:
+        guesses (numpy.ndarray): Guesses of shape (G, board_length).
+        codes_array (numpy.ndarray): Codes to score the guesses against, shape (N, board_length).
+        num_colors (int): Number of colors that could be used in a code.
+
+    Returns:
+        numpy.ndarray: Returns packed responses (see pack_response) of shape (G, N).
+    """
+
+    board_length = codes_array.shape[1]
+    dtype = response_dtype(board_length)
+
+    code_columns = np.ascontiguousarray(codes_array.T)
+    histogram_columns = np.ascontiguousarray(color_histograms(codes_array, num_colors).T)
+    guess_histograms = color_histograms(guesses, num_colors)
+
+    exact = np.zeros((len(guesses), len(codes_array)), dtype=dtype)
+    common = np.zeros((len(guesses), len(codes_array)), dtype=dtype)
+
+    for i in range(board_length):
+
+        exact += guesses[:, i, None] == code_columns[i]
+
+    # Colors missing from every guess add nothing
+    for color in np.flatnonzero(guess_histograms.any(axis=0)):
+
+        common += np.minimum(guess_histograms[:, color, None], histogram_columns[color])
+
+    return exact * dtype.type(board_length + 1) + (common - exact)
+
+def partition_sizes(guesses, codes_array, num_colors, weights = None):
+    """Counts how many codes would give each response to each guess
+
+    Args:
+        guesses (numpy.ndarray): Guesses of shape (G, board_length).
+        codes_array (numpy.ndarray): Codes the secret code could be, shape (N, board_length).
+        num_colors (int): Number of colors that could be used in a code.
+        weights (numpy.ndarray, optional): Weight of each code, summed instead of counting codes. Defaults to None.
+
+    Returns:
+        numpy.ndarray: Returns array of shape (G, num_responses(board_length)), indexed by packed response.
+                       Counts are ints, or floats if weights is given.
+    """
+
+    board_length = codes_array.shape[1]
+    responses = num_responses(board_length)
+
+    # Give every guess its own range of bins so one bincount covers them all
+    offsets = np.arange(len(guesses), dtype=np.int64)[:, None] * responses
+
+    packed = score_matrix(guesses, codes_array, num_colors) + offsets
+
+    if weights is not None:
+
+        weights = np.tile(weights, len(guesses))
+
+    counts = np.bincount(packed.ravel(), weights=weights, minlength=len(guesses) * responses)
+
+    return counts.reshape(len(guesses), responses)
+
+
+def color_histograms(codes_array, num_colors):
+    """Counts number of occurences for each color in each code
+
+    Args:
+        codes_array (numpy.ndarray): Codes of shape (N, board_length).
+        num_colors (int): Number of colors that could be used in a code.
+
+    Returns:
+        numpy.ndarray: Returns uint8 array of shape (N, num_colors).
+    """
+
+    offsets = np.arange(len(codes_array), dtype=np.int64)[:, None] * num_colors
+
+    counts = np.bincount((codes_array + offsets).ravel(), minlength=len(codes_array) * num_colors)
+
+    return counts.reshape(len(codes_array), num_colors).astype(np.uint8)
+
+
+class FeedbackTable:
+    """Precomputed responses for every (guess, answer) pair of a configuration
+
+    Entry [i, j] is the packed response (see pack_response) for guess code i against answer code j,
+    where codes are numbered in lexicographic order (see codes.code_to_id). The table is stored on
+    disk and opened as a read-only memory map, so every process playing the same configuration shares
+    one copy through the OS page cache.
+    """
+
+    # Refuse to build tables larger than this many bytes unless asked to
+    max_bytes = 2 ** 31
+
+    def __init__(self, board_length, colors, directory = "feedback_tables", max_bytes = None):
+        """Constructor for FeedbackTable, loads the table from directory or builds it there first
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            directory (str, optional): Directory where tables are stored. Defaults to "feedback_tables".
+            max_bytes (int, optional): Largest table allowed. Defaults to FeedbackTable.max_bytes.
+
+        Raises:
+            ValueError: Table would not fit in a uint8 per entry, exceeds max_bytes or exceeds physical memory.
+        """
+
+        self.board_length = board_length
+        self.num_colors = len(colors)
+        self.num_codes = self.num_colors ** board_length
+
+        if max_bytes is None:
+
+            max_bytes = self.max_bytes
+
+        table_bytes = self.num_codes ** 2
+
+        if response_dtype(board_length) != np.uint8:
+
+            raise ValueError("Responses for " + str(board_length) + " pegs do not fit in one byte")
+
+        if table_bytes > min(max_bytes, physical_memory()):
+
+            raise ValueError("Feedback table for " + str(board_length) + " pegs and " + str(self.num_colors) +
+                             " colors needs " + str(table_bytes) + " bytes, which is too large")
+
+        self.path = os.path.join(directory, "feedback_" + str(board_length) + "_" + str(self.num_colors) + ".u8")
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) != table_bytes:
+
+            self.build(directory)
+
+        self.table = np.memmap(self.path, dtype=np.uint8, mode="r", shape=(self.num_codes, self.num_codes))
+
+    def build(self, directory):
+        """Computes every response and writes the table to disk
+
+        Args:
+            directory (str): Directory to write the table to.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+
+        codes = all_codes_array(self.board_length, self.num_colors)
+        histograms = color_histograms(codes, self.num_colors)
+
+        # Write to a temporary file first so other processes never open a partially built table
+        temp_path = self.path + "." + str(os.getpid()) + ".tmp"
+
+        table = np.memmap(temp_path, dtype=np.uint8, mode="w+", shape=(self.num_codes, self.num_codes))
+
+        # Work on columns so each step is a long (block, num_codes) operation instead of a reduction over pegs
+        code_columns = np.ascontiguousarray(codes.T)
+        histogram_columns = np.ascontiguousarray(histograms.T)
+
+        block = max(1, 2 ** 20 // self.num_codes)
+
+        for start in range(0, self.num_codes, block):
+
+            guesses = codes[start:start+block]
+            guess_histograms = histograms[start:start+block]
+
+            exact = np.zeros((len(guesses), self.num_codes), dtype=np.uint8)
+            common = np.zeros((len(guesses), self.num_codes), dtype=np.uint8)
+
+            for i in range(self.board_length):
+
+                exact += guesses[:, i, None] == code_columns[i]
+
+            for color in range(self.num_colors):
+
+                common += np.minimum(guess_histograms[:, color, None], histogram_columns[color])
+
+            table[start:start+block] = exact * np.uint8(self.board_length + 1) + (common - exact)
+
+        table.flush()
+        del table
+
+        os.replace(temp_path, self.path)
+
+    def row(self, guess):
+        """Returns responses for a guess against every code
+
+        Args:
+            guess (str or numpy.ndarray): Guess of secret code.
+
+        Returns:
+            numpy.ndarray: Returns packed responses indexed by answer code id.
+        """
+
+        return self.table[code_to_id(guess, self.num_colors)]
+
+    def lookup(self, guess, answer):
+        """Looks up the response for a guess against an answer
+
+        Args:
+            guess (str or numpy.ndarray): Guess of secret code.
+            answer (str or numpy.ndarray): Secret code.
+
+        Returns:
+            exact (int): Number of pegs that match exactly with the answer.
+            other (int): Number of pegs that are the right color, but in the wrong location.
+        """
+
+        packed = int(self.table[code_to_id(guess, self.num_colors), code_to_id(answer, self.num_colors)])
+
+        return unpack_response(packed, self.board_length)
+
+
+def physical_memory():
+    """Returns amount of physical memory in bytes, or infinity if it cannot be determined
+
+    Returns:
+        num: Returns physical memory in bytes.
+    """
+
+    try:
+
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+    except (ValueError, OSError, AttributeError):
+
+        return float("inf")
@@ -3,9 +3,15 @@
 
 import random
 import time
-from operator import sub
+import multiprocessing
+import numpy as np
+from operator import eq, sub
 from scsa import *
 from player import *
+from feedback import *
+from batch import *
+from watchdog import *
+from swar import *
 
 def letter_to_num(letter):
     """Converts letter to number based on position its in alphabet
@@ -19,6 +25,39 @@ def letter_to_num(letter):
 
     return ord(letter) - 64
 
+# Color index of pegs whose color is not one of the colors of the game (see peg_table)
+INVALID_PEG = 255
+
+# Keys: tuple of colors
+# Value: table of peg_table
+peg_tables = {}
+
+def peg_table(colors):
+    """Returns the table that converts guesses to color indices in one pass of bytes.translate
+
+    Args:
+        colors (list of chrs): Colors of the game.
+
+    Returns:
+        bytes: Returns 256 bytes, the color index of the latin-1 byte of each color and INVALID_PEG for every other byte.
+    """
+
+    key = tuple(colors)
+
+    if key not in peg_tables:
+
+        table = bytearray([INVALID_PEG]) * 256
+
+        for color in colors:
+
+            if len(color) == 1 and ord(color) < 256 and 0 <= letter_to_num(color) - 1 < INVALID_PEG:
+
+                table[ord(color)] = letter_to_num(color) - 1
+
+        peg_tables[key] = bytes(table)
+
+    return peg_tables[key]
+
 def score(results):
     """Computes score for a tournament
 
@@ -31,54 +70,220 @@ def score(results):
 
     return 5*results["win"] - 2*results["failure"]
 
+def round_streams(seed, index):
+    """Returns the sources of randomness of one round of a seeded tournament
+
+    Round index draws from SeedSequence(seed, spawn_key=(index,)), the same stream as SeedSequence(seed).spawn(n)[index],
+    so any round can be regenerated on its own, in any process, without going through the rounds before it.
+
+    Args:
+        seed (int): Master seed of the tournament.
+        index (int): Index of the round, starting at 0.
+
+    Returns:
+        secret_rng (numpy.random.Generator): Generator for the secret code of the round.
+        player_rng (numpy.random.Generator): Generator for the player during the round.
+    """
+
+    secret_seed, player_seed = np.random.SeedSequence(seed, spawn_key=(index,)).spawn(2)
+
+    return np.random.default_rng(secret_seed), np.random.default_rng(player_seed)
+
+# Tournament played by the current worker process of a parallel tournament, set by start_worker
+worker_tournament = {}
+
+def start_worker(mastermind, player, scsa, seed):
+    """Keeps what every round of a parallel tournament needs in the worker process
+
+    Args:
+        mastermind (Mastermind): Game being played.
+        player (Player): Worker's own copy of the player.
+        scsa (SCSA): SCSA used to generate secret codes.
+        seed (int): Master seed of the tournament.
+    """
+
+    worker_tournament.update(mastermind=mastermind, player=player, scsa=scsa, seed=seed)
+
+    return
+
+def play_worker_round(index):
+    """Plays one round of a parallel tournament in a worker process (see start_worker)
+
+    Args:
+        index (int): Index of the round, starting at 0.
+
+    Returns:
+        tuple: Returns result, number of guesses and duration of the round (see Mastermind.play_seeded_round).
+    """
+
+    mastermind = worker_tournament["mastermind"]
+
+    return mastermind.play_seeded_round(worker_tournament["player"], worker_tournament["scsa"], worker_tournament["seed"], index)
+
 
 class Round:
     """Representation for round of the game of Mastermind
     """
 
-    def __init__(self, board_length, colors, answer, scsa, guess_cutoff = 100, time_cutoff = 5):
+    __slots__ = ("board_length", "colors", "num_colors", "num_codes", "answer", "scsa", "guesses", "guess_cutoff",
+                 "time_cutoff", "time_buffer", "time_used", "feedback_table", "watchdog", "deadline", "clock",
+                 "read_clock", "answer_pegs", "answer_bytes", "answer_color_count", "answer_colors", "answer_color_set",
+                 "answer_id", "peg_table", "responses", "backend", "answer_word", "answer_histogram")
+
+    def __init__(self, board_length, colors, answer, scsa, guess_cutoff = 100, time_cutoff = 5, feedback_table = None, watchdog = False, deadline = None, clock = "wall", backend = "python"):
         """Constuctor for Round
 
         Args:
             board_length (int): Number of pegs.
             colors (list of strs): All possible colors that can be used to generate a code.
-            answer (string): Answer for the round that the player is trying to guess.
+            answer (str, int or numpy.ndarray): Answer for the round that the player is trying to guess, in any code encoding.
             scsa (SCSA): Instance of secret-code selection algorithm.
             guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
             time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 5.
+            feedback_table (FeedbackTable, optional): Precomputed responses to look guesses up in. Defaults to None.
+            watchdog (bool, optional): Interrupt guesses that run past the round's time or deadline, instead of
+                                       measuring them once they return (see watchdog.py). Defaults to False.
+            deadline (float, optional): Time (as returned by time.time) by which the round must be over, checked by
+                                        the watchdog only. Defaults to None, no deadline.
+            clock (str, optional): Clock the player's time is counted on, "wall", or "process" or "thread" to only
+                                   count the CPU time of the player (see watchdog.CLOCKS). Defaults to "wall".
+            backend (str, optional): How responses are computed, "python", or "swar" to score bit-packed codes (see
+                                     swar.py, boards of up to 16 pegs and 16 colors). Defaults to "python".
+
+        Raises:
+            ValueError: Unknown backend, or codes of the configuration do not fit the backend.
         """
 
         self.board_length = board_length
         self.colors = colors
-        self.answer = answer
+        self.num_colors = len(colors)
+        self.num_codes = self.num_colors ** board_length
+        self.answer = encode_code(answer, board_length, self.num_colors, "str")
         self.scsa = scsa
         self.guesses = 0
         self.guess_cutoff = guess_cutoff
         self.time_cutoff = time_cutoff
         self.time_buffer = 0.1 # Seconds
         self.time_used = 0
+        self.feedback_table = feedback_table
+        self.watchdog = watchdog
+        self.deadline = deadline
+        self.clock = clock
+        self.read_clock = CLOCKS[clock]
 
-    def valid_guess(self, guess):
-        """Checks whether a guess is valid
+        # Answer in the encoded forms, computed once per round
+        self.answer_pegs = [letter_to_num(peg) - 1 for peg in self.answer]
+        self.answer_bytes = bytes(self.answer_pegs)
+        self.answer_color_count = self.count_colors(self.answer)
+        # Color index and number of pegs of each color of the answer
+        self.answer_colors = [(color, count) for color, count in enumerate(self.answer_color_count) if count > 0]
+        # Colors of the answer if no color appears twice in it, None otherwise
+        self.answer_color_set = None
+
+        if len(self.answer_colors) == board_length:
+
+            self.answer_color_set = frozenset(color for color, count in self.answer_colors)
+        self.answer_id = code_to_id(self.answer, self.num_colors)
+        self.peg_table = peg_table(colors)
+
+        # Keys: guess made during the round (str or code id)
+        # Value: (exact, other) response to it
+        self.responses = {}
+
+        self.backend = backend
+        self.answer_word = None
+        self.answer_histogram = None
+
+        if backend == "swar":
+
+            if not fits(board_length, self.num_colors):
+
+                raise ValueError("Codes of " + str(board_length) + " pegs and " + str(self.num_colors) + " colors do not fit in a packed word")
+
+            self.answer_word = pack_int(self.answer_pegs)
+            self.answer_histogram = histogram_int(self.answer_pegs)
+
+        elif backend != "python":
+
+            raise ValueError("Unknown backend: " + str(backend))
+
+    def str_pegs(self, guess):
+        """Converts a guess given as a str to color indices, checking it on the way
 
         Args:
             guess (str): Guess of secret code.
 
         Returns:
-            bool: Returns True if guess is valid (correct length and uses only possible colors) and False otherwise.
+            bytes: Returns color index of each peg, or None if guess is not valid.
         """
 
         if len(guess) != self.board_length:
 
-            return False
+            return None
 
-        for peg in guess:
+        try:
+
+            pegs = guess.encode("latin-1").translate(self.peg_table)
+
+        except UnicodeEncodeError:
+
+            return None
+
+        if INVALID_PEG in pegs:
+
+            return None
+
+        return pegs
+
+    def encoded_pegs(self, guess):
+        """Converts a guess given as a code id or array to a list of color indices
+
+        Args:
+            guess (int or numpy.ndarray): Guess of secret code.
+
+        Returns:
+            list of ints: Returns color index of each peg, or None if guess is not valid.
+        """
+
+        if code_encoding(guess) == "int":
+
+            if guess < 0 or guess >= self.num_codes:
+
+                return None
+
+            return id_to_array(int(guess), self.board_length, self.num_colors).tolist()
+
+        pegs = np.asarray(guess)
+
+        if pegs.shape != (self.board_length,) or pegs.dtype.kind not in "iu":
+
+            return None
+
+        pegs = pegs.tolist()
 
-            if peg not in self.colors:
+        if min(pegs) < 0 or max(pegs) >= self.num_colors:
 
-                return False 
+            return None
 
-        return True
+        return pegs
+
+    def valid_guess(self, guess):
+        """Checks whether a guess is valid
+
+        Args:
+            guess (str, int, numpy.ndarray or sequence of chrs): Guess of secret code.
+
+        Returns:
+            bool: Returns True if guess is valid (correct length and uses only possible colors) and False otherwise.
+        """
+
+        guess = join_colors(guess)
+
+        if code_encoding(guess) != "str":
+
+            return self.encoded_pegs(guess) is not None
+
+        return self.str_pegs(guess) is not None
 
     def count_colors(self, guess):
         """Counts number of occurences for each color 
@@ -100,51 +305,79 @@ class Round:
 
         return counts
 
-    def process_guess(self, guess):
-        """Determines number of exactly correct pegs and partially correct pegs for a guess 
+    def process_pegs(self, pegs):
+        """Determines number of exactly correct pegs and partially correct pegs for a guess given as color indices
 
         Args:
-            guess (str): Guess of secret code.
+            pegs (list of ints or bytes): Color index of each peg of the guess.
 
         Returns:
             exact (int): Number of pegs that match exactly with the answer.
             other (int): Number of pegs that are the right color, but in the wrong location.
         """
 
-        guess_color_count = self.count_colors(guess)
-        answer_color_count = self.count_colors(self.answer)
+        if self.answer_word is not None:
 
-        exact = 0
-        other = 0
+            return score_int(pack_int(pegs), histogram_int(pegs), self.answer_word, self.answer_histogram, self.board_length)
 
-        for i in range(self.board_length):
+        exact = sum(map(eq, pegs, self.answer_bytes))
 
-            if guess[i] == self.answer[i]:
+        # Only the colors of the answer can be in common, once each if it has no repeated color
+        if self.answer_color_set is not None:
 
-                exact += 1
+            return exact, len(self.answer_color_set.intersection(pegs)) - exact
 
-                # Decrease color counts
-                guess_color_count[letter_to_num(guess[i])-1] -= 1
-                answer_color_count[letter_to_num(self.answer[i])-1] -= 1
+        common = 0
 
-        for i in range(len(self.colors)):
+        for color, count in self.answer_colors:
 
-            if answer_color_count[i] <= guess_color_count[i]:
+            found = pegs.count(color)
 
-                other += answer_color_count[i]
+            common += found if found < count else count
 
-            elif guess_color_count[i] < answer_color_count[i] and guess_color_count[i] > 0:
+        return exact, common - exact
 
-                other += guess_color_count[i]
+    def process_guess(self, guess):
+        """Determines number of exactly correct pegs and partially correct pegs for a guess 
 
-        return exact, other
+        Args:
+            guess (str, int or numpy.ndarray): Guess of secret code.
+
+        Returns:
+            exact (int): Number of pegs that match exactly with the answer.
+            other (int): Number of pegs that are the right color, but in the wrong location.
+        """
+
+        if self.feedback_table is not None:
+
+            return self.feedback_table.lookup(guess, self.answer_id)
+
+        if code_encoding(guess) != "str":
+
+            return self.process_pegs(self.encoded_pegs(guess))
+
+        return self.process_pegs(self.str_pegs(guess))
+
+    def process_guesses(self, guesses):
+        """Determines responses for many guesses at once
+
+        Args:
+            guesses (list of strs or numpy.ndarray): Guesses of secret code, all of valid length and colors.
+
+        Returns:
+            numpy.ndarray: Returns packed response for each guess (see feedback.unpack_response).
+        """
+
+        # Responses are symmetric, so scoring the answer against every guess gives each guess's response
+        return score_many(self.answer, guesses)
 
 
     def respond_to_guess(self, guess):
         """Responds with correctness of player's guess
 
         Args:
-            guess (str): Guess of secret code
+            guess (str, int, numpy.ndarray or sequence of chrs): Guess of secret code, a sequence of colors like
+                                                                 list("ABCA") is read as the str of its colors
 
         Returns:
             string or tuple of ints: Returns "win" if guess is answer, returns "invalid" if guess is not valid, and 
@@ -152,21 +385,113 @@ class Round:
                                      and number of guesses so far otherwise.
         """
 
+        guess = join_colors(guess)
+
+        if not isinstance(guess, str):
+
+            return self.respond_to_encoded_guess(guess)
+
         if guess == self.answer:
 
-            response = "win"
+            return "win"
 
-        elif self.valid_guess(guess):
-            
-            exact, other = self.process_guess(guess)
+        response = self.responses.get(guess)
 
-            response = (exact, other, self.guesses)
+        if response is None:
 
-        else:
+            pegs = self.str_pegs(guess)
+
+            if pegs is None:
+
+                return "invalid"
+
+            if self.feedback_table is not None:
+
+                response = self.feedback_table.lookup(guess, self.answer_id)
+
+            else:
+
+                response = self.process_pegs(pegs)
+
+            self.responses[guess] = response
+
+        return (response[0], response[1], self.guesses)
+
+    def respond_to_encoded_guess(self, guess):
+        """Responds with correctness of player's guess given as a code id or array
+
+        Args:
+            guess (int or numpy.ndarray): Guess of secret code
+
+        Returns:
+            string or tuple of ints: Same as respond_to_guess.
+        """
+
+        if code_encoding(guess) == "int":
+
+            if not 0 <= guess < self.num_codes:
+
+                return "invalid"
 
-            response = "invalid"
+            if guess == self.answer_id:
 
-        return response
+                return "win"
+
+            response = self.responses.get(guess)
+
+            if response is None:
+
+                if self.feedback_table is not None:
+
+                    response = self.feedback_table.lookup(guess, self.answer_id)
+
+                else:
+
+                    response = self.process_pegs(self.encoded_pegs(guess))
+
+                self.responses[guess] = response
+
+            return (response[0], response[1], self.guesses)
+
+        pegs = self.encoded_pegs(guess)
+
+        if pegs is None:
+
+            return "invalid"
+
+        if pegs == self.answer_pegs:
+
+            return "win"
+
+        exact, other = self.process_pegs(pegs)
+
+        return (exact, other, self.guesses)
+
+    def make_guess(self, player, response):
+        """Asks the player for a guess, interrupting it once the round is out of time if the watchdog is on
+
+        Args:
+            player (Player): Player to guess secret code.
+            response (tuple of ints): Last response given to the player.
+
+        Raises:
+            GuessTimeout: The watchdog interrupted the player.
+
+        Returns:
+            str, int or numpy.ndarray: Returns guess of the player.
+        """
+
+        if not self.watchdog:
+
+            return player.make_guess(self.board_length, self.colors, self.scsa, response)
+
+        budget = self.time_cutoff + self.time_buffer - self.time_used
+
+        if self.deadline is not None:
+
+            budget = min(budget, self.deadline - time.time())
+
+        return run_with_deadline(player.make_guess, budget, self.board_length, self.colors, self.scsa, response, clock=self.clock)
 
     def play_round(self, player):
         """Plays out a round of Mastermind
@@ -183,17 +508,27 @@ class Round:
 
         while self.guesses < self.guess_cutoff:
 
-            start = time.time()
-            guess = player.make_guess(self.board_length, self.colors, self.scsa, response)
-            end = time.time()
+            timed_out = False
+
+            start = self.read_clock()
+
+            try:
+
+                guess = self.make_guess(player, response)
+
+            except GuessTimeout:
+
+                timed_out = True
+
+            end = self.read_clock()
 
             self.guesses += 1
 
-            duration = end - start
+            duration = player.guess_time(self.clock, (end - start) / 1e9)
 
             self.time_used += duration
 
-            if self.time_used > self.time_cutoff + self.time_buffer:
+            if timed_out or self.time_used > self.time_cutoff + self.time_buffer:
 
                 return ("loss", self.guesses)
 
@@ -216,7 +551,7 @@ class Mastermind:
     """Representation to play the game of Mastermind
     """
 
-    def __init__(self, board_length = 4, colors = [chr(i) for i in range(65,91)], guess_cutoff = 100, round_time_cutoff = 5, tournament_time_cutoff = 300):
+    def __init__(self, board_length = 4, colors = [chr(i) for i in range(65,91)], guess_cutoff = 100, round_time_cutoff = 5, tournament_time_cutoff = 300, encoding = "str", watchdog = False, clock = "wall", backend = "python"):
         """Constructor for Mastermind
 
         Args:
@@ -225,6 +560,13 @@ class Mastermind:
             guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
             round_time_cutoff (int, optional):  Amount of time in seconds allowed for the round. Defaults to 5.
             tournament_time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 300.
+            encoding (str, optional): Encoding of generated secret codes ("str", "int" or "array"). Defaults to "str".
+            watchdog (bool, optional): Interrupt guesses once their round or the tournament runs out of time, so a
+                                       tournament never runs much past tournament_time_cutoff (see Round). Defaults to False.
+            clock (str, optional): Clock players are timed with (see Round). With "process" or "thread" rounds and
+                                   tournaments only count the CPU time of the player, not that of the engine or of
+                                   other processes, so results do not depend on the load of the machine. Defaults to "wall".
+            backend (str, optional): How rounds compute responses, "python" or "swar" (see Round). Defaults to "python".
         """
 
         self.board_length = board_length
@@ -234,6 +576,65 @@ class Mastermind:
         self.round_time_cutoff = round_time_cutoff
         self.tournament_time_cutoff = tournament_time_cutoff
         self.time_used = 0
+        self.encoding = encoding
+        self.feedback_table = None
+        # Master seed of the last tournament played (see play_tournament)
+        self.seed = None
+        self.watchdog = watchdog
+        self.clock = clock
+        self.backend = backend
+        # Time by which the current tournament must be over, set when it starts (see start_deadline)
+        self.deadline = None
+
+    def load_feedback_table(self, directory = "feedback_tables", max_bytes = None):
+        """Loads (building it first if needed) the table of every response for this configuration
+
+        Rounds played afterwards look responses up in the table instead of computing them.
+
+        Args:
+            directory (str, optional): Directory where tables are stored. Defaults to "feedback_tables".
+            max_bytes (int, optional): Largest table allowed. Defaults to FeedbackTable.max_bytes.
+
+        Raises:
+            ValueError: Table is too large for this configuration (see FeedbackTable).
+        """
+
+        self.feedback_table = FeedbackTable(self.board_length, self.colors, directory, max_bytes)
+
+        return
+
+    def start_deadline(self):
+        """Sets the time by which the tournament starting now must be over, given the time already used
+
+        Tournaments timed on a CPU clock have no deadline, they end once the rounds have used up their time.
+        """
+
+        if self.clock == "wall":
+
+            self.deadline = time.time() + self.tournament_time_cutoff - self.time_used
+
+        else:
+
+            self.deadline = None
+
+        return
+
+    def charged_time(self, round, duration):
+        """Returns the time a round counts for in the tournament
+
+        Args:
+            round (Round): Round just played.
+            duration (float): Seconds taken to play the round.
+
+        Returns:
+            float: Returns duration, or the time of the player alone on a CPU clock.
+        """
+
+        if self.clock == "wall":
+
+            return duration
+
+        return round.time_used
 
     def print_results(self, player, results, num_rounds):
         """Prints results for a tournament
@@ -252,48 +653,247 @@ class Mastermind:
 
         return 
 
-    def play_tournament(self, player, scsa, num_rounds):
+    def secret_codes(self, scsa, seed, start, num_rounds):
+        """Generates the secret codes of consecutive rounds of a seeded tournament (see round_streams)
+
+        Args:
+            scsa (SCSA): SCSA used to generate secret codes.
+            seed (int): Master seed of the tournament.
+            start (int): Index of the first round, starting at 0.
+            num_rounds (int): Number of secret codes to generate.
+
+        Returns:
+            list of strs or numpy.ndarray: Returns secret codes in self.encoding (see codes.encode_codes), or None if
+                                           scsa cannot generate codes for this configuration.
+        """
+
+        codes = np.empty((num_rounds, self.board_length), dtype=np.uint8)
+
+        for i in range(num_rounds):
+
+            secret_rng, _ = round_streams(seed, start + i)
+
+            code = scsa.generate_array(self.board_length, self.colors, 1, secret_rng)
+
+            if code is None:
+
+                return
+
+            codes[i] = code[0]
+
+        return encode_codes(codes, self.board_length, self.num_colors, self.encoding)
+
+    def seeded_round(self, player, scsa, seed, index):
+        """Sets up round index of a seeded tournament, the same way whichever rounds were played before it
+
+        The secret code is drawn from the round's own stream and the player is reseeded with another one
+        (see round_streams and Player.seed).
+
+        Args:
+            player (Player): Player who plays the round.
+            scsa (SCSA): SCSA used to generate the secret code.
+            seed (int): Master seed of the tournament.
+            index (int): Index of the round, starting at 0.
+
+        Returns:
+            Round: Returns the round, ready to be played.
+        """
+
+        secret_rng, player_rng = round_streams(seed, index)
+
+        code = scsa.generate_codes(self.board_length, self.colors, 1, self.encoding, secret_rng)
+
+        player.seed(player_rng)
+
+        return Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff, self.feedback_table, self.watchdog, self.deadline, self.clock, self.backend)
+
+    def play_seeded_round(self, player, scsa, seed, index):
+        """Plays round index of a seeded tournament (see seeded_round)
+
+        Args:
+            player (Player): Player who plays the round.
+            scsa (SCSA): SCSA used to generate the secret code.
+            seed (int): Master seed of the tournament.
+            index (int): Index of the round, starting at 0.
+
+        Returns:
+            result (str): Result of the round ("win", "loss" or "failure").
+            guesses (int): Number of guesses made.
+            duration (float): Seconds the round counts for (see charged_time).
+        """
+
+        round = self.seeded_round(player, scsa, seed, index)
+
+        start = time.time()
+        result, guesses = round.play_round(player)
+        end = time.time()
+
+        return result, guesses, self.charged_time(round, end - start)
+
+    def seeded_rounds(self, player, scsa, num_rounds, seed, processes = 1):
+        """Plays the rounds of a seeded tournament, in order
+
+        With more than one process, rounds are handed to a pool of worker processes one at a time and their
+        results are yielded in round order as they become available. Each worker plays with its own copy of the
+        player, so the state of player is not updated. Closing the generator stops the workers.
+
+        Args:
+            player (Player): Player who plays the rounds.
+            scsa (SCSA): SCSA used to generate secret codes.
+            num_rounds (int): Number of rounds to play.
+            seed (int): Master seed of the tournament.
+            processes (int, optional): Number of processes playing rounds. Defaults to 1, in this process.
+
+        Yields:
+            tuple: Result, number of guesses and duration of each round (see play_seeded_round).
+        """
+
+        if processes == 1:
+
+            for i in range(num_rounds):
+
+                yield self.play_seeded_round(player, scsa, seed, i)
+
+            return
+
+        with multiprocessing.Pool(processes, start_worker, (self, player, scsa, seed)) as pool:
+
+            yield from pool.imap(play_worker_round, range(num_rounds))
+
+    def record_round(self, results, result, duration):
+        """Adds a round to the results of a tournament
+
+        Args:
+            results (dict): Dictionary containing number of wins, losses, and failures for a tournament.
+            result (str): Result of the round ("win", "loss" or "failure").
+            duration (float): Seconds taken to play the round.
+
+        Returns:
+            bool: Returns True if the tournament is over, because it ran out of time or the player failed.
+        """
+
+        self.time_used += duration
+
+        # With the watchdog, the round that ran into the deadline was cut short and counts as a loss
+        if self.watchdog and self.deadline is not None and time.time() >= self.deadline:
+
+            results[result] += 1
+
+            return True
+
+        if self.time_used > self.tournament_time_cutoff:
+
+            return True
+
+        results[result] += 1
+
+        return result == "failure"
+
+    def play_tournament(self, player, scsa, num_rounds, seed = None, processes = 1):
         """Plays a tournament of Mastermind
 
+        Rounds can be played in parallel by several processes (see seeded_rounds). Their results are recorded in
+        round order with the same time and failure cutoffs, so the results only depend on the seed and on how long
+        rounds take, not on the number of processes.
+
         Args:
             player (Player): Player who plays in tournament, making guesses.
             scsa (SCSA): SCSA used to generate secret codes for player to guess.
             num_rounds (int): Number of rounds to play Mastermind.
+            seed (int, optional): Master seed, round i is played with streams derived from it (see round_streams).
+                                  Defaults to fresh entropy, kept in self.seed to replay the tournament.
+            processes (int, optional): Number of processes playing rounds. Defaults to 1.
         """
         
         results = {"win": 0, "loss": 0, "failure": 0}
 
-        
+        if seed is None:
 
-        for i in range(1,num_rounds+1):
+            seed = np.random.SeedSequence().entropy
 
-            code = scsa.generate_codes(self.board_length, self.colors, 1)
+        self.seed = seed
 
-            round = Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff)
+        self.start_deadline()
 
-            start = time.time()
-            result, guesses = round.play_round(player)
-            end = time.time()
+        rounds = self.seeded_rounds(player, scsa, num_rounds, seed, processes)
 
-            duration = end - start
-            
-            self.time_used += duration
+        for result, guesses, duration in rounds:
 
-            if self.time_used > self.tournament_time_cutoff:
+            #print("Result:", result, "Guesses:", guesses)
+
+            if self.record_round(results, result, duration):
 
                 break
-            
-            #print("Round:", i, "Result:", result, "Guesses:", guesses)
 
-            results[result] += 1
+        rounds.close()
 
-            if result == "failure":
+        self.print_results(player, results, num_rounds)
+
+        return 
+
+
+    def play_batch_tournament(self, player, scsa, num_rounds, seed = None, batch_size = 1024):
+        """Plays a tournament of Mastermind, batch_size rounds at a time in lockstep (see batch.BatchRounds)
+
+        Secret codes and player streams are the same as in play_tournament with the same seed, and results are
+        recorded in round order with the same time and failure cutoffs. Players without a make_guesses method play
+        with one copy per round (see batch.SingleRoundPlayers), each charged its own time. The time of a
+        BatchPlayer's step is shared equally between its rounds.
+
+        Args:
+            player (Player or BatchPlayer): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            num_rounds (int): Number of rounds to play Mastermind.
+            seed (int, optional): Master seed (see play_tournament). Defaults to fresh entropy, kept in self.seed.
+            batch_size (int, optional): Number of rounds played in lockstep. Defaults to 1024.
+        """
+
+        results = {"win": 0, "loss": 0, "failure": 0}
+
+        if seed is None:
+
+            seed = np.random.SeedSequence().entropy
+
+        self.seed = seed
+
+        self.start_deadline()
+
+        rounds_played = 0
+        time_playing = 0
+
+        for start in range(0, num_rounds, batch_size):
+
+            count = min(batch_size, num_rounds - start)
+
+            codes = self.secret_codes(scsa, seed, start, count)
+            rngs = [round_streams(seed, start + i)[1] for i in range(count)]
+
+            batch = BatchRounds(self.board_length, self.colors, codes, scsa, self.guess_cutoff, self.round_time_cutoff, self.clock)
+
+            round_results, guesses, durations = batch.play(player, rngs)
+
+            rounds_played += count
+            time_playing += count / batch.rounds_per_second
+
+            over = False
+
+            for result, duration in zip(round_results, durations):
+
+                over = self.record_round(results, result, duration)
+
+                if over:
+
+                    break
+
+            if over:
 
                 break
 
         self.print_results(player, results, num_rounds)
 
-        return 
+        print("Rounds per second:", round(rounds_played / max(time_playing, 1e-9), 1))
+
+        return
 
 
     def practice_tournament(self, player, scsa, code_file):
@@ -313,17 +913,19 @@ class Mastermind:
 
         cur_round = 0
 
+        self.start_deadline()
+
         for code in codes:
 
             cur_round += 1
 
-            round = Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff)
+            round = Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff, self.feedback_table, self.watchdog, self.deadline, self.clock, self.backend)
 
             start = time.time()
             result, guesses = round.play_round(player)
             end = time.time()
 
-            duration = end - start
+            duration = self.charged_time(round, end - start)
             
             self.time_used += duration
 
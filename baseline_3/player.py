@@ -1,14 +1,20 @@
 # File contains implementations for the players for Mastermind
 # See main.py or examples.ipynb for example usages
 
-import random
 from scsa import *
-from itertools import permutations
+from candidates import ArrangementEnumerator
+from color_discovery import ColorDiscovery
 
 class Player:
     """Player for Mastermind
     """
 
+    # Encoding of the guesses returned by make_guess ("str", "int" or "array"), Round accepts all of them
+    encoding = "str"
+
+    # Source of randomness of players that guess at random, seeded tournaments replace it every round
+    rng = None
+
     def __init__(self):
         """Constructor for Player
         """
@@ -32,16 +38,59 @@ class Player:
 
         raise NotImplementedError
 
+    def seed(self, rng):
+        """Replaces the source of randomness of the player
+
+        Args:
+            rng (numpy.random.Generator, int or numpy.random.SeedSequence): Source of randomness, or seed for a new one.
+        """
+
+        self.rng = np.random.default_rng(rng)
+
+        return
+
+    def guess_time(self, clock, measured):
+        """Returns the time the player is charged for its last guess
+
+        Args:
+            clock (str): Clock the round is timed with (see watchdog.CLOCKS).
+            measured (float): Seconds the round measured on that clock around make_guess.
+
+        Returns:
+            float: Returns measured, players that make their guesses in another process report their own time.
+        """
+
+        return measured
+
+    def encode_guess(self, guess, board_length, colors):
+        """Converts a guess to the encoding used by the player
+
+        Args:
+            guess (str, int or numpy.ndarray): Guess of secret code.
+            board_length (int): Number of pegs of secret code.
+            colors (list of chr): Colors that could be used in the secret code.
+
+        Returns:
+            str, int or numpy.ndarray: Returns guess in self.encoding.
+        """
+
+        return encode_code(guess, board_length, len(colors), self.encoding)
+
 
 class RandomFolks(Player):
     """Mastermind Player that makes random guesses
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for RandomFolks
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.player_name = "RandomFolks"
+        self.rng = np.random.default_rng(rng)
 
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
@@ -60,7 +109,7 @@ class RandomFolks(Player):
 
         scsa = InsertColors()
 
-        guess = scsa.generate_codes(board_length, colors)
+        guess = scsa.generate_codes(board_length, colors, 1, self.encoding, self.rng)
 
         return guess
 
@@ -69,11 +118,16 @@ class Boring(Player):
     """Mastermind Player that guesses all the same color and chooses that color at random
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for Boring
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.player_name = "Boring"
+        self.rng = np.random.default_rng(rng)
 
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
@@ -89,11 +143,11 @@ class Boring(Player):
         Returns:
             str: Returns guess
         """
-        color = random.sample(colors, k = 1)
+        color = colors[self.rng.integers(len(colors))]
 
-        guess = list_to_str(color*board_length)
+        guess = color * board_length
 
-        return guess
+        return self.encode_guess(guess, board_length, colors)
 
 
 class B3Player(Player):
@@ -102,15 +156,19 @@ class B3Player(Player):
     will tell you how many pegs of each color are in the answer. (You don't need to actually guess the last color;
     you can compute how many of those there are from the other answers.) Then you generate and test only answers
     consistent with that known color distribution. 
+    The color distribution is found with mixed-color group guesses (see ColorDiscovery), which takes fewer guesses
+    than c - 1 monochromatic ones when only a few of the colors are used.
     """
     def __init__(self):
         self.player_name = "Baseline3"
-        self.monochromatic_guess_list = []
+        # First phase, finds the # of pegs of each color
+        self.color_discovery = None
         # Keys: color
         # Value: # of color present in the secret code
         self.color_count_dict = {} 
-        self.informed_guess_list = []
-        self.informed_guess_list_counter = 0
+        # Arrangements of the known colors that are still consistent with every response
+        self.informed_guesses = None
+        self.last_guess = None
         
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
@@ -130,46 +188,33 @@ class B3Player(Player):
         guess = ''
         if num_guess == 0:
             # Clear values for each round
-            self.informed_guess_list_counter = 0
             self.color_count_dict.clear()
-            self.monochromatic_guess_list = []
-            self.informed_guess_list = []
-
-            # Makes a list of c - 1 colors
-            self.monochromatic_guess_list = [ colors[i] * board_length for i in range(len(colors)-1)]
-            guess = self.monochromatic_guess_list[num_guess]
-
-        elif num_guess > 0 and num_guess <= len(self.monochromatic_guess_list):
-            total_pegs_of_a_color = match_pegs + mismatch_pegs 
-            
-            # Keys: color
-            # Value: # of color present in the secret code
-            self.color_count_dict[colors[num_guess-1]] = total_pegs_of_a_color
-
-            if num_guess == len(self.monochromatic_guess_list):
-                # Calculating how times the c color appears in secret code
-                values = self.color_count_dict.values()
-                num_pegs_left = board_length - sum(values)
-                self.color_count_dict[colors[num_guess]] = num_pegs_left
-
-                # Generate an informed guess list based on the permutations of the color and the # of times the color appears in secret code
-                informed_string = ''
-                for key, value in self.color_count_dict.items():
-                    informed_string += key * value
-                self.informed_guess_list = [''.join(p) for p in permutations(informed_string)]
-                # Removes duplicates in informed guess list
-                self.informed_guess_list = list(set(self.informed_guess_list))
-                guess = self.informed_guess_list[self.informed_guess_list_counter]
-
-            else:
-                guess = self.monochromatic_guess_list[num_guess]
+            self.informed_guesses = None
+            self.color_discovery = ColorDiscovery(board_length, colors)
+        elif self.informed_guesses is None:
+            self.color_discovery.update(match_pegs, mismatch_pegs)
+
+        if self.informed_guesses is None:
+            guess = self.color_discovery.next_guess()
+
+            if guess is None:
+                # Keys: color
+                # Value: # of color present in the secret code
+                self.color_count_dict.update(self.color_discovery.counts)
+
+                # Walk the arrangements of the colors by the # of times each color appears in secret code,
+                # skipping arrangements that later responses rule out
+                color_counts = [self.color_count_dict.get(color, 0) for color in colors]
+                self.informed_guesses = ArrangementEnumerator(board_length, colors, color_counts)
+                guess = array_to_str(self.informed_guesses.next_code())
 
         else:
-            # Go through the informed guess list
-            self.informed_guess_list_counter += 1
-            guess = self.informed_guess_list[self.informed_guess_list_counter]
+            # Rule out arrangements that would have given a different response to the last guess
+            self.informed_guesses.apply(self.last_guess, match_pegs, mismatch_pegs)
+            guess = array_to_str(self.informed_guesses.next_code())
 
-        return guess
+        self.last_guess = guess
+        return self.encode_guess(guess, board_length, colors)
 
         
 
@@ -1,7 +1,10 @@
 # File contains implementation of the secret code generating algorithms
 # See main.py or examples.ipynb for example usage
 
-import random
+from math import comb, log, perm
+from itertools import combinations, permutations, product
+import numpy as np
+from codes import *
 
 def list_to_str(arr):
     """Converts a list of charaters to a string
@@ -39,23 +42,265 @@ def read_from_file(file_name):
 
     return codes
 
+def distinct_colors(codes_array):
+    """Counts the different colors used by each code
+
+    Args:
+        codes_array (numpy.ndarray): Codes of shape (N, length).
+
+    Returns:
+        numpy.ndarray: Returns number of distinct colors of each code.
+    """
+
+    ordered = np.sort(codes_array, axis=1)
+
+    return 1 + np.count_nonzero(np.diff(ordered, axis=1), axis=1)
+
+def mixture_probabilities(codes_array, num_colors, mixture):
+    """Computes probabilities for SCSAs that pick a random subset of colors and then fill every peg from it
+
+    A code with k distinct colors is generated from a subset of m colors with probability
+    comb(num_colors - k, m - k) / comb(num_colors, m) * m ** -length.
+
+    Args:
+        codes_array (numpy.ndarray): Codes of shape (N, length).
+        num_colors (int): Number of colors that could be used to generate a code.
+        mixture (list of tuples): (probability, number of colors picked) for every way the subset is picked.
+
+    Returns:
+        numpy.ndarray: Returns probability of each code.
+    """
+
+    length = codes_array.shape[1]
+
+    # Probability of a code by its number of distinct colors
+    by_distinct = np.zeros(length + 1)
+
+    for probability, picked in mixture:
+
+        for k in range(1, min(picked, length) + 1):
+
+            by_distinct[k] += probability * comb(num_colors - k, picked - k) / comb(num_colors, picked) * float(picked) ** -length
+
+    return by_distinct[distinct_colors(codes_array)]
+
+def random_pairs(num_colors, num_codes, rng):
+    """Picks an ordered pair of different colors for each code
+
+    Args:
+        num_colors (int): Number of colors that could be used to generate a code.
+        num_codes (int): Number of pairs to pick.
+        rng (numpy.random.Generator): Source of randomness.
+
+    Returns:
+        first_color (numpy.ndarray): First color of each pair.
+        second_color (numpy.ndarray): Second color of each pair, never the same as the first.
+    """
+
+    first_color = rng.integers(0, num_colors, size=num_codes)
+
+    second_color = (first_color + rng.integers(1, num_colors, size=num_codes)) % num_colors
+
+    return first_color, second_color
+
+def random_two_color(length, num_codes, rng):
+    """Picks which pegs get the second of two colors, for TwoColor and ABColor
+
+    Two different random pegs are set to the first and the second color, so both colors are used at least once,
+    and every other peg gets either color.
+
+    Args:
+        length (int): The length of the codes to be generated.
+        num_codes (int): Number of codes to generate.
+        rng (numpy.random.Generator): Source of randomness.
+
+    Returns:
+        numpy.ndarray: Returns bool array of shape (num_codes, length), True where the second color goes.
+    """
+
+    rows = np.arange(num_codes)
+
+    first_peg = rng.integers(0, length, size=num_codes)
+    second_peg = (first_peg + rng.integers(1, length, size=num_codes)) % length
+
+    second = rng.integers(0, 2, size=(num_codes, length)).astype(bool)
+
+    second[rows, first_peg] = False
+    second[rows, second_peg] = True
+
+    return second
+
+def random_orders(num_colors, num_codes, num_shuffled, rng):
+    """Orders the colors for each code so the first ones are a random sample without replacement
+
+    Only the first num_shuffled steps of a Fisher-Yates shuffle are taken, one vectorized step per position.
+
+    Args:
+        num_colors (int): Number of colors that could be used to generate a code.
+        num_codes (int): Number of orders to generate.
+        num_shuffled (int): Number of leading positions that need to be random.
+        rng (numpy.random.Generator): Source of randomness.
+
+    Returns:
+        numpy.ndarray: Returns uint8 array of shape (num_codes, num_colors), every row a permutation of the colors.
+    """
+
+    order = np.tile(np.arange(num_colors, dtype=np.uint8), (num_codes, 1))
+
+    rows = np.arange(num_codes)
+
+    for i in range(min(num_shuffled, num_colors - 1)):
+
+        swap = i + rng.integers(0, num_colors - i, size=num_codes)
+
+        order[rows, i], order[rows, swap] = order[rows, swap], order[rows, i]
+
+    return order
+
+def random_subset_codes(length, num_colors, picked, rng):
+    """Fills every peg of each code from a random subset of colors, like UsuallyFewer and PreferFewer
+
+    Args:
+        length (int): The length of the codes to be generated.
+        num_colors (int): Number of colors that could be used to generate a code.
+        picked (numpy.ndarray): Number of colors in the subset of each code.
+        rng (numpy.random.Generator): Source of randomness.
+
+    Returns:
+        numpy.ndarray: Returns uint8 array of color indices of shape (len(picked), length).
+    """
+
+    codes = np.empty((len(picked), length), dtype=np.uint8)
+
+    # Codes with the same number of colors are generated together
+    for size in np.unique(picked):
+
+        rows = np.flatnonzero(picked == size)
+
+        slots = rng.integers(0, size, size=(len(rows), length), dtype=np.uint8)
+
+        if size == num_colors:
+
+            # Every color is in the subset, so the order of the colors does not matter
+            codes[rows] = slots
+
+        else:
+
+            # The first colors of a random order are a random subset
+            order = random_orders(num_colors, len(rows), size, rng)
+
+            codes[rows] = np.take_along_axis(order, slots.astype(np.intp), axis=1)
+
+    return codes
+
 class SCSA:
     """Secret-code selection algorithm
     """
 
-    def __init__(self):
+    # Keys: (SCSA name, length, colors)
+    # Value: read-only array of every code the SCSA can generate
+    supports = {}
+
+    # Largest number of codes support returns as an array, larger supports can only be walked with iter_support
+    max_support = 2 ** 22
+
+    # Number of codes generate_array samples at a time, bounds the memory used on top of the result
+    chunk_size = 2 ** 20
+
+    def __init__(self, rng = None):
         """Constructor for SCSA
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.name = ""
+        self.rng = np.random.default_rng(rng)
 
-    def generate_codes(self, length, colors, num_codes = 1):
+    def generate_codes(self, length, colors, num_codes = 1, encoding = "str", rng = None):
         """Generate codes based on secret-code selection algorithm
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            encoding (str, optional): Encoding of generated codes ("str", "int" or "array"). Defaults to "str".
+            rng (numpy.random.Generator, optional): Source of randomness. Defaults to self.rng.
+
+        Returns:
+            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+                                 Codes are converted to encoding (see codes.encode_codes), None if the SCSA cannot
+                                 generate codes of this length with these colors.
+        """
+
+        codes = self.generate_array(length, colors, num_codes, rng)
+
+        if codes is None:
+
+            return
+
+        codes = encode_codes(codes, length, len(colors), encoding)
+
+        if num_codes == 1:
+
+            return codes[0]
+
+        return codes
+
+    def generate_array(self, length, colors, num_codes = 1, rng = None):
+        """Generate codes based on secret-code selection algorithm as a matrix of color indices
+
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (numpy.random.Generator, optional): Source of randomness. Defaults to self.rng.
+
+        Returns:
+            numpy.ndarray: Returns uint8 array of color indices of shape (num_codes, length), or None if the SCSA
+                           cannot generate codes of this length with these colors.
+        """
+
+        if self.support_size(length, len(colors)) == 0:
+
+            return
+
+        if rng is None:
+
+            rng = self.rng
+
+        codes = np.empty((num_codes, length), dtype=np.uint8)
+
+        for start in range(0, num_codes, self.chunk_size):
+
+            count = min(self.chunk_size, num_codes - start)
+
+            codes[start:start+count] = self.sample_array(length, len(colors), count, rng)
+
+        return codes
+
+    def sample_array(self, length, num_colors, num_codes, rng):
+        """Generates codes as a matrix, see generate_array
+
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator): Source of randomness.
+
+        Raises:
+            NotImplementedError: Function must be implemented by children classes.
+        """
+
+        raise NotImplementedError
+
+    def probabilities(self, codes_array, num_colors):
+        """Computes the probability of the SCSA generating each code
+
+        Args:
+            codes_array (numpy.ndarray): Codes of shape (N, length).
+            num_colors (int): Number of colors that could be used to generate a code.
 
         Raises:
             NotImplementedError: Function must be implemented by children classes.
@@ -63,11 +308,114 @@ class SCSA:
 
         raise NotImplementedError
 
+    def log_prob(self, code, colors):
+        """Computes the log probability of the SCSA generating a code
+
+        Args:
+            code (str or numpy.ndarray): Code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            float: Returns natural log of the probability, -inf if the SCSA never generates the code.
+        """
+
+        code = as_code_array(code)
+
+        if len(code) == 0 or code.max() >= len(colors):
+
+            return float("-inf")
+
+        probability = self.probabilities(code[None], len(colors))[0]
+
+        if probability <= 0:
+
+            return float("-inf")
+
+        return log(probability)
+
+    def support_size(self, length, num_colors):
+        """Counts the codes the SCSA can generate
+
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+
+        Raises:
+            NotImplementedError: Function must be implemented by children classes.
+        """
+
+        raise NotImplementedError
+
+    def iter_support(self, length, colors):
+        """Yields every code the SCSA can generate, one at a time
+
+        Defaults to every code in lexicographic order, children classes that can only generate some codes override it.
+
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Yields:
+            str: Codes the SCSA can generate.
+        """
+
+        if self.support_size(length, len(colors)) == 0:
+
+            return
+
+        for code in product(colors, repeat = length):
+
+            yield list_to_str(code)
+
+    def support(self, length, colors):
+        """Returns every code the SCSA can generate, computed once per (length, colors)
+
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Raises:
+            ValueError: More than max_support codes can be generated, use iter_support instead.
+
+        Returns:
+            numpy.ndarray: Returns read-only uint8 array of codes in lexicographic order, shape (support_size, length).
+        """
+
+        key = (self.name, length, tuple(colors))
+
+        if key not in self.supports:
+
+            size = self.support_size(length, len(colors))
+
+            if size > self.max_support:
+
+                raise ValueError(self.name + " can generate " + str(size) + " codes, more than max_support")
+
+            if size == len(colors) ** length:
+
+                codes = all_codes_array(length, len(colors))
+
+            elif size == 0:
+
+                codes = np.zeros((0, length), dtype=np.uint8)
+
+            else:
+
+                ids = encode_codes(list(self.iter_support(length, colors)), length, len(colors), "int")
+
+                codes = ids_to_array(np.sort(ids), length, len(colors))
+
+            codes.flags.writeable = False
+
+            self.supports[key] = codes
+
+        return self.supports[key]
+
     def write_to_file(self, codes, length, num_colors):
         """Writes codes to a file
 
         Args:
-            codes (list of strs): List of codes to write to file.
+            codes (list of strs or numpy.ndarray): List of codes, or matrix of codes from generate_array, to write to file.
             length (int): The length of the generated codes (same as number of pegs for an instance of Mastermind).
             num_colors (int): Number of colors that could be used to generate a code (i.e. length of list of colors).
         """
@@ -76,28 +424,40 @@ class SCSA:
 
         file = open(file_name, "w")
 
-        for code in codes:
+        if isinstance(codes, np.ndarray):
 
-            file.write(code + "\n")
+            # One line per row: letters followed by a newline, written as a single block
+            lines = np.empty((len(codes), length + 1), dtype=np.uint8)
+            lines[:, :length] = codes + ord("A")
+            lines[:, length] = ord("\n")
+
+            file.write(lines.tobytes().decode("ascii"))
+
+        else:
+
+            for code in codes:
+
+                file.write(code + "\n")
 
         file.close()
 
         return
 
-    def generate_and_write_to_file(self, length, colors, num_codes = 100):
+    def generate_and_write_to_file(self, length, colors, num_codes = 100, rng = None):
         """Generates codes and writes them to a file
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 100.
+            rng (numpy.random.Generator, optional): Source of randomness. Defaults to self.rng.
         """
 
-        codes = self.generate_codes(length, colors, num_codes)
+        codes = self.generate_array(length, colors, num_codes, rng)
 
-        if num_codes == 1:
+        if codes is None:
 
-            codes = [codes]
+            return
 
         self.write_to_file(codes, length, len(colors))
 
@@ -108,547 +468,698 @@ class InsertColors(SCSA):
     """ SCSA that generates codes containing colors selected at random
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for InsertColors
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.name = "InsertColors"
+        self.rng = np.random.default_rng(rng)
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on InsertColors SCSA
+    def sample_array(self, length, num_colors, num_codes, rng):
+        """Generates codes based on InsertColors SCSA as a matrix
 
         Args:
-            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator): Source of randomness.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            numpy.ndarray: Returns uint8 array of color indices of shape (num_codes, length).
         """
 
-        if len(colors) < 1:
+        return rng.integers(0, num_colors, size=(num_codes, length), dtype=np.uint8)
 
-            return
+    def probabilities(self, codes_array, num_colors):
+        """Computes the probability of the InsertColors SCSA generating each code
 
-        if num_codes == 1:
+        Args:
+            codes_array (numpy.ndarray): Codes of shape (N, length).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-            codes = list_to_str(random.choices(colors, k = length))
+        Returns:
+            numpy.ndarray: Returns probability of each code.
+        """
 
-        else:
+        if num_colors < 1:
 
-            codes = []
+            return np.zeros(len(codes_array))
 
-            for _ in range(num_codes):
+        return np.full(len(codes_array), float(num_colors) ** -codes_array.shape[1])
 
-                codes.append(list_to_str(random.choices(colors, k = length))) 
-                
-        return codes
+    def support_size(self, length, num_colors):
+        """Counts the codes the InsertColors SCSA can generate
+
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+
+        Returns:
+            int: Returns number of codes.
+        """
+
+        if num_colors < 1:
+
+            return 0
+
+        return num_colors ** length
 
 
 class TwoColor(SCSA):
     """ SCSA that generates codes containing only two randomly chosen colors
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for TwoColor
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.name = "TwoColor"
+        self.rng = np.random.default_rng(rng)
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on TwoColor SCSA
+    def sample_array(self, length, num_colors, num_codes, rng):
+        """Generates codes based on TwoColor SCSA as a matrix
 
         Args:
-            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator): Source of randomness.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            numpy.ndarray: Returns uint8 array of color indices of shape (num_codes, length).
         """
 
-        if len(colors) < 2:
+        first_color, second_color = random_pairs(num_colors, num_codes, rng)
 
-            return
+        codes = random_two_color(length, num_codes, rng)
 
-        if num_codes == 1:
+        return np.where(codes, second_color[:, None], first_color[:, None]).astype(np.uint8)
 
-            usable_colors = random.sample(colors, k=2)
+    def probabilities(self, codes_array, num_colors):
+        """Computes the probability of the TwoColor SCSA generating each code
 
-            # Create 'uninitialized' code as list
-            codes = [0]*length
+        Both orders of the two colors are equally likely, and a code with n_a pegs of one color and n_b of the other
+        has n_a * n_b of the length * (length - 1) ways of placing the two guaranteed pegs.
 
-            # Randomly pick two spots in string
-            indicies = random.sample(range(0,length), k=2)
+        Args:
+            codes_array (numpy.ndarray): Codes of shape (N, length).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-            # Set those two spots in the string to the two colors
-            # This guarantees both colors are used at least once
-            codes[indicies[0]] = usable_colors[0]
-            codes[indicies[1]] = usable_colors[1]
+        Returns:
+            numpy.ndarray: Returns probability of each code.
+        """
 
-            # Set rest of spots in code to one of the two colors randomly
-            for i in range(length):
+        length = codes_array.shape[1]
 
-                if codes[i] == 0:
+        if num_colors < 2 or length < 2:
 
-                    codes[i] = random.choice(usable_colors)
+            return np.zeros(len(codes_array))
 
-            codes = list_to_str(codes)
+        first = np.count_nonzero(codes_array == codes_array[:, :1], axis=1)
 
-        else:
+        probability = 2 / (num_colors * (num_colors - 1)) * first * (length - first) / (length * (length - 1)) * 0.5 ** (length - 2)
 
-            codes = []
+        return np.where(distinct_colors(codes_array) == 2, probability, 0.0)
 
-            for _ in range(num_codes):
+    def support_size(self, length, num_colors):
+        """Counts the codes the TwoColor SCSA can generate
 
-                usable_colors = random.sample(colors, k=2)
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-                # Create 'uninitialized' code as list
-                code = [0]*length
+        Returns:
+            int: Returns number of codes.
+        """
 
-                # Randomly pick two spots in string
-                indicies = random.sample(range(0,length), k=2)
+        if num_colors < 2 or length < 2:
 
-                # Set those two spots in the string to the two colors
-                # This guarantees both colors are used at least once
-                code[indicies[0]] = usable_colors[0]
-                code[indicies[1]] = usable_colors[1]
+            return 0
 
-                # Set rest of spots in code to one of the two colors randomly
-                for i in range(length):
+        return comb(num_colors, 2) * (2 ** length - 2)
 
-                    if code[i] == 0:
+    def iter_support(self, length, colors):
+        """Yields every code the TwoColor SCSA can generate, grouped by pair of colors
 
-                        code[i] = random.choice(usable_colors)
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
 
-                codes.append(list_to_str(code))
-                
-        return codes
+        Yields:
+            str: Codes the SCSA can generate.
+        """
+
+        if self.support_size(length, len(colors)) == 0:
+
+            return
+
+        for pair in combinations(colors, 2):
+
+            for code in product(pair, repeat = length):
+
+                if len(set(code)) == 2:
+
+                    yield list_to_str(code)
 
 
 class ABColor(SCSA):
     """ SCSA that generates codes containing only "A"s and "B"s
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for ABColor
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.name = "ABColor"
+        self.rng = np.random.default_rng(rng)
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on ABColor SCSA
+    def sample_array(self, length, num_colors, num_codes, rng):
+        """Generates codes based on ABColor SCSA as a matrix
 
         Args:
-            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator): Source of randomness.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            numpy.ndarray: Returns uint8 array of color indices of shape (num_codes, length).
         """
 
-        usable_colors = ["A", "B"]
+        return random_two_color(length, num_codes, rng).astype(np.uint8)
 
-        if num_codes == 1:
+    def probabilities(self, codes_array, num_colors):
+        """Computes the probability of the ABColor SCSA generating each code
 
-            usable_colors = random.sample(colors, k=2)
+        Args:
+            codes_array (numpy.ndarray): Codes of shape (N, length).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-            # Create 'uninitialized' code as list
-            codes = [0]*length
+        Returns:
+            numpy.ndarray: Returns probability of each code.
+        """
 
-            # Randomly pick two spots in string
-            indicies = random.sample(range(0,length), k=2)
+        length = codes_array.shape[1]
 
-            # Set those two spots in the string to the two colors
-            # This guarantees both colors are used at least once
-            codes[indicies[0]] = usable_colors[0]
-            codes[indicies[1]] = usable_colors[1]
+        if self.support_size(length, num_colors) == 0:
 
-            # Set rest of spots in code to one of the two colors randomly
-            for i in range(length):
+            return np.zeros(len(codes_array))
 
-                if codes[i] == 0:
+        a = np.count_nonzero(codes_array == 0, axis=1)
+        b = np.count_nonzero(codes_array == 1, axis=1)
 
-                    codes[i] = random.choice(usable_colors)
+        probability = a * b / (length * (length - 1)) * 0.5 ** (length - 2)
 
-            codes = list_to_str(codes)
+        return np.where((a + b == length) & (a > 0) & (b > 0), probability, 0.0)
 
-        else:
+    def support_size(self, length, num_colors):
+        """Counts the codes the ABColor SCSA can generate
 
-            codes = []
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-            for _ in range(num_codes):
+        Returns:
+            int: Returns number of codes, 0 if there are fewer than two pegs or fewer than two colors.
+        """
 
-                # Create 'uninitialized' code as list
-                code = [0]*length
+        if length < 2 or num_colors < 2:
 
-                # Randomly pick two spots in string
-                indicies = random.sample(range(0,length), k=2)
+            return 0
 
-                # Set those two spots in the string to the two colors
-                # This guarantees both colors are used at least once
-                code[indicies[0]] = usable_colors[0]
-                code[indicies[1]] = usable_colors[1]
+        return 2 ** length - 2
 
-                # Set rest of spots in code to one of the two colors randomly
-                for i in range(length):
+    def iter_support(self, length, colors):
+        """Yields every code the ABColor SCSA can generate
 
-                    if code[i] == 0:
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
 
-                        code[i] = random.choice(usable_colors)
+        Yields:
+            str: Codes the SCSA can generate.
+        """
 
-                codes.append(list_to_str(code))
-                
-        return codes
+        if self.support_size(length, len(colors)) == 0:
+
+            return
+
+        for code in product("AB", repeat = length):
+
+            if len(set(code)) == 2:
+
+                yield list_to_str(code)
 
 
 class TwoColorAlternating(SCSA):
     """ SCSA that generates codes that alternate between two colors
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for TwoColorAlternating
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.name = "TwoColorAlternating"
+        self.rng = np.random.default_rng(rng)
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on TwoColorAlternating SCSA
+    def sample_array(self, length, num_colors, num_codes, rng):
+        """Generates codes based on TwoColorAlternating SCSA as a matrix
 
         Args:
-            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator): Source of randomness.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            numpy.ndarray: Returns uint8 array of color indices of shape (num_codes, length).
         """
 
-        if len(colors) < 2:
+        first_color, second_color = random_pairs(num_colors, num_codes, rng)
 
-            return
+        codes = np.empty((num_codes, length), dtype=np.uint8)
 
-        if num_codes == 1:
+        codes[:, 0::2] = first_color[:, None]
+        codes[:, 1::2] = second_color[:, None]
 
-            usable_colors = list_to_str(random.sample(colors, k=2))
+        return codes
 
-            first_color, second_color = list_to_str(random.sample(usable_colors, k = 2))
+    def probabilities(self, codes_array, num_colors):
+        """Computes the probability of the TwoColorAlternating SCSA generating each code
 
-            codes = ""
+        Args:
+            codes_array (numpy.ndarray): Codes of shape (N, length).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-            for i in range(length):
+        Returns:
+            numpy.ndarray: Returns probability of each code.
+        """
 
-                if i % 2 == 0:
+        length = codes_array.shape[1]
 
-                    codes += first_color
+        if num_colors < 2:
 
-                else:
+            return np.zeros(len(codes_array))
 
-                    codes += second_color
+        if length == 1:
 
-        else:
+            return np.full(len(codes_array), 1 / num_colors)
 
-            codes = []
+        even = np.all(codes_array[:, 0::2] == codes_array[:, :1], axis=1)
+        odd = np.all(codes_array[:, 1::2] == codes_array[:, 1:2], axis=1)
 
-            for _ in range(num_codes):
+        alternating = even & odd & (codes_array[:, 0] != codes_array[:, 1])
 
-                usable_colors = list_to_str(random.sample(colors, k=2))
+        return np.where(alternating, 1 / (num_colors * (num_colors - 1)), 0.0)
 
-                first_color, second_color = random.sample(usable_colors, k = 2)
+    def support_size(self, length, num_colors):
+        """Counts the codes the TwoColorAlternating SCSA can generate
 
-                code = ""
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-                for i in range(length):
+        Returns:
+            int: Returns number of codes.
+        """
 
-                    if i % 2 == 0:
+        if num_colors < 2:
 
-                        code += first_color
+            return 0
 
-                    else:
+        if length == 1:
 
-                        code += second_color
+            return num_colors
 
-                codes.append(code)
-                
-        return codes
+        return num_colors * (num_colors - 1)
 
-class OnlyOnce(SCSA):
-    """ SCSA that generates codes in which a color appears at most once
-    """
-
-    def __init__(self):
-        """Constructor for OnlyOnce
-        """
-
-        self.name = "OnlyOnce"
-
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on OnlyOnce SCSA
+    def iter_support(self, length, colors):
+        """Yields every code the TwoColorAlternating SCSA can generate
 
         Args:
-            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
-        Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+        Yields:
+            str: Codes the SCSA can generate.
         """
 
-        if len(colors) < length:
+        if self.support_size(length, len(colors)) == 0:
 
             return
 
-        if num_codes == 1:
+        if length == 1:
 
-            codes = list_to_str(random.sample(colors, k = length))
+            yield from colors
 
-        else:
+            return
 
-            codes = []
+        for first_color, second_color in permutations(colors, 2):
 
-            for _ in range(num_codes):
+            yield ((first_color + second_color) * length)[:length]
 
-                codes.append(list_to_str(random.sample(colors, k = length))) 
-                
-        return codes
 
-
-class FirstLast(SCSA):
-    """ SCSA that generates codes in which the first and last colors are the same
+class OnlyOnce(SCSA):
+    """ SCSA that generates codes in which a color appears at most once
     """
 
-    def __init__(self):
-        """Constructor for FirstLast
+    def __init__(self, rng = None):
+        """Constructor for OnlyOnce
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
-        self.name = "FirstLast"
+        self.name = "OnlyOnce"
+        self.rng = np.random.default_rng(rng)
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on FirstLast SCSA
+    def sample_array(self, length, num_colors, num_codes, rng):
+        """Generates codes based on OnlyOnce SCSA as a matrix
 
         Args:
-            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator): Source of randomness.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            numpy.ndarray: Returns uint8 array of color indices of shape (num_codes, length).
         """
 
-        if len(colors) < 1:
-
-            return
-
-        if num_codes == 1:
+        return np.ascontiguousarray(random_orders(num_colors, num_codes, length, rng)[:, :length])
 
-            codes = random.choices(colors, k = length-2)
-            color = random.choices(colors, k = 1)
+    def probabilities(self, codes_array, num_colors):
+        """Computes the probability of the OnlyOnce SCSA generating each code
 
-            codes.insert(0, color[0])
-            codes.append(color[0])
+        Args:
+            codes_array (numpy.ndarray): Codes of shape (N, length).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-            codes = list_to_str(codes)
+        Returns:
+            numpy.ndarray: Returns probability of each code.
+        """
 
-        else:
+        length = codes_array.shape[1]
 
-            codes = []
+        if num_colors < length:
 
-            for _ in range(num_codes):
+            return np.zeros(len(codes_array))
 
-                code = random.choices(colors, k = length-2)
-                color = random.choices(colors, k = 1)
+        return np.where(distinct_colors(codes_array) == length, 1 / perm(num_colors, length), 0.0)
 
-                code.insert(0, color[0])
-                code.append(color[0])
+    def support_size(self, length, num_colors):
+        """Counts the codes the OnlyOnce SCSA can generate
 
-                code = list_to_str(code)
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-                codes.append(code) 
-                
-        return codes
+        Returns:
+            int: Returns number of codes.
+        """
 
-class UsuallyFewer(SCSA):
-    """ SCSA that generates codes that usually has fewer (2 or 3) colors
-    """
+        if num_colors < length:
 
-    def __init__(self):
-        """Constructor for UsuallyFewer
-        """
+            return 0
 
-        self.name = "UsuallyFewer"
+        return perm(num_colors, length)
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on UsuallyFewer SCSA
+    def iter_support(self, length, colors):
+        """Yields every code the OnlyOnce SCSA can generate
 
         Args:
-            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
-        Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+        Yields:
+            str: Codes the SCSA can generate.
         """
 
-        if len(colors) < 3:
+        if self.support_size(length, len(colors)) == 0:
 
             return
 
-        if num_codes == 1:
+        for code in permutations(colors, length):
 
-            probability = random.randint(0,100)
+            yield list_to_str(code)
 
-            if probability < 90:
 
-                num = random.randint(2,3)
+class FirstLast(SCSA):
+    """ SCSA that generates codes in which the first and last colors are the same
+    """
 
-                picked_colors = random.sample(colors, k = num)
+    def __init__(self, rng = None):
+        """Constructor for FirstLast
 
-            else:
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
+        """
 
-                picked_colors = colors
+        self.name = "FirstLast"
+        self.rng = np.random.default_rng(rng)
 
-            codes = list_to_str(random.choices(picked_colors, k = length))
+    def sample_array(self, length, num_colors, num_codes, rng):
+        """Generates codes based on FirstLast SCSA as a matrix
 
-        else:
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator): Source of randomness.
 
-            codes = []
+        Returns:
+            numpy.ndarray: Returns uint8 array of color indices of shape (num_codes, length).
+        """
 
-            for _ in range(num_codes):
+        codes = rng.integers(0, num_colors, size=(num_codes, length), dtype=np.uint8)
 
-                probability = random.randint(0,100)
+        codes[:, -1] = codes[:, 0]
 
-                if probability < 90:
+        return codes
 
-                    num = random.randint(2,3)
+    def probabilities(self, codes_array, num_colors):
+        """Computes the probability of the FirstLast SCSA generating each code
 
-                    picked_colors = random.sample(colors, k = num)
+        Args:
+            codes_array (numpy.ndarray): Codes of shape (N, length).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-                else:
+        Returns:
+            numpy.ndarray: Returns probability of each code.
+        """
 
-                    picked_colors = colors
+        length = codes_array.shape[1]
 
-                code = list_to_str(random.choices(picked_colors, k = length))
+        # Shorter codes are generated with two pegs
+        if num_colors < 1 or length < 2:
 
-                codes.append(code) 
-                
-        return codes
+            return np.zeros(len(codes_array))
 
+        return np.where(codes_array[:, 0] == codes_array[:, -1], float(num_colors) ** (1 - length), 0.0)
 
-class PreferFewer(SCSA):
-    """ SCSA that generates codes with a preference for fewer colors
-    """
-    
-    def __init__(self):
-        """Constructor for PreferFewer
+    def support_size(self, length, num_colors):
+        """Counts the codes the FirstLast SCSA can generate
+
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+
+        Returns:
+            int: Returns number of codes.
         """
 
-        self.name = "PreferFewer"
+        if num_colors < 1 or length < 2:
+
+            return 0
+
+        return num_colors ** (length - 1)
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on PreferFewer SCSA
+    def iter_support(self, length, colors):
+        """Yields every code the FirstLast SCSA can generate
 
         Args:
-            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
-        Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+        Yields:
+            str: Codes the SCSA can generate.
         """
 
-        if len(colors) < 2:
+        if self.support_size(length, len(colors)) == 0:
 
             return
 
-        if num_codes == 1:
+        for color in colors:
 
-            probability = random.randint(0,100)
+            for middle in product(colors, repeat = length - 2):
 
-            if probability <= 49:
+                yield color + list_to_str(middle) + color
 
-                num = 1
 
-                picked_colors = random.sample(colors, k = num)
+class UsuallyFewer(SCSA):
+    """ SCSA that generates codes that usually has fewer (2 or 3) colors
+    """
 
+    def __init__(self, rng = None):
+        """Constructor for UsuallyFewer
 
-            elif probability <= 74:
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
+        """
+
+        self.name = "UsuallyFewer"
+        self.rng = np.random.default_rng(rng)
 
-                num = 2
+    def sample_array(self, length, num_colors, num_codes, rng):
+        """Generates codes based on UsuallyFewer SCSA as a matrix
 
-                picked_colors = random.sample(colors, k = num)
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator): Source of randomness.
 
+        Returns:
+            numpy.ndarray: Returns uint8 array of color indices of shape (num_codes, length).
+        """
 
-            elif probability <= 87:
+        probability = rng.integers(0, 101, size=num_codes)
 
-                num = min(3, len(colors))
+        picked = np.where(probability < 90, rng.integers(2, 4, size=num_codes), num_colors)
 
-                picked_colors = random.sample(colors, k = num)
+        return random_subset_codes(length, num_colors, picked, rng)
 
-            elif probability <= 95:
+    def probabilities(self, codes_array, num_colors):
+        """Computes the probability of the UsuallyFewer SCSA generating each code
 
-                num = min(4, len(colors))
+        Out of 101 equally likely outcomes, 90 of them pick 2 or 3 colors with equal chance and the other 11 pick every
+        color.
 
-                picked_colors = random.sample(colors, k = num)
+        Args:
+            codes_array (numpy.ndarray): Codes of shape (N, length).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-            elif probability <= 98: 
+        Returns:
+            numpy.ndarray: Returns probability of each code.
+        """
 
-                num = min(5, len(colors))
+        if num_colors < 3:
 
-                picked_colors = random.sample(colors, k = num)
+            return np.zeros(len(codes_array))
 
-            else:
+        mixture = [(45 / 101, 2), (45 / 101, 3), (11 / 101, num_colors)]
 
-                picked_colors = colors
+        return mixture_probabilities(codes_array, num_colors, mixture)
 
-            codes = list_to_str(random.choices(picked_colors, k = length))
+    def support_size(self, length, num_colors):
+        """Counts the codes the UsuallyFewer SCSA can generate
 
-        else:
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-            codes = []
+        Returns:
+            int: Returns number of codes.
+        """
 
-            for _ in range(num_codes):
+        if num_colors < 3:
 
-                probability = random.randint(0,100)
+            return 0
 
-                if probability <= 49:
+        return num_colors ** length
 
-                    num = 1
 
-                    picked_colors = random.sample(colors, k = num)
+class PreferFewer(SCSA):
+    """ SCSA that generates codes with a preference for fewer colors
+    """
+    
+    def __init__(self, rng = None):
+        """Constructor for PreferFewer
 
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
+        """
 
-                elif probability <= 74:
+        self.name = "PreferFewer"
+        self.rng = np.random.default_rng(rng)
 
-                    num = 2
+    def sample_array(self, length, num_colors, num_codes, rng):
+        """Generates codes based on PreferFewer SCSA as a matrix
 
-                    picked_colors = random.sample(colors, k = num)
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator): Source of randomness.
 
+        Returns:
+            numpy.ndarray: Returns uint8 array of color indices of shape (num_codes, length).
+        """
+
+        probability = rng.integers(0, 101, size=num_codes)
+
+        # 101 equally likely outcomes, split at <= 49, <= 74, <= 87, <= 95, <= 98 and the rest
+        sizes = np.array([1, 2, min(3, num_colors), min(4, num_colors), min(5, num_colors), num_colors])
+
+        picked = sizes[np.searchsorted([50, 75, 88, 96, 99], probability, side="right")]
+
+        return random_subset_codes(length, num_colors, picked, rng)
+
+    def probabilities(self, codes_array, num_colors):
+        """Computes the probability of the PreferFewer SCSA generating each code
 
-                elif probability <= 87:
+        101 equally likely outcomes are split 50/25/13/8/3/2 between 1, 2, 3, 4, 5 and every color.
 
-                    num = min(3, len(colors))
+        Args:
+            codes_array (numpy.ndarray): Codes of shape (N, length).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-                    picked_colors = random.sample(colors, k = num)
+        Returns:
+            numpy.ndarray: Returns probability of each code.
+        """
 
-                elif probability <= 95:
+        if num_colors < 2:
 
-                    num = min(4, len(colors))
+            return np.zeros(len(codes_array))
 
-                    picked_colors = random.sample(colors, k = num)
+        mixture = [(50 / 101, 1), (25 / 101, 2), (13 / 101, min(3, num_colors)), (8 / 101, min(4, num_colors)),
+                   (3 / 101, min(5, num_colors)), (2 / 101, num_colors)]
 
-                elif probability <= 98: 
+        return mixture_probabilities(codes_array, num_colors, mixture)
 
-                    num = min(5, len(colors))
+    def support_size(self, length, num_colors):
+        """Counts the codes the PreferFewer SCSA can generate
 
-                    picked_colors = random.sample(colors, k = num)
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
 
-                else:
+        Returns:
+            int: Returns number of codes.
+        """
 
-                    picked_colors = colors
+        if num_colors < 2:
 
-                code = list_to_str(random.choices(picked_colors, k = length))
+            return 0
 
-                codes.append(code) 
-                
-        return codes
\ No newline at end of file
+        return num_colors ** length
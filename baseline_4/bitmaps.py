@@ -0,0 +1,528 @@
+# File contains compressed bitmaps over code ids, and an index of the codes with each color at each position
+# A bitmap splits the ids into chunks of 65536 and keeps each non-empty chunk in the smallest of three containers
+# (as in Roaring bitmaps): an "array" of the sorted low 16 bits of its ids, a "bitmap" of 1024 uint64 words, or
+# "runs" of consecutive ids stored as (start, length - 1) pairs. In lexicographic order the codes with a color at an
+# early position form a few long runs, and those of the last positions dense bitmaps, so an index of every
+# (position, color) of tens of millions of codes takes megabytes instead of the gigabytes of a list of strs.
+# Usage: python bitmaps.py [board_length] [num_colors]
+
+import sys
+import time
+import numpy as np
+from codes import *
+from swar import popcount
+
+CONTAINER_BITS = 16
+CONTAINER_SIZE = 1 << CONTAINER_BITS
+
+# Largest number of ids kept in an array container, a bitmap container takes as many bytes
+ARRAY_MAX = 4096
+
+# Container of every id of a chunk
+FULL = ("runs", np.array([[0, CONTAINER_SIZE - 1]], dtype=np.uint16))
+
+def container_from_bits(bits):
+    """Returns the smallest container holding the ids set in one chunk
+
+    Args:
+        bits (numpy.ndarray): Bool array of CONTAINER_SIZE entries, entry i is set if id i of the chunk is.
+
+    Returns:
+        tuple: Returns (kind, data) container, or None if no id is set.
+    """
+
+    cardinality = np.count_nonzero(bits)
+
+    if cardinality == 0:
+
+        return None
+
+    edges = np.diff(bits.view(np.int8), prepend=0, append=0)
+
+    return make_container(bits, cardinality, np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1)
+
+def make_container(bits, cardinality, starts, ends):
+    """Returns the smallest container holding the ids set in one chunk, given its runs of ids
+
+    Args:
+        bits (numpy.ndarray): Bool array of CONTAINER_SIZE entries (see container_from_bits).
+        cardinality (int): Number of entries set, at least one.
+        starts (numpy.ndarray): First entry of each run of consecutive entries set.
+        ends (numpy.ndarray): Last entry of each run.
+
+    Returns:
+        tuple: Returns (kind, data) container.
+    """
+
+    if 4 * len(starts) <= min(2 * cardinality, CONTAINER_SIZE // 8):
+
+        return ("runs", np.stack([starts, ends - starts], axis=1).astype(np.uint16))
+
+    if cardinality <= ARRAY_MAX:
+
+        return ("array", np.flatnonzero(bits).astype(np.uint16))
+
+    return ("bitmap", np.packbits(bits, bitorder="little").view(np.uint64))
+
+def container_bits(container):
+    """Expands a container into one bool entry per id of its chunk (see container_from_bits)
+
+    Args:
+        container (tuple): Container, or None for an empty chunk.
+
+    Returns:
+        numpy.ndarray: Returns bool array of CONTAINER_SIZE entries.
+    """
+
+    if container is None:
+
+        return np.zeros(CONTAINER_SIZE, dtype=bool)
+
+    kind, data = container
+
+    if kind == "bitmap":
+
+        return np.unpackbits(data.view(np.uint8), bitorder="little").view(bool)
+
+    bits = np.zeros(CONTAINER_SIZE, dtype=bool)
+
+    if kind == "array":
+
+        bits[data] = True
+
+        return bits
+
+    # Mark where each run starts and ends, the running sum is then positive inside the runs
+    edges = np.zeros(CONTAINER_SIZE + 1, dtype=np.int32)
+    starts = data[:, 0].astype(np.intp)
+
+    np.add.at(edges, starts, 1)
+    np.add.at(edges, starts + data[:, 1] + 1, -1)
+
+    return np.cumsum(edges[:-1]) > 0
+
+def container_cardinality(container):
+    """Counts the ids of a container
+
+    Args:
+        container (tuple): Container (see container_from_bits).
+
+    Returns:
+        int: Returns number of ids.
+    """
+
+    kind, data = container
+
+    if kind == "array":
+
+        return len(data)
+
+    if kind == "bitmap":
+
+        return int(popcount(data).sum())
+
+    return int(data[:, 1].astype(np.int64).sum()) + len(data)
+
+def is_full(container):
+
+    return container is not None and container[0] == "runs" and len(container[1]) == 1 and container[1][0, 1] == CONTAINER_SIZE - 1
+
+def and_containers(first, second):
+    """Returns the container of the ids in both containers
+
+    Args:
+        first (tuple): Container (see container_from_bits).
+        second (tuple): Container.
+
+    Returns:
+        tuple: Returns container, or None if no id is in both.
+    """
+
+    if is_full(first):
+
+        return second
+
+    if is_full(second):
+
+        return first
+
+    if first[0] == "array" or second[0] == "array":
+
+        if first[0] != "array":
+
+            first, second = second, first
+
+        # Only the ids of the array can be in both, look them up instead of expanding it
+        ids = first[1][container_bits(second)[first[1]]]
+
+        return ("array", ids) if len(ids) > 0 else None
+
+    return container_from_bits(container_bits(first) & container_bits(second))
+
+def andnot_containers(first, second):
+    """Returns the container of the ids in the first container but not in the second
+
+    Args:
+        first (tuple): Container (see container_from_bits).
+        second (tuple): Container.
+
+    Returns:
+        tuple: Returns container, or None if every id is in the second.
+    """
+
+    if is_full(second):
+
+        return None
+
+    if first[0] == "array":
+
+        ids = first[1][~container_bits(second)[first[1]]]
+
+        return ("array", ids) if len(ids) > 0 else None
+
+    return container_from_bits(container_bits(first) & ~container_bits(second))
+
+def or_containers(first, second):
+    """Returns the container of the ids in either container
+
+    Args:
+        first (tuple): Container (see container_from_bits).
+        second (tuple): Container.
+
+    Returns:
+        tuple: Returns container.
+    """
+
+    if is_full(first) or is_full(second):
+
+        return FULL
+
+    return container_from_bits(container_bits(first) | container_bits(second))
+
+
+class Bitmap:
+    """Compressed set of code ids below size (see the top of this file)
+
+    Bitmaps are combined with & (and), | (or), ~ (not, relative to every id below size) and - (and not), and
+    len gives the number of ids from the cardinality of each container.
+    """
+
+    def __init__(self, size, containers = None):
+        """Constructor for Bitmap
+
+        Args:
+            size (int): Number of possible ids.
+            containers (dict, optional): Keys: chunk number, the id divided by CONTAINER_SIZE
+                                         Value: non-empty container of the ids of the chunk (see container_from_bits)
+                                         Defaults to no ids.
+        """
+
+        self.size = size
+        self.containers = containers if containers is not None else {}
+
+    def __len__(self):
+
+        return sum(container_cardinality(container) for container in self.containers.values())
+
+    def __contains__(self, code_id):
+
+        container = self.containers.get(code_id >> CONTAINER_BITS)
+
+        return container is not None and bool(container_bits(container)[code_id & (CONTAINER_SIZE - 1)])
+
+    def __and__(self, other):
+
+        containers = {}
+
+        for key in self.containers.keys() & other.containers.keys():
+
+            container = and_containers(self.containers[key], other.containers[key])
+
+            if container is not None:
+
+                containers[key] = container
+
+        return Bitmap(self.size, containers)
+
+    def __or__(self, other):
+
+        containers = dict(self.containers)
+
+        for key, container in other.containers.items():
+
+            containers[key] = or_containers(containers[key], container) if key in containers else container
+
+        return Bitmap(self.size, containers)
+
+    def __invert__(self):
+
+        containers = {}
+
+        for key in range(num_chunks(self.size)):
+
+            bits = ~container_bits(self.containers.get(key))
+
+            # Ids past the end of the last chunk do not exist
+            bits[max(self.size - (key << CONTAINER_BITS), 0):] = False
+
+            container = container_from_bits(bits)
+
+            if container is not None:
+
+                containers[key] = container
+
+        return Bitmap(self.size, containers)
+
+    def __sub__(self, other):
+
+        containers = {}
+
+        for key, container in self.containers.items():
+
+            if key in other.containers:
+
+                container = andnot_containers(container, other.containers[key])
+
+            if container is not None:
+
+                containers[key] = container
+
+        return Bitmap(self.size, containers)
+
+    def nbytes(self):
+        """Returns number of bytes taken by the containers
+        """
+
+        return sum(container[1].nbytes for container in self.containers.values())
+
+    def to_ids(self):
+        """Returns every id in increasing order
+
+        Returns:
+            numpy.ndarray: Returns int64 array of ids.
+        """
+
+        ids = [np.flatnonzero(container_bits(self.containers[key])) + (key << CONTAINER_BITS) for key in sorted(self.containers)]
+
+        return np.concatenate(ids).astype(np.int64) if ids else np.zeros(0, dtype=np.int64)
+
+    def to_mask(self):
+        """Returns one bool per id, set if the id is in the bitmap
+
+        Returns:
+            numpy.ndarray: Returns bool array of size entries.
+        """
+
+        mask = np.zeros(num_chunks(self.size) * CONTAINER_SIZE, dtype=bool)
+
+        for key, container in self.containers.items():
+
+            mask[key << CONTAINER_BITS:(key + 1) << CONTAINER_BITS] = container_bits(container)
+
+        return mask[:self.size]
+
+
+def num_chunks(size):
+
+    return (size + CONTAINER_SIZE - 1) >> CONTAINER_BITS
+
+def bitmap_from_mask(mask):
+    """Builds the bitmap of the ids whose entry is set
+
+    Args:
+        mask (numpy.ndarray): Bool array, one entry per possible id.
+
+    Returns:
+        Bitmap: Returns bitmap of size len(mask).
+    """
+
+    chunks = np.zeros((num_chunks(len(mask)), CONTAINER_SIZE), dtype=bool)
+    chunks.reshape(-1)[:len(mask)] = mask
+
+    # Ids and runs of every chunk are found at once, runs are cut at the edges of each chunk
+    cardinalities = np.count_nonzero(chunks, axis=1)
+
+    starts = chunks.copy()
+    starts[:, 1:] &= ~chunks[:, :-1]
+    starts = np.flatnonzero(starts)
+
+    ends = chunks.copy()
+    ends[:, :-1] &= ~chunks[:, 1:]
+    ends = np.flatnonzero(ends)
+
+    bounds = np.searchsorted(starts, np.arange(len(chunks) + 1) << CONTAINER_BITS)
+
+    containers = {}
+
+    for key in np.flatnonzero(cardinalities).tolist():
+
+        first, last = bounds[key], bounds[key + 1]
+
+        containers[key] = make_container(chunks[key], int(cardinalities[key]), starts[first:last] & (CONTAINER_SIZE - 1),
+                                         ends[first:last] & (CONTAINER_SIZE - 1))
+
+    return Bitmap(len(mask), containers)
+
+def bitmap_from_ids(ids, size):
+    """Builds the bitmap of some ids
+
+    Args:
+        ids (numpy.ndarray): Ids, each below size.
+        size (int): Number of possible ids.
+
+    Returns:
+        Bitmap: Returns bitmap.
+    """
+
+    mask = np.zeros(size, dtype=bool)
+    mask[ids] = True
+
+    return bitmap_from_mask(mask)
+
+def full_bitmap(size):
+    """Returns the bitmap of every id below size
+    """
+
+    return bitmap_from_mask(np.ones(size, dtype=bool))
+
+
+class PositionColorIndex:
+    """One bitmap per (position, color) of the codes of a configuration with that color at that position
+
+    Codes are numbered in lexicographic order (see codes.code_to_id). Bitmaps are built the first time they are
+    used and kept, constraints on positions are then bitmap operations and counting the codes left is a popcount.
+    """
+
+    def __init__(self, board_length, num_colors):
+        """Constructor for PositionColorIndex
+
+        Args:
+            board_length (int): Number of pegs.
+            num_colors (int): Number of colors that could be used in a code.
+        """
+
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.num_codes = num_colors ** board_length
+
+        # Keys: (position, color)
+        # Value: Bitmap of the codes with color at position
+        self.bitmaps = {}
+
+    def at(self, position, color):
+        """Returns the bitmap of the codes with a color at a position
+
+        Args:
+            position (int): Position of the peg, 0 for the first one.
+            color (int): Color index.
+
+        Returns:
+            Bitmap: Returns bitmap.
+        """
+
+        if (position, color) not in self.bitmaps:
+
+            # Codes with color at position are runs of num_colors ** (pegs after position) ids, one run every
+            # num_colors times that many
+            mask = np.zeros(self.num_codes, dtype=bool)
+            mask.reshape(self.num_colors ** position, self.num_colors, -1)[:, color] = True
+
+            self.bitmaps[(position, color)] = bitmap_from_mask(mask)
+
+        return self.bitmaps[(position, color)]
+
+    def prefix(self, code):
+        """Returns the bitmap of the codes starting with some pegs
+
+        Args:
+            code (str or numpy.ndarray): First pegs of the codes.
+
+        Returns:
+            Bitmap: Returns bitmap.
+        """
+
+        bitmap = full_bitmap(self.num_codes)
+
+        for position, color in enumerate(as_code_array(code).tolist()):
+
+            bitmap = bitmap & self.at(position, color)
+
+        return bitmap
+
+    def allowed(self, excluded_colors = 0, excluded_at = None):
+        """Returns the bitmap of the codes that use no excluded color, like the masks of LexicographicEnumerator
+
+        Args:
+            excluded_colors (int, optional): Bitmask of colors that may not be used at all. Defaults to 0.
+            excluded_at (list of ints, optional): Bitmask of colors that may not be used at each position.
+                                                  Defaults to None.
+
+        Returns:
+            Bitmap: Returns bitmap.
+        """
+
+        bitmap = full_bitmap(self.num_codes)
+
+        for position in range(self.board_length):
+
+            excluded = excluded_colors | (excluded_at[position] if excluded_at is not None else 0)
+
+            colors = [color for color in range(self.num_colors) if excluded >> color & 1]
+
+            if len(colors) == 0:
+
+                continue
+
+            # Fewer bitmaps are combined by removing the excluded colors than by adding up the allowed ones
+            if 2 * len(colors) <= self.num_colors:
+
+                for color in colors:
+
+                    bitmap = bitmap - self.at(position, color)
+
+            else:
+
+                union = Bitmap(self.num_codes)
+
+                for color in range(self.num_colors):
+
+                    if not excluded >> color & 1:
+
+                        union = union | self.at(position, color)
+
+                bitmap = bitmap & union
+
+        return bitmap
+
+    def nbytes(self):
+        """Returns number of bytes taken by the bitmaps built so far
+        """
+
+        return sum(bitmap.nbytes() for bitmap in self.bitmaps.values())
+
+
+if __name__ == "__main__":
+
+    board_length = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    num_colors = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    index = PositionColorIndex(board_length, num_colors)
+
+    start = time.perf_counter()
+
+    for position in range(board_length):
+
+        for color in range(num_colors):
+
+            index.at(position, color)
+
+    print("Index of", index.num_codes, "codes:", round(index.nbytes() / 2 ** 20, 1), "MiB, built in",
+          round(time.perf_counter() - start, 2), "s (a list of the codes as strs takes about",
+          round(index.num_codes * (49 + board_length) / 2 ** 20), "MiB)")
+
+    # Baseline2 after a guess of AAAB got 0 0: no code starts with AAA or ends in B
+    start = time.perf_counter()
+
+    survivors = full_bitmap(index.num_codes) - index.prefix("AAA") - index.at(board_length - 1, 1)
+
+    print("Codes not starting with AAA nor ending in B:", len(survivors), "found in", round(time.perf_counter() - start, 2), "s")
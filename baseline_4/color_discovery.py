@@ -0,0 +1,162 @@
+# File contains a first phase for players that finds how many pegs of each color are in the secret code
+# See fbi_B3.py for example usages
+
+from collections import deque
+
+class ColorDiscovery:
+    """Finds the number of pegs of each color with mixed-color guesses (adaptive group testing)
+
+    A guess made of a group of colors, each used at least once, has exact + other > 0 exactly when one of those
+    colors is in the secret code. Colors are tested in groups of up to board_length colors; an empty group rules
+    all its colors out with one guess, and a non-empty group is split in half until single colors are left, which
+    are then counted with a monochromatic guess. When the left half of a split turns out empty the right half is
+    known to be non-empty and is split without being tested. Discovery stops as soon as the counts found add up to
+    board_length, and the last undetermined color is never guessed.
+
+    With k colors present this takes about c / board_length + k log2(board_length) guesses instead of the c - 1
+    monochromatic guesses, which matters when few of many colors are used. When there are at most twice as many
+    colors as pegs, splitting costs more than it saves and every color is counted on its own instead.
+    """
+
+    def __init__(self, board_length, colors, group_size = None):
+        """Constructor for ColorDiscovery
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            group_size (int, optional): Number of colors in the first groups, at most board_length. Defaults to
+                                        board_length if there are more than twice as many colors as pegs, 1 otherwise.
+        """
+
+        if group_size is None:
+
+            group_size = board_length if len(colors) > 2 * board_length else 1
+
+        self.board_length = board_length
+        self.colors = colors
+
+        # Keys: color
+        # Value: # of color present in the secret code
+        self.counts = {}
+
+        # Groups of colors still to be tested, each with the left half it was split from (None if not split)
+        self.groups = deque((colors[i:i+group_size], None) for i in range(0, len(colors), group_size))
+
+        self.testing = None
+
+        self.infer()
+
+    @property
+    def done(self):
+        """bool: True once the number of pegs of every color is known"""
+
+        return len(self.counts) == len(self.colors)
+
+    def next_guess(self):
+        """Makes the next guess of the discovery phase
+
+        Returns:
+            str: Returns guess, or None if discovery is done.
+        """
+
+        while not self.done:
+
+            group, left = self.groups.popleft()
+
+            group = [color for color in group if color not in self.counts]
+
+            if not group:
+
+                continue
+
+            if left is not None and len(group) > 1 and all(self.counts.get(color) == 0 for color in left):
+
+                # The group this half was split from was not empty, but its left half was
+                self.split(group)
+
+                continue
+
+            self.testing = group
+
+            return self.group_guess(group)
+
+        return None
+
+    def update(self, exact, other):
+        """Uses the response to the last guess made by next_guess
+
+        Args:
+            exact (int): Number of pegs that matched exactly with the answer.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+        """
+
+        found = exact + other
+        group = self.testing
+
+        if found == 0:
+
+            for color in group:
+
+                self.counts[color] = 0
+
+        elif len(group) == 1:
+
+            # Monochromatic guess, so found is the number of pegs of that color
+            self.counts[group[0]] = found
+
+        else:
+
+            self.split(group)
+
+        self.infer()
+
+        return
+
+    def split(self, group):
+        """Queues both halves of a group that contains at least one color of the secret code
+
+        Args:
+            group (list of chrs): Colors to split.
+        """
+
+        left = group[:len(group) // 2]
+        right = group[len(group) // 2:]
+
+        # Finish this group before moving on to untested groups
+        self.groups.appendleft((right, left))
+        self.groups.appendleft((left, None))
+
+        return
+
+    def group_guess(self, group):
+        """Makes a guess that uses every color of a group at least once
+
+        Args:
+            group (list of chrs): Colors to use, at most board_length of them.
+
+        Returns:
+            str: Returns guess.
+        """
+
+        pegs_per_color, extra = divmod(self.board_length, len(group))
+
+        return "".join(color * (pegs_per_color + (i < extra)) for i, color in enumerate(group))
+
+    def infer(self):
+        """Determines counts that follow from the ones already found
+        """
+
+        remaining = [color for color in self.colors if color not in self.counts]
+        total = sum(self.counts.values())
+
+        if total == self.board_length:
+
+            for color in remaining:
+
+                self.counts[color] = 0
+
+        elif len(remaining) == 1:
+
+            self.counts[remaining[0]] = self.board_length - total
+
+        return
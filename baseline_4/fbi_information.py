@@ -0,0 +1,173 @@
+import numpy as np
+from player import Player
+from candidates import CandidateSet, LexicographicEnumerator, universe
+from codes import array_to_str, codes_to_ids
+from feedback import partition_sizes
+from scsa import SCSA
+
+class InformationPlayer(Player):
+    """Expected information mastermind player
+    Weights every code by how likely the SCSA is to pick it, keeps the codes the SCSA can generate that are
+    consistent with the responses so far, and guesses the code whose response is the most uncertain (the largest
+    entropy of the weighted response partition, which is the expected information gained by the guess). Ties go to
+    the guess most likely to be the secret code itself.
+
+    The weights of a configuration come from SCSA.probabilities over SCSA.support, are computed once and are shared
+    by every round and every InformationPlayer. Configurations with more than SCSA.max_support codes are estimated
+    from a fixed sample of codes drawn from the SCSA instead, and once no sampled code is consistent with the
+    responses the player guesses the next consistent code in lexicographic order.
+    """
+
+    # Keys: (SCSA name, board length, # of colors)
+    # Value: (codes the SCSA can generate, weight of each of them, opening guess, whether the codes are a sample)
+    priors = {}
+
+    # Number of codes drawn from the SCSA of configurations with more than SCSA.max_support codes
+    max_sampled = 2 ** 16
+
+    # Largest number of guesses scored per step. Games with more codes only consider the most likely
+    # consistent codes
+    max_guess_pool = 2 ** 12
+
+    # Largest number of consistent codes the guesses are scored against, the partitions of larger sets are
+    # estimated from an evenly spaced sample of them
+    max_scored = 2 ** 12
+
+    # Largest number of responses computed per step, the guess pool shrinks when this many are needed
+    max_responses = 2 ** 22
+
+    # Largest number of responses computed at once while scoring the guesses
+    block_size = 2 ** 22
+
+    def __init__(self):
+        self.player_name = "Information"
+        # Codes not yet ruled out by any response of the current round
+        self.candidates = None
+        # Weight of each code of the configuration of the current round
+        self.weights = None
+        # Consistent codes of the whole configuration, walked once no sampled code is consistent, None if not sampled
+        self.fallback = None
+        self.last_guess = None
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the
+                                           secret code for the previous guess and the second element is the number
+                                           of pegs that are the right color, but in the wrong location for the
+                                           previous guess.
+
+        Returns:
+            str: Returns guess
+        """
+        if last_response[2] == 0:
+            support, self.weights, guess, sampled = self.prior(board_length, colors, scsa)
+            self.candidates = CandidateSet(board_length, colors, support)
+            self.fallback = LexicographicEnumerator(board_length, colors) if sampled else None
+        else:
+            # Rule out every code that would have given a different response to the last guess
+            self.candidates.apply(self.last_guess, last_response[0], last_response[1])
+            if self.fallback is not None:
+                self.fallback.apply(self.last_guess, last_response[0], last_response[1])
+            if len(self.candidates) == 0:
+                # The secret code was not sampled
+                guess = array_to_str(self.fallback.next_code())
+            else:
+                guess = self.best_guess(self.candidates, self.weights, len(colors))
+
+        self.last_guess = guess
+        return self.encode_guess(guess, board_length, colors)
+
+    def prior(self, board_length, colors, scsa):
+        """Returns the codes of a configuration, their weights and the first guess of its rounds, computing them once
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret code, or None if unknown.
+
+        Returns:
+            support (numpy.ndarray): Codes the SCSA can generate in lexicographic order, every code if scsa is None.
+            weights (numpy.ndarray): Probability of each code of support.
+            opening (str): Guess with the largest expected information before any response.
+            sampled (bool): Whether support is a sample of the codes, when there are more than SCSA.max_support.
+        """
+        key = (getattr(scsa, "name", None), board_length, len(colors))
+
+        if key not in self.priors:
+            size = scsa.support_size(board_length, len(colors)) if scsa is not None else len(colors) ** board_length
+            sampled = size > SCSA.max_support
+
+            if sampled:
+                # Same sample for every round, drawn from the SCSA so each code weighs as often as it was drawn
+                rng = np.random.default_rng(0)
+                if scsa is None:
+                    drawn = rng.integers(len(colors), size=(self.max_sampled, board_length), dtype=np.uint8)
+                else:
+                    drawn = scsa.generate_array(board_length, colors, self.max_sampled, rng)
+                support, counts = np.unique(drawn, axis=0, return_counts=True)
+                weights = counts / counts.sum()
+            elif scsa is None:
+                support = universe(board_length, len(colors))
+                weights = np.full(len(support), 1 / len(support))
+            else:
+                support = scsa.support(board_length, colors)
+                weights = scsa.probabilities(support, len(colors))
+
+            opening = self.best_guess(CandidateSet(board_length, colors, support), weights, len(colors))
+
+            self.priors[key] = (support, weights, opening, sampled)
+
+        return self.priors[key]
+
+    def best_guess(self, candidates, weights, num_colors):
+        """Returns the consistent or inconsistent guess with the largest expected information
+
+        Args:
+            candidates (CandidateSet): Codes not yet ruled out.
+            weights (numpy.ndarray): Weight of every code of candidates, ruled out or not.
+            num_colors (int): Number of colors that could be used in the secret code.
+
+        Returns:
+            str: Returns guess
+        """
+        survivors = candidates.survivors()
+        weights = weights[candidates.mask]
+        weights = weights / weights.sum()
+
+        if len(survivors) == 1:
+            return array_to_str(survivors[0])
+
+        scored, scored_weights = survivors, weights
+        if len(survivors) > self.max_scored:
+            sample = np.linspace(0, len(survivors) - 1, self.max_scored).astype(np.intp)
+            scored, scored_weights = survivors[sample], weights[sample] / weights[sample].sum()
+
+        pool_size = min(self.max_guess_pool, max(1, self.max_responses // len(scored)))
+
+        if num_colors ** survivors.shape[1] <= pool_size:
+            # Codes the SCSA never generates can still split the survivors well
+            pool = universe(survivors.shape[1], num_colors)
+            chance = np.zeros(len(pool))
+            chance[codes_to_ids(survivors, num_colors)] = weights
+        else:
+            likely = np.argsort(-weights, kind="stable")[:pool_size]
+            pool = survivors[likely]
+            chance = weights[likely]
+
+        information = np.empty(len(pool))
+        step = max(1, self.block_size // len(scored))
+
+        for i in range(0, len(pool), step):
+            mass = partition_sizes(pool[i:i+step], scored, num_colors, scored_weights)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                information[i:i+step] = -np.nansum(mass * np.log2(mass), axis=1)
+
+        # Round so guesses that split the codes the same way tie, then prefer the likeliest secret code
+        best = np.lexsort((-chance, -np.round(information, 9)))[0]
+
+        return array_to_str(pool[best])
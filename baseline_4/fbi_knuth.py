@@ -0,0 +1,164 @@
+import time
+import numpy as np
+from player import Player
+from candidates import CandidateSet, LexicographicEnumerator
+from codes import array_to_str
+from feedback import partition_sizes
+
+class KnuthPlayer(Player):
+    """Knuth's minimax mastermind player
+    Keeps every code consistent with the responses so far, and guesses the code that minimizes the size of the
+    largest group of consistent codes that could give the same response (the worst case after the guess). Ties
+    go to a consistent code, then to the first code in lexicographic order. The first guess is AABB (Knuth's
+    1122), extended to other board lengths.
+
+    Games with more than max_candidates codes only keep a fixed uniform sample of them, shared by every round, and
+    once no sampled code is consistent the player guesses the next consistent code in lexicographic order.
+
+    Credit goes to D. E. Knuth, "The computer as Master Mind" (1976).
+    """
+
+    # Largest number of guesses scored per step. Games with more codes only consider the consistent codes, and
+    # an evenly spaced sample of them when there are more than this
+    max_guess_pool = 2 ** 12
+
+    # Largest number of responses computed at once while scoring the guesses
+    block_size = 2 ** 22
+
+    # Largest number of codes kept in memory, larger games keep a sample of max_sampled codes instead
+    max_candidates = 2 ** 20
+    max_sampled = 2 ** 16
+
+    # Keys: (board length, # of colors)
+    # Value: sampled codes in lexicographic order
+    samples = {}
+
+    # Directory of partition indexes to apply responses with (see candidates.PartitionIndex), None to score the
+    # consistent codes instead
+    partition_directory = None
+
+    def __init__(self):
+        self.player_name = "Knuth"
+        # Codes not yet ruled out by any response of the current round
+        self.candidates = None
+        # Consistent codes of the whole game, walked once no sampled code is consistent, None if not sampled
+        self.fallback = None
+        self.last_guess = None
+        # Seconds taken by each call of make_guess, over every round played
+        self.latencies = []
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+
+        Returns:
+            str: Returns guess
+        """
+        start = time.perf_counter()
+
+        if last_response[2] == 0:
+            if len(colors) ** board_length <= self.max_candidates:
+                self.candidates = CandidateSet(board_length, colors, partitions=self.partition_directory)
+                self.fallback = None
+            else:
+                self.candidates = CandidateSet(board_length, colors, self.sample(board_length, len(colors)))
+                self.fallback = LexicographicEnumerator(board_length, colors)
+            guess = self.opening(board_length, colors)
+        else:
+            # Rule out every code that would have given a different response to the last guess
+            self.candidates.apply(self.last_guess, last_response[0], last_response[1])
+            if self.fallback is not None:
+                self.fallback.apply(self.last_guess, last_response[0], last_response[1])
+            if len(self.candidates) == 0:
+                # The secret code was not sampled
+                guess = array_to_str(self.fallback.next_code())
+            else:
+                guess = self.minimax(board_length, colors)
+
+        self.last_guess = guess
+        self.latencies.append(time.perf_counter() - start)
+        return self.encode_guess(guess, board_length, colors)
+
+    def sample(self, board_length, num_colors):
+        """Returns the sampled codes of a game too large to keep every code of, drawing them once
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            num_colors (int): Number of colors that could be used in the secret code.
+
+        Returns:
+            numpy.ndarray: Returns distinct codes in lexicographic order.
+        """
+        key = (board_length, num_colors)
+
+        if key not in self.samples:
+            rng = np.random.default_rng(0)
+            drawn = rng.integers(num_colors, size=(self.max_sampled, board_length), dtype=np.uint8)
+            self.samples[key] = np.unique(drawn, axis=0)
+
+        return self.samples[key]
+
+    def opening(self, board_length, colors):
+        """Returns the first guess of a round, half of the first color and half of the second
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+
+        Returns:
+            str: Returns guess
+        """
+        half = board_length // 2
+        return colors[0] * half + colors[min(1, len(colors) - 1)] * (board_length - half)
+
+    def minimax(self, board_length, colors):
+        """Returns the guess whose largest partition of the consistent codes is smallest
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): Colors that could be used in the secret code.
+
+        Returns:
+            str: Returns guess
+        """
+        survivors = self.candidates.survivors()
+
+        if len(survivors) <= 2:
+            # Guessing a consistent code can only be beaten by winning with it
+            return array_to_str(survivors[0])
+
+        if len(self.candidates.codes) <= self.max_guess_pool:
+            pool = self.candidates.codes
+            consistent = self.candidates.mask
+        else:
+            pool = survivors
+            if len(pool) > self.max_guess_pool:
+                pool = pool[np.linspace(0, len(pool) - 1, self.max_guess_pool).astype(np.intp)]
+            consistent = np.ones(len(pool), dtype=bool)
+
+        worst = np.empty(len(pool), dtype=np.int64)
+        step = max(1, self.block_size // len(survivors))
+
+        for i in range(0, len(pool), step):
+            worst[i:i+step] = partition_sizes(pool[i:i+step], survivors, len(colors)).max(axis=1)
+
+        # Smallest worst case first, then consistent codes, then lexicographic order
+        best = np.lexsort((np.arange(len(pool)), ~consistent, worst))[0]
+
+        return array_to_str(pool[best])
+
+    def print_latency(self):
+        """Prints the mean and largest time taken by make_guess
+        """
+        if not self.latencies:
+            return
+        latencies = np.array(self.latencies) * 1000
+        print("Guesses:", len(latencies))
+        print("Latency (ms): mean", round(float(latencies.mean()), 3), "max", round(float(latencies.max()), 3))
@@ -5,6 +5,10 @@ import sys
 from scsa import *
 from player import *
 from mastermind import *
+from fbi_B4 import B4Player
+from fbi_knuth import KnuthPlayer
+from fbi_information import InformationPlayer
+from candidates import shared_feedback_rows
 
 if len(sys.argv) != 6:
      
@@ -27,6 +31,18 @@ elif player_name == "Boring":
 
     player = Boring()
 
+elif player_name == "Baseline4":
+
+    player = B4Player()
+
+elif player_name == "Knuth":
+
+    player = KnuthPlayer()
+
+elif player_name == "Information":
+
+    player = InformationPlayer()
+
 else:
 
     print("Unrecognized player.")
@@ -74,4 +90,12 @@ colors = [chr(i) for i in range(65,91)][:num_colors]
 
 mastermind = Mastermind(board_length, colors)
 
-mastermind.play_tournament(player, scsa, num_rounds)
\ No newline at end of file
+mastermind.play_tournament(player, scsa, num_rounds)
+
+if player_name == "Knuth":
+
+    player.print_latency()
+
+if player_name in ("Knuth", "Information") and shared_feedback_rows(board_length, num_colors) is not None:
+
+    shared_feedback_rows(board_length, num_colors).print_stats()
\ No newline at end of file
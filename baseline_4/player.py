@@ -1,13 +1,18 @@
 # File contains implementations for the players for Mastermind
 # See main.py or examples.ipynb for example usages
 
-import random
 from scsa import *
 
 class Player:
     """Player for Mastermind
     """
 
+    # Encoding of the guesses returned by make_guess ("str", "int" or "array"), Round accepts all of them
+    encoding = "str"
+
+    # Source of randomness of players that guess at random, seeded tournaments replace it every round
+    rng = None
+
     def __init__(self):
         """Constructor for Player
         """
@@ -31,16 +36,59 @@ class Player:
 
         raise NotImplementedError
 
+    def seed(self, rng):
+        """Replaces the source of randomness of the player
+
+        Args:
+            rng (numpy.random.Generator, int or numpy.random.SeedSequence): Source of randomness, or seed for a new one.
+        """
+
+        self.rng = np.random.default_rng(rng)
+
+        return
+
+    def guess_time(self, clock, measured):
+        """Returns the time the player is charged for its last guess
+
+        Args:
+            clock (str): Clock the round is timed with (see watchdog.CLOCKS).
+            measured (float): Seconds the round measured on that clock around make_guess.
+
+        Returns:
+            float: Returns measured, players that make their guesses in another process report their own time.
+        """
+
+        return measured
+
+    def encode_guess(self, guess, board_length, colors):
+        """Converts a guess to the encoding used by the player
+
+        Args:
+            guess (str, int or numpy.ndarray): Guess of secret code.
+            board_length (int): Number of pegs of secret code.
+            colors (list of chr): Colors that could be used in the secret code.
+
+        Returns:
+            str, int or numpy.ndarray: Returns guess in self.encoding.
+        """
+
+        return encode_code(guess, board_length, len(colors), self.encoding)
+
 
 class RandomFolks(Player):
     """Mastermind Player that makes random guesses
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for RandomFolks
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.player_name = "RandomFolks"
+        self.rng = np.random.default_rng(rng)
 
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
@@ -59,7 +107,7 @@ class RandomFolks(Player):
 
         scsa = InsertColors()
 
-        guess = scsa.generate_codes(board_length, colors)
+        guess = scsa.generate_codes(board_length, colors, 1, self.encoding, self.rng)
 
         return guess
 
@@ -68,11 +116,16 @@ class Boring(Player):
     """Mastermind Player that guesses all the same color and chooses that color at random
     """
 
-    def __init__(self):
+    def __init__(self, rng = None):
         """Constructor for Boring
+
+        Args:
+            rng (numpy.random.Generator or int, optional): Source of randomness, or seed for a new one (see
+                                                           numpy.random.default_rng). Defaults to an unseeded generator.
         """
 
         self.player_name = "Boring"
+        self.rng = np.random.default_rng(rng)
 
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
@@ -89,8 +142,8 @@ class Boring(Player):
             str: Returns guess
         """
 
-        color = random.sample(colors, k = 1)
+        color = colors[self.rng.integers(len(colors))]
 
-        guess = list_to_str(color*board_length)
+        guess = color * board_length
 
-        return guess
+        return self.encode_guess(guess, board_length, colors)
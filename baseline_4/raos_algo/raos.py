@@ -1,20 +1,55 @@
 from player import *
-import enum
-
-class KB(enum.Enum):
-   Color = 0
-   Positions = 1
 
 class RaosAlgorithm(Player):
+    """
+    Rao's algorithm for Mastermind
+
+    Every trial keeps the tied positions (positions whose color is known), tries the color being fixed at its next
+    possible position, and fills every other position with one filler color: the next color being considered
+    while the number of pegs of each color is still unknown, and afterwards a color known to be absent or, if there
+    is none, the second unfixed color. Because the filler's number of untied pegs is known (or learned from the
+    same trial), the bulls tell whether the probed position holds the color being fixed, the filler, or neither.
+
+    Credit goes to T. Mahadeva Rao for their research.
+    """
     def __init__(self):
         self.player_name = "RaosAlgorithm"
+        self.setup(0, [])
+
+    def setup(self, board_length, colors):
+        """
+        Resets the knowledge base for a new round
 
-        # inferences[i][0] is a color, inferences[i][1] is a list of possible positions for that color
-        self.inferences = [] 
+        Parameters
+        ----------
+        board_length - Number of positions/board size
+        colors - Colors that could be used in the secret code
+        """
+        self.board_length = board_length
+        self.colors = colors
+
+        # tied_color[pos] is the color tied to pos, or None if pos is not tied yet
+        self.tied_color = [None] * board_length
+        self.num_tied = 0
+        self.untied = (1 << board_length) - 1
 
-        self.being_considered = None
+        # inferences[color] is a bitmask of the positions that color can still be at, for every color with pegs
+        # that are not tied yet. remaining[color] is how many of its pegs are not tied yet
+        self.inferences = {}
+        self.remaining = {}
+
+        # Index in colors of the next color whose number of pegs is unknown
+        self.being_considered = 0
+        # A color known not to be in the secret code, used as filler once every color has been counted
+        self.absent = None
+
+        # Parts of the last trial needed to interpret its response
+        self.trial = None
         self.being_fixed = None
-    
+        self.probe = None
+        self.filler = None
+        self.filler_is_new = False
+
     def make_guess(self, board_length, colors, scsa, last_response):
         """Makes a guess of the secret code for Mastermind
 
@@ -22,11 +57,20 @@ class RaosAlgorithm(Player):
             board_length (int): Number of pegs of secret code.
             colors (list of chr): Colors that could be used in the secret code.
             scsa (SCSA): SCSA used to generate secret code.
-            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret 
-                                           code for the previous guess and the second element is the number of pegs that are 
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
                                            the right color, but in the wrong location for the previous guess.
+
+        Returns:
+            str: Returns guess
         """
-        return
+        bulls, cows, num_guess = last_response
+        if num_guess == 0:
+            self.setup(board_length, colors)
+        else:
+            self.Update(bulls, cows)
+        self.trial = self.Getnext()
+        return self.encode_guess("".join(self.trial), board_length, colors)
 
     def tied(self, pos):
         """
@@ -36,12 +80,7 @@ class RaosAlgorithm(Player):
         ----------
         pos - The given position in the trial/guess
         """
-        for i in range(len(self.inferences)):
-            # Look at each color in inferences, if the possible positions is just 1 position (tied), see if it matches the parameter pos
-            # If there is a match, that position is tied to a color
-            if len(self.inferences[i][KB.Positions]) == 1 and self.inferences[i][KB.Positions][0] == pos:
-                return True
-        return False
+        return self.tied_color[pos] is not None
 
     def itscolor(self, tied_pos):
         """
@@ -51,82 +90,169 @@ class RaosAlgorithm(Player):
         ----------
         tied_pos - the position in the trial that is tied to a color
         """
-        for i in range(len(self.inferences)):
-            # See if this entry from inferences only has one position in possible positions
-            # If position matches the tied_pos, return the color that the position is tied to
-            if len(self.inferences[i][KB.Positions]) == 1 and self.inferences[i][KB.Positions][0] == tied_pos:
-                return self.inferences[i][KB.Color]
-            
+        return self.tied_color[tied_pos]
 
     def nextpos(self, color):
-         """
-        Returns the next possible position for the color 
+        """
+        Returns the next possible position for the color, or None if the color has none
 
         Parameters
         ----------
-        tied_pos - the position in the trial that is tied to a color
+        color - the color being fixed
         """
+        if color is None:
+            return None
+        possible = self.inferences[color] & self.untied
+        if possible == 0:
+            return None
+        # Lowest set bit
+        return (possible & -possible).bit_length() - 1
 
-    def Getnext(self,trial):
+    def Numfix(self):
+        """
+        Returns the number of positions whose color is known
         """
-        Returns next guess
+        return self.num_tied
 
-        Parameters
-        ----------
-        trial - Previous guess
+    def counted(self):
+        """
+        Returns if the number of pegs of every color is known
+        """
+        return self.num_tied + sum(self.remaining.values()) == self.board_length
+
+    def secondunfixed(self):
+        """
+        Returns the second color with pegs that are not tied yet, or None if there is at most one
+        """
+        unfixed = iter(self.inferences)
+        next(unfixed, None)
+        return next(unfixed, None)
+
+    def Getnext(self):
+        """
+        Returns next trial as a list of colors, and remembers how it was built for Update
         """
-        N = len(trial)
+        self.being_fixed = next(iter(self.inferences), None)
+        self.probe = self.nextpos(self.being_fixed)
+        self.filler_is_new = not self.counted()
+
+        if self.filler_is_new:
+            self.filler = self.colors[self.being_considered]
+        elif self.absent is not None:
+            self.filler = self.absent
+        else:
+            self.filler = self.secondunfixed()
+
         new_trial = []
-        for i in range (N):
+        for i in range(self.board_length):
             if self.tied(i):
                 new_trial.append(self.itscolor(i))
-            elif i == self.nextpos(self.being_fixed):
+            elif i == self.probe:
                 new_trial.append(self.being_fixed)
-            elif len(self.inferences) == N:
-                new_trial.append(secondunfixed(self.inferences))
             else:
-                new_trial.append(self.being_considered)
+                new_trial.append(self.filler)
         return new_trial
 
+    def Update(self, bulls, cows):
+        """
+        Updates the knowledge base from the response to the last trial
 
-    def Try(self, trial):
-        print(f"My Next Trial: {trial}")
-        print("Enter Bulls >> ", end="")
-        bulls = input()
-        print("Enter Cows >> ", end="")
-        cows = input()
-        return bulls, cows
+        Parameters
+        ----------
+        bulls - Number of pegs of the last trial that match exactly
+        cows - Number of pegs of the last trial that are the right color, but in the wrong location
+        """
+        num_tied = self.num_tied
 
-def MasterMind(N,M):
-    """
-    MasterMind main method
+        if self.filler_is_new:
+            # Every peg of a new color is at an untied position, and the trial has at least that many of them
+            count = bulls + cows - num_tied - (self.probe is not None)
+            self.being_considered += 1
+            if count == 0:
+                if self.absent is None:
+                    self.absent = self.filler
+            else:
+                self.remaining[self.filler] = count
+                self.inferences[self.filler] = self.untied
+        else:
+            count = self.remaining.get(self.filler, 0)
 
-    Parameters
-    ----------
-    N - Number of positions/board size
-    M - Number of colors
-        Colors are represented as (1, 2, ..., M)
-    """
-        
-    trial = []
-    inferences = []
-    being_considered = "A"
-    being_fixed = None
-    # setup() TODO, inialize first trial, reset knowledge base
-    bulls = 0
-    cows = 0
-    bulls, cows = Try(trial)
-    gameover = False
-    while bulls < N and not gameover:
-        #Update(inferences) (updates inferences based on number of bulls, cows, and previous trial)
-        #Getnext(trial, inferences, Being-Considered, Being-Fixed) (updates trial based on new inferences)
-        #if Numfix(inferences) == N: (goal test)
-            #gameover = True
-        # else:
-            #  Try(trial)    
-    print(trial)
-def main():
-    help(MasterMind)
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+        if self.probe is not None:
+            # The filler matches at every one of its untied positions except possibly the probe, so
+            # bulls - num_tied - count = [probe has being_fixed] - [probe has filler]
+            difference = bulls - num_tied - count
+            if difference == 1:
+                self.tie(self.probe, self.being_fixed)
+            else:
+                self.exclude(self.being_fixed, self.probe)
+                if difference == -1:
+                    self.tie(self.probe, self.filler)
+                else:
+                    self.exclude(self.filler, self.probe)
+
+        # The last color never needs a trial of its own
+        if not self.counted() and self.being_considered == len(self.colors) - 1:
+            last = self.colors[self.being_considered]
+            self.being_considered += 1
+            self.remaining[last] = self.board_length - self.num_tied - sum(self.remaining.values())
+            self.inferences[last] = self.untied
+
+        self.propagate()
+
+    def tie(self, pos, color):
+        """
+        Ties a position to a color
+
+        Parameters
+        ----------
+        pos - The position in the trial
+        color - The color at that position in the secret code
+        """
+        self.tied_color[pos] = color
+        self.num_tied += 1
+        self.untied &= ~(1 << pos)
+        for other in self.inferences:
+            self.inferences[other] &= ~(1 << pos)
+        self.remaining[color] -= 1
+        if self.remaining[color] == 0:
+            del self.remaining[color]
+            del self.inferences[color]
+
+    def exclude(self, color, pos):
+        """
+        Records that a color is not at a position
+
+        Parameters
+        ----------
+        color - The color
+        pos - The position in the trial
+        """
+        if color in self.inferences:
+            self.inferences[color] &= ~(1 << pos)
+
+    def propagate(self):
+        """
+        Ties every position that the knowledge base has narrowed down to one color
+        """
+        changed = True
+        while changed:
+            changed = False
+            for color in list(self.inferences):
+                possible = self.inferences[color] & self.untied
+                if bin(possible).count("1") == self.remaining[color]:
+                    # The color can only be at the positions left for it
+                    for pos in range(self.board_length):
+                        if possible >> pos & 1:
+                            self.tie(pos, color)
+                    changed = True
+            if not self.counted() or changed:
+                continue
+            # Every color is counted, so an untied position that only one color can still reach has that color
+            for pos in range(self.board_length):
+                if not self.untied >> pos & 1:
+                    continue
+                reaching = [color for color, possible in self.inferences.items() if possible >> pos & 1]
+                if len(reaching) == 1:
+                    self.tie(pos, reaching[0])
+                    changed = True
+                    break
@@ -0,0 +1,176 @@
+# File contains the clocks players are timed with, and a watchdog that interrupts a function call once it runs
+# past its deadline on one of them
+# See Round.play_round in mastermind.py for example usage
+#
+# In the main thread the deadline is an interval timer (signal.setitimer) whose handler raises GuessTimeout.
+# In other threads, for the thread clock, or where interval timers do not exist, a watcher thread injects
+# GuessTimeout into the calling thread instead. Either way the exception is raised between two Python bytecodes, so
+# a single long call into C code (a large numpy operation, for example) finishes before it is interrupted.
+
+import time
+import ctypes
+import signal
+import threading
+
+# Clocks players can be charged with, reading nanoseconds. "wall" is elapsed time, "process" and "thread" are the CPU
+# time of the process or of the calling thread, which do not depend on what else the machine is running
+CLOCKS = {"wall": time.perf_counter_ns, "process": time.process_time_ns, "thread": time.thread_time_ns}
+
+# Interval timer and signal of the clocks that have one
+TIMER_SIGNALS = {"wall": ("ITIMER_REAL", "SIGALRM"), "process": ("ITIMER_PROF", "SIGPROF")}
+
+class GuessTimeout(Exception):
+    """Raised in a function call that ran past its deadline
+    """
+
+def timer_signals_available(clock = "wall"):
+    """Checks whether deadlines on a clock can be set with an interval timer in the current thread
+
+    Args:
+        clock (str, optional): Clock of the deadline (see CLOCKS). Defaults to "wall".
+
+    Returns:
+        bool: Returns True if the clock has an interval timer and this is the main thread, False otherwise.
+    """
+
+    return clock in TIMER_SIGNALS and hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+def run_with_deadline(function, seconds, *args, clock = "wall"):
+    """Calls function, interrupting it with GuessTimeout once it has run for seconds
+
+    Args:
+        function (callable): Function to call.
+        seconds (float): Seconds the call may take.
+        *args: Arguments of the call.
+        clock (str, optional): Clock the seconds are counted on (see CLOCKS). Defaults to "wall".
+
+    Raises:
+        GuessTimeout: The call did not finish in time.
+
+    Returns:
+        Returns what function returns.
+    """
+
+    if seconds <= 0:
+
+        raise GuessTimeout("No time left")
+
+    if timer_signals_available(clock):
+
+        return run_with_timer_signal(function, seconds, clock, *args)
+
+    return run_with_injection(function, seconds, clock, *args)
+
+def raise_timeout(signum, frame):
+    """Signal handler of run_with_timer_signal
+    """
+
+    raise GuessTimeout("Deadline passed")
+
+def run_with_timer_signal(function, seconds, clock, *args):
+    """Calls function under an interval timer (see run_with_deadline), main thread only
+    """
+
+    timer, signum = (getattr(signal, name) for name in TIMER_SIGNALS[clock])
+
+    previous = signal.signal(signum, raise_timeout)
+
+    signal.setitimer(timer, seconds)
+
+    try:
+
+        return function(*args)
+
+    finally:
+
+        # The timer may fire between the two calls, so the handler is restored whatever happens
+        try:
+
+            signal.setitimer(timer, 0)
+
+        finally:
+
+            signal.signal(signum, previous)
+
+def thread_clock(thread_id):
+    """Returns a function reading the CPU time of another thread
+
+    Args:
+        thread_id (int): Identifier of the thread (see threading.get_ident).
+
+    Returns:
+        callable: Returns function reading nanoseconds, elapsed time where thread clocks are not available.
+    """
+
+    if not hasattr(time, "pthread_getcpuclockid"):
+
+        return time.perf_counter_ns
+
+    clock_id = time.pthread_getcpuclockid(thread_id)
+
+    return lambda: time.clock_gettime_ns(clock_id)
+
+def set_async_exception(thread_id, exception):
+    """Schedules exception to be raised in another thread, or cancels it if exception is None
+
+    Args:
+        thread_id (int): Identifier of the thread (see threading.get_ident).
+        exception (type): Exception class to raise, or None.
+    """
+
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), ctypes.py_object(exception) if exception is not None else None)
+
+    return
+
+def run_with_injection(function, seconds, clock, *args):
+    """Calls function while a watcher thread waits to inject GuessTimeout into it (see run_with_deadline)
+    """
+
+    target = threading.get_ident()
+    read_clock = thread_clock(target) if clock == "thread" else CLOCKS[clock]
+    deadline = read_clock() + int(seconds * 1e9)
+
+    lock = threading.Lock()
+    finished = threading.Event()
+    state = {"running": True, "injected": False}
+
+    def watch():
+
+        # CPU clocks run slower than elapsed time, so the watcher waits until the clock itself is past the deadline
+        while not finished.wait(max(deadline - read_clock(), 0) / 1e9):
+
+            with lock:
+
+                if state["running"] and read_clock() >= deadline:
+
+                    set_async_exception(target, GuessTimeout)
+
+                    state["injected"] = True
+
+                    return
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+
+    try:
+
+        result = function(*args)
+
+    finally:
+
+        finished.set()
+
+        with lock:
+
+            state["running"] = False
+
+            # An exception injected just as function returned would be raised later in the caller
+            if state["injected"]:
+
+                set_async_exception(target, None)
+
+    if state["injected"]:
+
+        raise GuessTimeout("Deadline passed")
+
+    return result
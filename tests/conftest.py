@@ -0,0 +1,7 @@
+# File contains shared setup of the tests of the Mastermind framework
+
+import os
+import sys
+
+# The framework modules are copied into every baseline directory, the tests run against baseline_3's copies
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "baseline_3"))
@@ -0,0 +1,63 @@
+# File contains tests of the candidate sets and enumerators
+
+import numpy as np
+
+from candidates import *
+from feedback import *
+
+
+def play(enumerator, answer, board_length, max_guesses = 500):
+    """Guesses with an enumerator until it finds the answer, returning its guesses"""
+
+    guesses = []
+
+    while len(guesses) < max_guesses:
+
+        guess = enumerator.next_code()
+
+        assert guess is not None
+
+        guesses.append(tuple(guess.tolist()))
+
+        if guesses[-1] == tuple(answer.tolist()):
+
+            return guesses
+
+        enumerator.apply(guess, *unpack_response(int(score_many(guess, answer[None])[0]), board_length))
+
+    return guesses
+
+
+def test_capped_walk_never_repeats_a_guess(monkeypatch):
+
+    monkeypatch.setattr(LexicographicEnumerator, "max_nodes", 7)
+
+    rng = np.random.default_rng(3)
+    colors = [chr(i) for i in range(65, 73)]
+
+    for _ in range(10):
+
+        answer = rng.integers(len(colors), size=5).astype(np.uint8)
+
+        guesses = play(LexicographicEnumerator(5, colors), answer, 5)
+
+        assert len(set(guesses)) == len(guesses)
+        assert guesses[-1] == tuple(answer.tolist())
+
+
+def test_capped_arrangement_walk_never_repeats_a_guess(monkeypatch):
+
+    monkeypatch.setattr(LexicographicEnumerator, "max_nodes", 7)
+
+    rng = np.random.default_rng(3)
+    colors = [chr(i) for i in range(65, 73)]
+
+    for _ in range(10):
+
+        answer = rng.integers(len(colors), size=6).astype(np.uint8)
+        color_counts = np.bincount(answer, minlength=len(colors)).tolist()
+
+        guesses = play(ArrangementEnumerator(6, colors, color_counts), answer, 6)
+
+        assert len(set(guesses)) == len(guesses)
+        assert guesses[-1] == tuple(answer.tolist())
@@ -0,0 +1,60 @@
+# File contains tests of the clocks players are timed with
+
+import time
+
+from mastermind import *
+
+
+colors = [chr(i) for i in range(65, 71)]
+
+
+class Sleepy(Player):
+    """Player that sleeps before each guess, using wall time but almost no CPU time"""
+
+    def __init__(self):
+
+        self.player_name = "Sleepy"
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        time.sleep(0.05)
+
+        return "AABB"
+
+
+class Burner(Player):
+    """Player that keeps the CPU busy before each guess"""
+
+    def __init__(self):
+
+        self.player_name = "Burner"
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        start = time.process_time()
+
+        while time.process_time() - start < 0.05:
+
+            pass
+
+        return "AABB"
+
+
+def test_process_clock_charges_cpu_time():
+
+    sleeping = Round(4, colors, "ABCD", InsertColors(), guess_cutoff = 5, clock = "process")
+    sleeping.play_round(Sleepy())
+
+    burning = Round(4, colors, "ABCD", InsertColors(), guess_cutoff = 5, clock = "process")
+    burning.play_round(Burner())
+
+    assert sleeping.time_used < 0.1
+    assert burning.time_used >= 0.25
+
+
+def test_wall_clock_charges_wall_time():
+
+    sleeping = Round(4, colors, "ABCD", InsertColors(), guess_cutoff = 5)
+    sleeping.play_round(Sleepy())
+
+    assert sleeping.time_used >= 0.25
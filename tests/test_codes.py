@@ -0,0 +1,29 @@
+# File contains tests of the conversions between code encodings
+
+import numpy as np
+import pytest
+
+from codes import *
+
+
+def test_ids_round_trip():
+
+    codes = all_codes_array(4, 6)
+
+    assert np.array_equal(codes_to_ids(codes, 6), np.arange(6 ** 4))
+    assert np.array_equal(ids_to_array(codes_to_ids(codes, 6), 4, 6), codes)
+
+
+def test_ids_too_large_for_int64_are_refused():
+
+    last = np.full((1, 14), 25, dtype=np.uint8)
+
+    assert code_to_id(last[0], 26) == 26 ** 14 - 1
+
+    with pytest.raises(ValueError):
+
+        codes_to_ids(last, 26)
+
+    with pytest.raises(ValueError):
+
+        ids_to_array(np.array([0]), 14, 26)
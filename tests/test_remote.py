@@ -0,0 +1,82 @@
+# File contains tests of players run in worker processes
+
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from mastermind import *
+from remote import *
+
+
+# Workers are forked, and memory limits need the resource module
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="workers are forked")
+
+colors = [chr(i) for i in range(65, 71)]
+
+
+class Sleepy(Player):
+    """Player that sleeps through its second guess"""
+
+    def __init__(self):
+
+        self.player_name = "Sleepy"
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        if last_response[2] == 1:
+
+            time.sleep(30)
+
+        return "AABB"
+
+
+class Hungry(Player):
+    """Player that allocates more memory than its worker may for its second guess"""
+
+    def __init__(self):
+
+        self.player_name = "Hungry"
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        if last_response[2] == 1:
+
+            self.hoard = np.ones(2 ** 28)
+
+        return "AABB"
+
+
+def test_worker_past_time_limit_loses_the_round():
+
+    with WorkerPool(1, time_limit = 0.5) as pool:
+
+        player = RemotePlayer(Sleepy(), pool)
+
+        start = time.time()
+        result, guesses = Round(4, colors, "ABCD", InsertColors(), time_cutoff = 5).play_round(player)
+
+        assert result == "loss"
+        assert time.time() - start < 5
+        assert pool.recycled == 1
+
+        player.close()
+
+
+def test_worker_past_memory_limit_is_recycled():
+
+    with WorkerPool(1, time_limit = 5, memory_limit = 2 ** 28) as pool:
+
+        player = RemotePlayer(Hungry(), pool)
+
+        assert player.make_guess(4, colors, InsertColors(), (0, 0, 0)) == "AABB"
+        assert player.make_guess(4, colors, InsertColors(), (0, 0, 1)) is None
+
+        assert pool.recycled == 1
+        assert "MemoryError" in player.last_error
+
+        # The replacement worker starts over from a new copy of the player
+        assert player.make_guess(4, colors, InsertColors(), (0, 0, 0)) == "AABB"
+
+        player.close()
@@ -0,0 +1,26 @@
+# File contains tests of the responses of a round
+
+import numpy as np
+
+from mastermind import *
+
+
+colors = [chr(i) for i in range(65, 71)]
+
+
+def test_guess_in_every_encoding():
+
+    game = Round(4, colors, "ABCD", InsertColors())
+
+    assert game.respond_to_guess("ABDC")[:2] == (2, 2)
+    assert game.respond_to_guess(code_to_id("ABDC", 6))[:2] == (2, 2)
+    assert game.respond_to_guess(str_to_array("ABDC"))[:2] == (2, 2)
+
+
+def test_guess_as_a_sequence_of_colors():
+
+    game = Round(4, colors, "ABCD", InsertColors())
+
+    assert game.respond_to_guess(list("ABDC"))[:2] == (2, 2)
+    assert game.respond_to_guess(tuple("ABCD")) == "win"
+    assert game.respond_to_guess(list("ABDZ")) == "invalid"
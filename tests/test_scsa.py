@@ -0,0 +1,26 @@
+# File contains tests of the supports and probabilities of the SCSAs
+
+import numpy as np
+
+from scsa import *
+
+
+def test_ab_color_needs_two_colors():
+
+    scsa = ABColor(0)
+
+    assert scsa.support_size(4, 1) == 0
+    assert len(scsa.support(4, ["A"])) == 0
+    assert list(scsa.iter_support(4, ["A"])) == []
+    assert scsa.generate_array(4, ["A"], 3) is None
+
+
+def test_ab_color_probabilities_sum_to_one():
+
+    scsa = ABColor(0)
+    colors = [chr(i) for i in range(65, 71)]
+
+    support = scsa.support(5, colors)
+
+    assert len(support) == scsa.support_size(5, len(colors)) == 2 ** 5 - 2
+    assert np.isclose(scsa.probabilities(support, len(colors)).sum(), 1)
@@ -0,0 +1,50 @@
+# File contains tests of tournaments played round by round and in batches
+
+import re
+
+from mastermind import *
+
+
+colors = [chr(i) for i in range(65, 71)]
+
+
+def rounds_played(output):
+    """Reads the number of rounds played from the output of Mastermind.print_results"""
+
+    return int(re.findall(r"Rounds: (\d+) out of", output)[-1])
+
+
+def results(output):
+    """Reads the results of each tournament from the output of Mastermind.print_results"""
+
+    return re.findall(r"Results: (.*)", output)
+
+
+def test_batch_tournament_after_tournament_with_watchdog(capsys):
+
+    mastermind = Mastermind(4, colors, tournament_time_cutoff = 60, watchdog = True)
+
+    mastermind.play_tournament(RandomFolks(), InsertColors(), 5, seed = 1)
+
+    # The deadline of the first tournament has long passed when the next one starts
+    mastermind.deadline -= 60
+
+    mastermind.play_batch_tournament(RandomFolks(), InsertColors(), 20, seed = 1)
+
+    assert rounds_played(capsys.readouterr().out) == 20
+
+
+def test_batch_tournament_plays_like_tournament(capsys):
+
+    for player in (RandomFolks(), Boring()):
+
+        Mastermind(4, colors).play_tournament(player, InsertColors(), 100, seed = 5)
+        Mastermind(4, colors).play_batch_tournament(player, InsertColors(), 100, seed = 5, batch_size = 32)
+
+    output = capsys.readouterr().out
+
+    random_folks, random_folks_batch, boring, boring_batch = results(output)
+
+    assert random_folks == random_folks_batch
+    assert boring == boring_batch
+    assert "'win': 0" not in random_folks
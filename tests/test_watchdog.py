@@ -0,0 +1,52 @@
+# File contains tests of the watchdog that interrupts guesses past their deadline
+
+import threading
+import time
+
+from mastermind import *
+
+
+colors = [chr(i) for i in range(65, 71)]
+
+
+class Spinner(Player):
+    """Player that loops forever on its second guess"""
+
+    def __init__(self):
+
+        self.player_name = "Spinner"
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        if last_response[2] == 1:
+
+            while True:
+
+                pass
+
+        return "AABB"
+
+
+def test_watchdog_interrupts_busy_loop():
+
+    start = time.time()
+    result, guesses = Round(4, colors, "ABCD", InsertColors(), time_cutoff = 0.3, watchdog = True).play_round(Spinner())
+
+    assert result == "loss"
+    assert time.time() - start < 5
+
+
+def test_watchdog_interrupts_busy_loop_outside_main_thread():
+
+    outcome = []
+
+    def play():
+
+        outcome.append(Round(4, colors, "ABCD", InsertColors(), time_cutoff = 0.3, watchdog = True).play_round(Spinner()))
+
+    thread = threading.Thread(target=play)
+    thread.start()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert outcome[0][0] == "loss"